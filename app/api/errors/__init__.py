@@ -1,7 +1,10 @@
 from app.api.errors.error_response import new_error_response
 from app.api.errors.errors import (DataFormatError, ForbiddenError, InvalidDataSourceError,
                                    InternalServerError, ModelNotFoundError,
-                                   ModelNotReadyError, RemoveModelForbiddenError, UnauthorizedError, UnsupportedModelTypeError)
+                                   ModelNotReadyError, ModelNotUpdatableError, ModelTooLargeError,
+                                   ModelUnavailableError, RemoveModelForbiddenError,
+                                   TrainingInterruptedError, UnauthorizedError, UnsupportedMediaTypeError,
+                                   UnsupportedModelTypeError)
 
 __all__ = [
     'DataFormatError',
@@ -10,8 +13,13 @@ __all__ = [
     'InternalServerError',
     'ModelNotFoundError',
     'ModelNotReadyError',
+    'ModelNotUpdatableError',
+    'ModelTooLargeError',
+    'ModelUnavailableError',
     'new_error_response',
     'RemoveModelForbiddenError',
+    'TrainingInterruptedError',
     'UnauthorizedError',
+    'UnsupportedMediaTypeError',
     'UnsupportedModelTypeError'
 ]
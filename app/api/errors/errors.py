@@ -19,6 +19,12 @@ class ModelNotReadyError(Error):
     status_code = 400
 
 
+class ModelNotUpdatableError(Error):
+    code = 'model_not_updatable'
+    message = 'Only models trained by this service can be updated with new data'
+    status_code = 400
+
+
 class UnsupportedModelTypeError(Error):
     code = 'unsupported_model'
     message = 'The model type specified is not supported'
@@ -49,6 +55,30 @@ class ModelNotFoundError(Error):
     status_code = 404
 
 
+class ModelTooLargeError(Error):
+    code = 'model_too_large'
+    message = 'The uploaded model is larger than the maximum upload size'
+    status_code = 413
+
+
+class UnsupportedMediaTypeError(Error):
+    code = 'unsupported_media_type'
+    message = 'The content type of the request is not supported, use either application/x-ndjson or text/csv'
+    status_code = 415
+
+
+class TrainingInterruptedError(Error):
+    code = 'training_interrupted'
+    message = 'Training was interrupted by a restart of the service, create the model again'
+    status_code = 500
+
+
+class ModelUnavailableError(Error):
+    code = 'model_unavailable'
+    message = 'No model is deployed to make predictions with'
+    status_code = 503
+
+
 class InternalServerError(Error):
     code = 'internal_error'
     message = 'An internal error occurred'
@@ -1,19 +1,28 @@
 from fastapi import APIRouter
 
-from app.api.operations import (delete_models_router, deploy_models_router, get_models_router,
-                                health_router, post_models_router, post_models_upload_router, predictions_router)
+from app.api.operations import (candidate_router, delete_models_router, deploy_models_router, get_models_router,
+                                health_router, metrics_router, post_model_data_router, post_models_router,
+                                post_models_upload_router, predictions_router, predictions_stream_router,
+                                profiling_router, stats_router)
 
 
 def init_router(url_prefix: str | None = None) -> APIRouter:
     router = APIRouter()
     if url_prefix:
         router.prefix = url_prefix
+    # Included before the routes for a single model, which would otherwise match `/models/candidate`
+    router.include_router(candidate_router)
     router.include_router(delete_models_router)
     router.include_router(deploy_models_router)
     router.include_router(get_models_router)
     router.include_router(health_router)
+    router.include_router(metrics_router)
     router.include_router(post_models_router)
+    router.include_router(post_model_data_router)
     router.include_router(post_models_upload_router)
     router.include_router(predictions_router)
+    router.include_router(predictions_stream_router)
+    router.include_router(profiling_router)
+    router.include_router(stats_router)
 
     return router
@@ -1,17 +1,29 @@
 from app.api.operations.delete_model import delete_models_router
 from app.api.operations.get_model import get_models_router
 from app.api.operations.get_health import health_router
+from app.api.operations.get_metrics import metrics_router
+from app.api.operations.get_stats import stats_router
 from app.api.operations.create_model import post_models_router
+from app.api.operations.post_model_data import post_model_data_router
 from app.api.operations.post_models_upload import post_models_upload_router
 from app.api.operations.post_predictions import predictions_router
+from app.api.operations.post_predictions_stream import predictions_stream_router
+from app.api.operations.put_candidate import candidate_router
 from app.api.operations.put_deploy import deploy_models_router
+from app.api.operations.put_profiling import profiling_router
 
 __all__ = [
+    'candidate_router',
     'delete_models_router',
     'deploy_models_router',
     'get_models_router',
     'health_router',
+    'metrics_router',
+    'post_model_data_router',
     'post_models_router',
     'post_models_upload_router',
-    'predictions_router'
+    'predictions_router',
+    'profiling_router',
+    'predictions_stream_router',
+    'stats_router'
 ]
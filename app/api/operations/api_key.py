@@ -0,0 +1,19 @@
+import os
+
+from fastapi.security import APIKeyHeader
+
+from app.api.errors import UnauthorizedError, ForbiddenError
+
+X_API_KEY = APIKeyHeader(name='X-api-key')
+
+
+def validate_api_key(x_api_key: str) -> type[UnauthorizedError] | type[ForbiddenError] | None:
+    api_user, api_key = os.environ['API_KEY'].split('=')
+    if '=' not in x_api_key:
+        return UnauthorizedError
+    x_api_user, x_api_key = x_api_key.split('=')
+    if x_api_user != api_user:
+        return UnauthorizedError
+    if x_api_key != api_key:
+        return ForbiddenError
+    return None
@@ -1,30 +1,19 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
-from app.api.errors import new_error_response, InvalidDataSourceError, DataFormatError
 from app.api.resources import Model
-from app.api.schemas import CreateModelRequestBody, Status
-from app.model import DelayModel
+from app.api.schemas import CreateModelRequestBody
 
 post_models_router = APIRouter(prefix='/models')
 
 
-@post_models_router.post('')
+@post_models_router.post('', status_code=202)
 async def create_model(config: CreateModelRequestBody, request: Request) -> JSONResponse:
     model = Model.new_model()
     request.app.state.model_store.add_model(model)
-
-    delay_model = DelayModel()
-    try:
-        delay_model = delay_model.train(str(config.data_source))
-        request.app.state.model_store.update_status(str(model.id), Status.COMPLETED)
-    except FileNotFoundError:
-        return JSONResponse(content=new_error_response([InvalidDataSourceError()]), status_code=InvalidDataSourceError.status_code)
-    except (KeyError, TypeError, ValueError):
-        model.errors.append(DataFormatError())
-        request.app.state.model_store.update_status(str(model.id), Status.FAILED)
-
-    request.app.state.model_store.update_model(str(model.id), delay_model)
+    # Training runs in the background, so the response is built before the job can change the model's status
+    response_json = model.new_model_response()
+    request.app.state.training_executor.submit(model, str(config.data_source), config.threshold)
 
     headers = {'Location': f'{str(request.url)}/{str(model.id)}'}
-    return JSONResponse(content=model.new_model_response(), headers=headers, status_code=201)
+    return JSONResponse(content=response_json, headers=headers, status_code=202)
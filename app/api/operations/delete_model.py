@@ -5,6 +5,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from app.api.errors import new_error_response, ModelNotFoundError, InternalServerError, RemoveModelForbiddenError
+from app.store import deploy_model, serve_models
 
 delete_models_router = APIRouter(prefix='/models/{model_id}')
 
@@ -18,8 +19,11 @@ async def delete_model(model_id: uuid.UUID, request: Request) -> JSONResponse:
     if random.randint(0, 100) % 50 == 0:
         return JSONResponse(content=new_error_response([InternalServerError()]), status_code=InternalServerError.status_code)
 
-    if model_id == request.app.state.model.id:
-        request.app.state.model = request.app.state.model_store.default_model
+    if (deployed := request.app.state.model) is not None and model_id == deployed.id:
+        deploy_model(request.app.state, None)
+    if (candidate := request.app.state.candidate) is not None and str(model_id) == candidate.model_id:
+        request.app.state.candidate = None
+        serve_models(request.app.state)
     del request.app.state.model_store[str(model_id)]
 
     return JSONResponse(content=None, status_code=204)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from app.metrics import PROMETHEUS_MEDIA_TYPE, format_histogram, format_metric
+
+metrics_router = APIRouter(prefix='/metrics')
+
+
+@metrics_router.get('', status_code=200)
+async def get_metrics(request: Request) -> Response:
+    # The metrics are in the Prometheus text format, so the service can be scraped without any other component
+    state = request.app.state
+    lines = state.metrics.render()
+
+    model_store = state.model_store
+    store_stats = model_store.stats()
+    lines += format_metric('depart_model_store_models', 'gauge', 'Models held by the model store',
+                           [({}, len(model_store))])
+    lines += format_metric('depart_model_store_loaded_models', 'gauge', 'Trained models loaded in memory',
+                           [({}, store_stats['loaded_models'])])
+    lines += format_metric('depart_model_store_loaded_bytes', 'gauge', 'Bytes of trained models loaded in memory',
+                           [({}, store_stats['loaded_bytes'])])
+    for name in ('hits', 'misses', 'evictions'):
+        lines += format_metric(f'depart_model_store_{name}_total', 'counter', f'Model store {name}',
+                               [({}, store_stats[name])])
+
+    if (batcher := state.batcher) is not None:
+        lines += format_histogram('depart_batch_rows', 'Flights predicted in each batch of coalesced requests',
+                                  [({}, batcher.batch_sizes)])
+        lines += format_histogram('depart_batch_requests', 'Requests coalesced into each batch',
+                                  [({}, batcher.requests_per_batch)])
+    if (model := state.model) is not None and model.model is not None:
+        prediction_stats = model.model.prediction_stats()
+        lines += format_metric('depart_prediction_rows_total', 'counter',
+                               'Flights predicted by the deployed model, from its lookup table or computed',
+                               [({'model': str(model.id), 'source': 'lookup'}, prediction_stats['lookup_rows']),
+                                ({'model': str(model.id), 'source': 'computed'}, prediction_stats['computed_rows'])])
+    if (candidate := state.candidate) is not None:
+        labels = {'model': candidate.model_id, 'mode': candidate.mode}
+        lines += format_metric('depart_candidate_requests_total', 'counter',
+                               'Requests shadowed by or routed to the candidate model', [(labels, candidate.requests)])
+        lines += format_metric('depart_candidate_dropped_requests_total', 'counter',
+                               'Requests not shadowed because too many were already being scored',
+                               [(labels, candidate.dropped)])
+        lines += format_metric('depart_candidate_failures_total', 'counter',
+                               'Shadowed requests the candidate model failed to score', [(labels, candidate.failures)])
+        lines += format_metric('depart_candidate_rows_total', 'counter',
+                               'Shadowed flights, and those predicted the same by the candidate and deployed models',
+                               [({**labels, 'result': 'scored'}, candidate.rows),
+                                ({**labels, 'result': 'agreed'}, candidate.agreeing_rows)])
+        lines += format_histogram('depart_candidate_prediction_duration_seconds',
+                                  'Time taken to predict requests while a candidate model is run',
+                                  (({**labels, 'served_by': served_by}, histogram)
+                                   for served_by, histogram in candidate.latencies.items()))
+
+    return Response(content='\n'.join(lines) + '\n', media_type=PROMETHEUS_MEDIA_TYPE)
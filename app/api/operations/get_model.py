@@ -1,7 +1,10 @@
+import asyncio
+import os
 import uuid
+from urllib.parse import quote
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from app.api.errors import new_error_response, ModelNotFoundError, ModelNotReadyError
 from app.api.schemas import Status
@@ -9,16 +12,29 @@ from app.api.schemas import Status
 get_models_router = APIRouter(prefix='/models/{model_id}')
 
 
+def _attachment(file_name: str) -> str:
+    file_name = os.path.basename(file_name)
+    if (quoted := quote(file_name)) != file_name:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{file_name}"'
+
+
 @get_models_router.get('', status_code=200)
-async def get_model(model_id: uuid.UUID, request: Request, export: bool | None = None, file_name: str | None = None) -> JSONResponse:
+async def get_model(model_id: uuid.UUID, request: Request, export: bool | None = None, file_name: str | None = None,
+                    compress: bool = False, download: bool = False) -> Response:
     if str(model_id) not in request.app.state.model_store:
         return JSONResponse(content=new_error_response([ModelNotFoundError()]), status_code=ModelNotFoundError.status_code)
     model = request.app.state.model_store[str(model_id)]
     if export:
-        if model.status != Status.COMPLETED:
+        if model.status != Status.COMPLETED or model.model is None:
             return JSONResponse(content=new_error_response([ModelNotReadyError()]), status_code=ModelNotReadyError.status_code)
-        file_name = file_name or f'{model_id}.pkl'
-        model.model.save(file_name)
+        file_name = file_name or f'{model_id}.depart{".gz" if compress else ""}'
+        # Serializing and writing the model run in a thread so other requests are not held up
+        if download:
+            content = await asyncio.to_thread(model.model.to_bytes, compress)
+            return Response(content=content, media_type='application/octet-stream',
+                            headers={'Content-Disposition': _attachment(file_name)})
+        await asyncio.to_thread(model.model.save, file_name, compress)
     model_deployed = False
     if request.app.state.model is not None:  # FIXME: There should never not be a model
         model_deployed = model_id == request.app.state.model.id
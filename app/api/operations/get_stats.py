@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+stats_router = APIRouter(prefix='/stats')
+
+
+@stats_router.get('', status_code=200)
+async def get_stats(request: Request) -> JSONResponse:
+    stats = {}
+    if startup := request.app.state.startup:
+        stats['startup'] = startup
+    if (batcher := request.app.state.batcher) is not None:
+        stats['batching'] = batcher.stats()
+    if (model := request.app.state.model) is not None and model.model is not None:
+        # Counted for the deployed model only, so they start again whenever a different model is deployed
+        stats['predictions'] = {'model': str(model.id), **model.model.prediction_stats()}
+    if (candidate := request.app.state.candidate) is not None:
+        stats['candidate'] = candidate.stats()
+    stats['model_store'] = request.app.state.model_store.stats()
+    if (executor := request.app.state.training_executor) is not None and executor.feature_cache is not None:
+        stats['feature_cache'] = executor.feature_cache.stats()
+
+    return JSONResponse(content=stats, status_code=200)
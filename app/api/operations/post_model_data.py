@@ -0,0 +1,34 @@
+import uuid
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from app.api.errors import new_error_response, ModelNotFoundError, ModelNotReadyError, ModelNotUpdatableError
+from app.api.resources import Model
+from app.api.schemas import CreateModelRequestBody, Status
+
+post_model_data_router = APIRouter(prefix='/models/{model_id}/data')
+
+
+@post_model_data_router.post('', status_code=202)
+async def add_model_data(model_id: uuid.UUID, config: CreateModelRequestBody, request: Request) -> JSONResponse:
+    if not (base := request.app.state.model_store.get(str(model_id))):
+        return JSONResponse(content=new_error_response([ModelNotFoundError()]),
+                            status_code=ModelNotFoundError.status_code)
+    if base.status != Status.COMPLETED:
+        return JSONResponse(content=new_error_response([ModelNotReadyError()]),
+                            status_code=ModelNotReadyError.status_code)
+    if base.model is None or not base.model.updatable:
+        return JSONResponse(content=new_error_response([ModelNotUpdatableError()]),
+                            status_code=ModelNotUpdatableError.status_code)
+
+    # The existing model is left untouched, the new data produces a new version that can be deployed separately
+    model = Model.new_model(parent_id=base.id)
+    request.app.state.model_store.add_model(model)
+    response_json = model.new_model_response()
+    request.app.state.training_executor.submit(model, str(config.data_source), config.threshold,
+                                               base_model=base.model)
+
+    models_url = str(request.url).removesuffix(f'/{str(model_id)}/data')
+    headers = {'Location': f'{models_url}/{str(model.id)}'}
+    return JSONResponse(content=response_json, headers=headers, status_code=202)
@@ -1,25 +1,96 @@
-from fastapi import APIRouter, Request
+import asyncio
+import os
+import pickle
+import tempfile
+
+from fastapi import APIRouter, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
-from app.api.errors import new_error_response, InvalidDataSourceError, UnsupportedModelTypeError
+from app.api.errors import new_error_response, InvalidDataSourceError, ModelTooLargeError, UnsupportedModelTypeError
 from app.api.resources import Model
 from app.api.schemas import UploadModelsBody, Status
 from app.model import DelayModel
 
 post_models_upload_router = APIRouter(prefix='/models/upload')
 
+BINARY_MEDIA_TYPE = 'application/octet-stream'
+
+
+async def _read_body(request: Request, max_size: int) -> bytes | None:
+    if int(request.headers.get('content-length') or 0) > max_size:
+        return None
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_size:
+            return None
+    return bytes(body)
+
+
+async def _receive_model(request: Request, max_size: int) -> str | None:
+    # The body is written to a temporary file as it arrives, and the upload is abandoned once it is too large
+    if int(request.headers.get('content-length') or 0) > max_size:
+        return None
+    file_descriptor, file_name = tempfile.mkstemp(suffix='.upload')
+    size = 0
+    try:
+        with os.fdopen(file_descriptor, 'wb') as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > max_size:
+                    break
+                await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        # Such as the client disconnecting, or the request being cancelled
+        os.remove(file_name)
+        raise
+    if size > max_size:
+        os.remove(file_name)
+        return None
+    return file_name
+
 
 @post_models_upload_router.post('')
-async def post_models_upload(config: UploadModelsBody, request: Request) -> JSONResponse:
+async def post_models_upload(request: Request, threshold: float | None = Query(default=None, ge=0, le=1)) -> JSONResponse:
+    # A model is either uploaded in the body as a file, or its location is given in a JSON body
+    settings = request.app.state.settings
+    location = None
+    if request.headers.get('content-type', '').split(';')[0].strip() != BINARY_MEDIA_TYPE:
+        if (body := await _read_body(request, settings.max_upload_size)) is None:
+            return JSONResponse(content=new_error_response([ModelTooLargeError()]),
+                                status_code=ModelTooLargeError.status_code)
+        try:
+            config = UploadModelsBody.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors()) from e
+        location = str(config.model_location)
+        if config.threshold is not None:
+            threshold = config.threshold
+
+    if location is not None:
+        file_name = location
+    elif (received_file_name := await _receive_model(request, settings.max_upload_size)) is not None:
+        file_name = received_file_name
+    else:
+        return JSONResponse(content=new_error_response([ModelTooLargeError()]), status_code=ModelTooLargeError.status_code)
+
     model = Model.new_model()
     try:
-        delay_model = DelayModel.load(str(config.model_location))
+        # Loading a model reads and validates the whole file, so it is done in a thread to not hold up other requests
+        delay_model = await asyncio.to_thread(DelayModel.load, file_name, settings.allow_pickle_uploads)
     except FileNotFoundError:
         return JSONResponse(content=new_error_response([InvalidDataSourceError()]),
                             status_code=InvalidDataSourceError.status_code)
-    except (TypeError, ValueError, AttributeError):
+    except (TypeError, ValueError, AttributeError, EOFError, pickle.UnpicklingError):
         return JSONResponse(content=new_error_response([UnsupportedModelTypeError()]),
                             status_code=UnsupportedModelTypeError.status_code)
+    finally:
+        if location is None:
+            os.remove(file_name)
+    if threshold is not None:
+        delay_model.threshold = threshold
 
     request.app.state.model_store[str(model.id)] = model
     request.app.state.model_store.update_model(str(model.id), delay_model)
@@ -1,18 +1,70 @@
-import pandas as pd
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+import time
+from operator import methodcaller
 
-from app.api.schemas import PredictionInput
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.api.errors import new_error_response, ModelUnavailableError
+from app.api.schemas import ColumnarPredictionInput, PredictionInput
+from app.model import DelayModel
+from app.serving.candidate import Transform
+from app.serving.encoding import JSON_MEDIA_TYPE, encode_predictions
 
 predictions_router = APIRouter(prefix='/predictions')
 
 
+def deployed_model(request: Request) -> DelayModel | None:
+    # The deployed model is read once, so the whole request is served by the same model even if another is
+    # deployed meanwhile
+    model = request.app.state.model
+    return model.model if model is not None else None
+
+
+def _unavailable() -> JSONResponse:
+    return JSONResponse(content=new_error_response([ModelUnavailableError()]),
+                        status_code=ModelUnavailableError.status_code)
+
+
+async def _predict(request: Request, model: DelayModel, transform: Transform, probabilities: bool,
+                   threshold: float | None) -> Response:
+    metrics = request.app.state.metrics
+    candidate = request.app.state.candidate
+    served_by = 'deployed'
+    if candidate is not None and candidate.routes():
+        model, served_by = candidate.model, 'candidate'
+    start = time.perf_counter()
+    with metrics.time_stage('encode_features'):
+        features = transform(model)
+    metrics.prediction_rows.observe(len(features))
+    with metrics.time_stage('predict'):
+        if (batcher := request.app.state.batcher) is not None:
+            preds, probs = await batcher.predict(model, features, threshold, probabilities)
+        elif probabilities:
+            preds, probs = model.predict_with_proba(features, threshold)
+        else:
+            preds, probs = model.predict(features, threshold), None
+    if candidate is not None:
+        candidate.latencies[served_by].observe(time.perf_counter() - start)
+        candidate.shadow(transform, preds, threshold)
+    # Large batches spend much of their time encoding the response, so a faster encoder is used than `JSONResponse`
+    with metrics.time_stage('encode_response'):
+        content = encode_predictions(preds, probs)
+    return Response(content=content, media_type=JSON_MEDIA_TYPE)
+
+
 @predictions_router.post('', status_code=200)
-async def post_predictions(predict_input: PredictionInput, request: Request) -> JSONResponse:
-    flights = [flight.model_dump(by_alias=True) for flight in predict_input.flights]
-    flights_df = pd.DataFrame(flights)
-    model = request.app.state.model.model
-    flights_df = model.preprocess(flights_df)
-    preds = model.predict(flights_df)
-
-    return JSONResponse(content={'predictions': preds}, status_code=200)
+async def post_predictions(predict_input: PredictionInput, request: Request, probabilities: bool = False,
+                           threshold: float | None = Query(default=None, ge=0, le=1)) -> Response:
+    if (model := deployed_model(request)) is None:
+        return _unavailable()
+    return await _predict(request, model, methodcaller('transform_for_inference', predict_input.flights),
+                          probabilities, threshold)
+
+
+@predictions_router.post('/columns', status_code=200)
+async def post_predictions_columns(predict_input: ColumnarPredictionInput, request: Request, probabilities: bool = False,
+                                   threshold: float | None = Query(default=None, ge=0, le=1)) -> Response:
+    if (model := deployed_model(request)) is None:
+        return _unavailable()
+    return await _predict(request, model, methodcaller('transform_columns', predict_input.columns()), probabilities,
+                          threshold)
@@ -0,0 +1,66 @@
+import json
+import tempfile
+from collections.abc import Iterator
+from itertools import chain
+from typing import IO
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.api.errors import new_error_response, DataFormatError, ModelUnavailableError, UnsupportedMediaTypeError
+from app.api.operations.post_predictions import deployed_model
+from app.model import DelayModel
+from app.serving.streaming import (CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, Record, csv_header, encode_csv, encode_ndjson,
+                                   missing_columns, predict_records, read_records)
+
+predictions_stream_router = APIRouter(prefix='/predictions/stream')
+
+
+def _stream_predictions(body: IO[bytes], records: Iterator[Record], media_type: str, model: DelayModel, *,
+                        chunk_size: int, threshold: float | None, probabilities: bool) -> Iterator[bytes]:
+    encode = encode_csv if media_type == CSV_MEDIA_TYPE else encode_ndjson
+    try:
+        if media_type == CSV_MEDIA_TYPE:
+            yield csv_header(probabilities)
+        for labels, probs in predict_records(records, model, chunk_size, threshold, probabilities):
+            yield encode(labels, probs)
+    except (KeyError, TypeError, ValueError):
+        # The status code has already been sent, so a malformed record ends the stream with an error line
+        yield (json.dumps(new_error_response([DataFormatError()])) + '\n').encode('utf-8')
+    finally:
+        body.close()
+
+
+@predictions_stream_router.post('', status_code=200)
+async def post_predictions_stream(request: Request, probabilities: bool = False,
+                                  threshold: float | None = Query(default=None, ge=0, le=1)) -> Response:
+    media_type = request.headers.get('content-type', '').split(';')[0].strip()
+    if media_type not in (NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE):
+        return JSONResponse(content=new_error_response([UnsupportedMediaTypeError()]),
+                            status_code=UnsupportedMediaTypeError.status_code)
+    if (model := deployed_model(request)) is None:
+        return JSONResponse(content=new_error_response([ModelUnavailableError()]),
+                            status_code=ModelUnavailableError.status_code)
+
+    settings = request.app.state.settings
+    # The body is spooled to disk once it is larger than `stream_spool_size`, so memory stays bounded
+    body = tempfile.SpooledTemporaryFile(max_size=settings.stream_spool_size)  # pylint: disable=consider-using-with
+    async for chunk in request.stream():
+        body.write(chunk)
+    body.seek(0)
+
+    records = read_records(body, media_type)
+    # Check the first record up front so that a request with the wrong columns can still be rejected with a 400
+    try:
+        first_record = next(records, None)
+    except (TypeError, ValueError):
+        first_record = {}
+    if first_record is not None and missing_columns(first_record, model.feature_columns):
+        body.close()
+        return JSONResponse(content=new_error_response([DataFormatError()]), status_code=DataFormatError.status_code)
+    if first_record is not None:
+        records = chain([first_record], records)
+
+    content = _stream_predictions(body, records, media_type, model, chunk_size=settings.stream_chunk_size,
+                                  threshold=threshold, probabilities=probabilities)
+    return StreamingResponse(content, media_type=media_type)
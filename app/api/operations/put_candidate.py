@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import JSONResponse, Response
+
+from app.api.errors import new_error_response, ModelNotFoundError, ModelNotReadyError
+from app.api.operations.api_key import X_API_KEY, validate_api_key
+from app.api.schemas import CandidateRequestBody, Status
+from app.serving import CandidateDeployment
+from app.store import serve_models
+from app.serving.candidate import CandidateStats
+
+candidate_router = APIRouter(prefix='/models/candidate')
+
+
+def _candidate_response(candidate: CandidateDeployment | None) -> CandidateStats:
+    if candidate is None:
+        return {'model': None, 'mode': None}
+    return candidate.stats()
+
+
+@candidate_router.get('', status_code=200)
+async def get_candidate(request: Request, x_api_key: str = Depends(X_API_KEY)) -> JSONResponse:
+    if error := validate_api_key(x_api_key):
+        return JSONResponse(content=new_error_response([error()]), status_code=error.status_code)
+    return JSONResponse(content=_candidate_response(request.app.state.candidate), status_code=200)
+
+
+@candidate_router.put('', status_code=200)
+async def put_candidate(body: CandidateRequestBody, request: Request, model_id: uuid.UUID = Query(alias='model-id'),
+                        x_api_key: str = Depends(X_API_KEY)) -> JSONResponse:
+    if error := validate_api_key(x_api_key):
+        return JSONResponse(content=new_error_response([error()]), status_code=error.status_code)
+    if not (model := request.app.state.model_store.get(str(model_id))):
+        return JSONResponse(content=new_error_response([ModelNotFoundError()]),
+                            status_code=ModelNotFoundError.status_code)
+    if model.status != Status.COMPLETED or model.model is None:
+        return JSONResponse(content=new_error_response([ModelNotReadyError()]),
+                            status_code=ModelNotReadyError.status_code)
+
+    # The candidate holds on to its trained model, so it keeps running even if the store unloads the model
+    candidate = CandidateDeployment(str(model.id), model.model, body.mode, body.percentage)
+    await asyncio.to_thread(candidate.model.warm_up)
+    request.app.state.candidate = candidate
+    serve_models(request.app.state)
+    return JSONResponse(content=_candidate_response(candidate), status_code=200)
+
+
+@candidate_router.delete('', status_code=204)
+async def delete_candidate(request: Request, x_api_key: str = Depends(X_API_KEY)) -> Response:
+    if error := validate_api_key(x_api_key):
+        return JSONResponse(content=new_error_response([error()]), status_code=error.status_code)
+    request.app.state.candidate = None
+    serve_models(request.app.state)
+    return Response(status_code=204)
@@ -1,34 +1,21 @@
-import os
+import asyncio
 import uuid
 
 from fastapi import APIRouter, Depends, Request, Query
 from fastapi.responses import JSONResponse
-from fastapi.security import APIKeyHeader
 
-from app.api.errors import new_error_response, UnauthorizedError, ForbiddenError, ModelNotFoundError, ModelNotReadyError
+from app.api.errors import new_error_response, ModelNotFoundError, ModelNotReadyError
+from app.api.operations.api_key import X_API_KEY, validate_api_key
 from app.api.schemas import Status
+from app.store import deploy_model as deploy
 
 deploy_models_router = APIRouter(prefix='/models/deploy')
 
-X_API_KEY = APIKeyHeader(name='X-api-key')
-
-
-def _validate_api_key(x_api_key: str) -> type[UnauthorizedError] | type[ForbiddenError] | None:
-    api_user, api_key = os.environ['API_KEY'].split('=')
-    if '=' not in x_api_key:
-        return UnauthorizedError
-    x_api_user, x_api_key = x_api_key.split('=')
-    if x_api_user != api_user:
-        return UnauthorizedError
-    if x_api_key != api_key:
-        return ForbiddenError
-    return None
-
 
 @deploy_models_router.put('', status_code=200)
 async def deploy_model(request: Request, model_id: uuid.UUID = Query(alias='model-id'),
                        x_api_key: str = Depends(X_API_KEY)) -> JSONResponse:
-    if error := _validate_api_key(x_api_key):
+    if error := validate_api_key(x_api_key):
         return JSONResponse(content=new_error_response([error()]), status_code=error.status_code)
     if not (model := request.app.state.model_store.get(str(model_id))):
         return JSONResponse(content=new_error_response([ModelNotFoundError()]),
@@ -37,5 +24,6 @@ async def deploy_model(request: Request, model_id: uuid.UUID = Query(alias='mode
         return JSONResponse(content=new_error_response([ModelNotReadyError()]),
                             status_code=ModelNotReadyError.status_code)
 
-    request.app.state.model = model
+    # Warming up the model and recording the deployment in the store are kept off the event loop
+    await asyncio.to_thread(deploy, request.app.state, model)
     return JSONResponse(content=model.new_model_response(deployed=True), status_code=200)
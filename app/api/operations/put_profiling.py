@@ -0,0 +1,40 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+
+from app.api.errors import new_error_response
+from app.api.operations.api_key import X_API_KEY, validate_api_key
+from app.api.schemas import ProfilingRequestBody
+from app.metrics import Profiler
+
+profiling_router = APIRouter(prefix='/profiling')
+
+
+def _profiling_response(profiler: Profiler) -> dict[str, str | list[str] | None]:
+    return {
+        'mode': profiler.mode,
+        'path': profiler.path,
+        'files': profiler.files()
+    }
+
+
+@profiling_router.get('', status_code=200)
+async def get_profiling(request: Request, x_api_key: str = Depends(X_API_KEY)) -> JSONResponse:
+    if error := validate_api_key(x_api_key):
+        return JSONResponse(content=new_error_response([error()]), status_code=error.status_code)
+    return JSONResponse(content=_profiling_response(request.app.state.profiler), status_code=200)
+
+
+@profiling_router.put('', status_code=200)
+async def put_profiling(body: ProfilingRequestBody, request: Request,
+                        x_api_key: str = Depends(X_API_KEY)) -> JSONResponse:
+    if error := validate_api_key(x_api_key):
+        return JSONResponse(content=new_error_response([error()]), status_code=error.status_code)
+    profiler = request.app.state.profiler
+    # Stopping the sampler waits for its last sample and writes every stack, so it is kept off the event loop
+    if body.mode is None:
+        await asyncio.to_thread(profiler.stop)
+    else:
+        await asyncio.to_thread(profiler.start, body.mode)
+    return JSONResponse(content=_profiling_response(profiler), status_code=200)
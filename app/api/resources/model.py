@@ -12,10 +12,11 @@ class Model:
     status: Status
     model: DelayModel | None = field(default=None)
     errors: list[Error] = field(default_factory=list)
+    parent_id: uuid.UUID | None = field(default=None)
 
     @classmethod
-    def new_model(cls) -> 'Model':
-        return cls(id=uuid.uuid4(), status=Status.PENDING)
+    def new_model(cls, parent_id: uuid.UUID | None = None) -> 'Model':
+        return cls(id=uuid.uuid4(), status=Status.PENDING, parent_id=parent_id)
 
     def new_model_response(self, exported: bool | None = None, deployed: bool = False) -> dict[str, str | bool | list[dict[str, str]]]:
         json_resp: dict[str, str | bool | list[dict[str, str]]] = {
@@ -23,6 +24,8 @@ class Model:
             'status': self.status.value,
             'deployed': deployed
         }
+        if self.parent_id is not None:
+            json_resp['parent'] = str(self.parent_id)
         if exported:
             json_resp['download'] = 'OK'
         if self.errors:
@@ -1,11 +1,16 @@
 from app.api.schemas.status import Status
+from app.api.schemas.put_candidate_body import CandidateRequestBody
 from app.api.schemas.create_model_body import CreateModelRequestBody
-from app.api.schemas.post_predictions_body import PredictionInput
+from app.api.schemas.post_predictions_body import ColumnarPredictionInput, PredictionInput
 from app.api.schemas.post_model_upload_body import UploadModelsBody
+from app.api.schemas.put_profiling_body import ProfilingRequestBody
 
 __all__ = [
     'Status',
+    'CandidateRequestBody',
     'CreateModelRequestBody',
+    'ColumnarPredictionInput',
     'PredictionInput',
+    'ProfilingRequestBody',
     'UploadModelsBody'
 ]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, FilePath, AnyHttpUrl
+from pydantic import BaseModel, FilePath, AnyHttpUrl, Field
 
 
 class UploadModelsBody(BaseModel):
     model_location: FilePath | AnyHttpUrl
+    threshold: float | None = Field(default=None, ge=0, le=1)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Extra, Field
+from pydantic import BaseModel, Extra, Field, model_validator
 
 
 class Flight(BaseModel, extra=Extra.allow):
@@ -14,3 +14,22 @@ class Flight(BaseModel, extra=Extra.allow):
 
 class PredictionInput(BaseModel):
     flights: list[Flight] = Field(min_items=1)
+
+
+class ColumnarPredictionInput(BaseModel, extra=Extra.allow):
+    # The same flights as `PredictionInput` with one list per column, which pydantic validates in bulk
+    opera: list[str] = Field(alias='OPERA', min_length=1)
+    tipovuelo: list[str] = Field(alias='TIPOVUELO', min_length=1)
+    mes: list[int] = Field(alias='MES', min_length=1)
+
+    class Config:
+        populate_by_name = True
+
+    @model_validator(mode='after')
+    def check_lengths(self) -> 'ColumnarPredictionInput':
+        if not len(self.opera) == len(self.tipovuelo) == len(self.mes):
+            raise ValueError('Every column must have the same number of flights')
+        return self
+
+    def columns(self) -> dict[str, list[str] | list[int]]:
+        return {'OPERA': self.opera, 'TIPOVUELO': self.tipovuelo, 'MES': self.mes}
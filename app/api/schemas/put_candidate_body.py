@@ -0,0 +1,10 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class CandidateRequestBody(BaseModel):
+    # `shadow` scores a sample of requests with the candidate as well as the deployed model, and `canary` serves a
+    # sample of requests with the candidate instead
+    mode: Literal['shadow', 'canary']
+    percentage: float = Field(default=10, ge=0, le=100)
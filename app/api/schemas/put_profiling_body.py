@@ -0,0 +1,9 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ProfilingRequestBody(BaseModel):
+    # `cprofile` writes a profile of each request and model call, `sampling` aggregates the stacks of every thread,
+    # and `None` stops profiling
+    mode: Literal['cprofile', 'sampling'] | None
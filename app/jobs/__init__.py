@@ -0,0 +1,7 @@
+from app.jobs.feature_cache import FeatureCache
+from app.jobs.training import TrainingExecutor
+
+__all__ = [
+    'FeatureCache',
+    'TrainingExecutor'
+]
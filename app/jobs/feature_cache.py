@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Sequence
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+from app.model.preprocessing import DELAY_THRESHOLD_MINUTES, TRAINING_DTYPES
+
+# Changes to how the training data is preprocessed must bump this, so that stale entries are no longer found
+CACHE_VERSION: Final[int] = 1
+_SUFFIX: Final[str] = '.npy'
+
+
+class FeatureCache:
+    # The features and targets of a data source only matter to training through the number of rows with each
+    # target and feature vector, so those counts are cached on disk for every data source that has been read.
+    # Entries are keyed by the path, size and modification time of the file along with the features, and the
+    # least recently used entries are removed once the cache grows beyond `max_bytes`.
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(data_source: str, features: Sequence[str]) -> str:
+        stat = os.stat(data_source)
+        fingerprint = {
+            'version': CACHE_VERSION,
+            'path': os.path.realpath(data_source),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'features': list(features),
+            'columns': TRAINING_DTYPES,
+            'delay_threshold': DELAY_THRESHOLD_MINUTES
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> npt.NDArray[np.int64] | None:
+        file_name = self._file_name(key)
+        try:
+            counts = np.array(np.load(file_name, mmap_mode='r', allow_pickle=False), dtype=np.int64)
+            # The modification time orders entries by when they were last used
+            os.utime(file_name)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return counts
+
+    def put(self, key: str, counts: npt.NDArray[np.int64]) -> None:
+        file_name = self._file_name(key)
+        temporary_file_name = f'{file_name}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary_file_name, 'wb') as f:
+            np.save(f, np.ascontiguousarray(counts, dtype=np.int64), allow_pickle=False)
+        os.replace(temporary_file_name, file_name)
+        self._evict()
+
+    def clear(self) -> None:
+        for file_name, _, _ in self._entries():
+            os.remove(file_name)
+
+    def stats(self) -> dict[str, int]:
+        entries = self._entries()
+        with self._lock:
+            return {
+                'max_bytes': self.max_bytes,
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _file_name(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}{_SUFFIX}')
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        entries = []
+        with os.scandir(self.path) as directory:
+            for entry in directory:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Removed by another process
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for file_name, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(file_name)
+            except FileNotFoundError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
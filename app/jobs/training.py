@@ -0,0 +1,154 @@
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from app.api.errors import DataFormatError, InternalServerError, InvalidDataSourceError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.jobs.feature_cache import FeatureCache
+from app.metrics import ServiceMetrics
+from app.model import DelayModel
+from app.store import ModelStore
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+
+def train_model(data_source: str, chunk_size: int | None = None) -> DelayModel:
+    return DelayModel().train(data_source, chunksize=chunk_size)
+
+
+def update_model(base_model: DelayModel, data_source: str, chunk_size: int | None = None) -> DelayModel:
+    if chunk_size:
+        return base_model.update(data_source, chunksize=chunk_size)
+    return base_model.update(data_source)
+
+
+def count_data(data_source: str, chunk_size: int | None = None) -> tuple[npt.NDArray[np.int64], dict[str, float]]:
+    # Counting always reads the file in chunks, as the counts are the same however the file is read
+    timings: dict[str, float] = {}
+    return DelayModel().count_file(data_source, chunk_size or 100_000, timings), timings
+
+
+def fit_counts(counts: npt.NDArray[np.int64], base_model: DelayModel | None = None) -> DelayModel:
+    if base_model is not None:
+        return base_model.update_counts(counts)
+    return DelayModel().fit_counts(counts)
+
+
+class TrainingExecutor:
+    def __init__(self, model_store: ModelStore[str, Model], max_workers: int = 2, use_processes: bool = False,
+                 chunk_size: int | None = None, feature_cache: FeatureCache | None = None,
+                 metrics: ServiceMetrics | None = None) -> None:
+        self._model_store = model_store
+        self._chunk_size = chunk_size
+        self.feature_cache = feature_cache
+        self.metrics = metrics
+        # Jobs are always coordinated from a thread, the process pool only runs the training itself
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='depart-training')
+        self._processes: Executor | None = None
+        if use_processes:
+            # Forking a process that is already running threads is unsafe, so workers are spawned instead
+            self._processes = ProcessPoolExecutor(max_workers=max_workers,
+                                                  mp_context=multiprocessing.get_context('spawn'))
+        self._jobs: dict[str, Future[None]] = {}
+        self._lock = Lock()
+
+    def submit(self, model: Model, data_source: str, threshold: float | None = None,
+               base_model: DelayModel | None = None) -> Future[None]:
+        model_id = str(model.id)
+        future = self._threads.submit(self._run, model, data_source, threshold, base_model)
+        with self._lock:
+            self._jobs[model_id] = future
+        future.add_done_callback(lambda _: self._forget(model_id))
+        return future
+
+    def wait(self, model_id: str, timeout: float | None = None) -> None:
+        with self._lock:
+            future = self._jobs.get(model_id)
+        if future is not None:
+            wait([future], timeout=timeout)
+
+    def shutdown(self, wait_for_jobs: bool = True) -> None:
+        self._threads.shutdown(wait=wait_for_jobs, cancel_futures=not wait_for_jobs)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait_for_jobs, cancel_futures=not wait_for_jobs)
+
+    def _forget(self, model_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(model_id, None)
+
+    def _run(self, model: Model, data_source: str, threshold: float | None, base_model: DelayModel | None) -> None:
+        model_id = str(model.id)
+        try:
+            self._model_store.update_status(model_id, Status.RUNNING)
+            start = time.perf_counter()
+            try:
+                delay_model = self._train(data_source, base_model)
+            except FileNotFoundError:
+                self._fail(model, InvalidDataSourceError())
+                return
+            except (KeyError, TypeError, ValueError):
+                self._fail(model, DataFormatError())
+                return
+            except OSError:
+                # Such as a data source URL that could not be read
+                logger.exception('Reading %s to train model %s failed', data_source, model_id)
+                self._fail(model, InvalidDataSourceError())
+                return
+            if self.metrics is not None:
+                self.metrics.observe_training(model_id, time.perf_counter() - start, delay_model.training_timings)
+
+            if threshold is not None or base_model is None:
+                delay_model.threshold = threshold
+            self._model_store.update_model(model_id, delay_model)
+            self._model_store.update_status(model_id, Status.COMPLETED)
+        except KeyError:
+            # The model was deleted from the store before training finished
+            return
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Nothing reads the result of the job, so any other failure, including the store failing to save the
+            # model, must still fail the model
+            logger.exception('Training model %s from %s failed', model_id, data_source)
+            with contextlib.suppress(KeyError, ValueError):
+                # The model may have been deleted meanwhile, or completed before the store failed
+                self._fail(model, InternalServerError())
+
+    def _train(self, data_source: str, base_model: DelayModel | None) -> DelayModel:
+        # The cache is keyed by the size and modification time of a file, so other data sources such as URLs are not
+        # cached
+        if self.feature_cache is not None and os.path.isfile(data_source):
+            return self._train_cached(self.feature_cache, data_source, base_model)
+        if base_model is not None:
+            return self._call(update_model, base_model, data_source, self._chunk_size)
+        return self._call(train_model, data_source, self._chunk_size)
+
+    def _train_cached(self, feature_cache: FeatureCache, data_source: str,
+                      base_model: DelayModel | None) -> DelayModel:
+        # The cache is used from this thread so that its statistics are kept by the server process
+        key = FeatureCache.key(data_source, DelayModel().features)
+        timings: dict[str, float] = {}
+        if (counts := feature_cache.get(key)) is None:
+            counts, timings = self._call(count_data, data_source, self._chunk_size)
+            feature_cache.put(key, counts)
+        delay_model = self._call(fit_counts, counts, base_model)
+        delay_model.training_timings.update(timings)
+        return delay_model
+
+    def _call(self, function: Callable[..., T], *args: Any) -> T:
+        if self._processes is not None:
+            return self._processes.submit(function, *args).result()
+        return function(*args)
+
+    def _fail(self, model: Model, error: DataFormatError | InternalServerError | InvalidDataSourceError) -> None:
+        model.errors.append(error)
+        self._model_store.update_status(str(model.id), Status.FAILED)
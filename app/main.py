@@ -1,3 +1,10 @@
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Final
 
 import uvicorn
@@ -5,33 +12,105 @@ from fastapi import FastAPI
 
 from app.api.init_router import init_router
 from app.api.resources import Model
+from app.jobs import FeatureCache, TrainingExecutor
+from app.metrics import Profiler, ProfilingMiddleware, RequestMetricsMiddleware, ServiceMetrics, watch_event_loop
 from app.model import DelayModel
-from app.store import ModelStore
+from app.serving import PredictionBatcher
+from app.settings import Settings
+from app.store import DeployedModel, ModelStore, create_model_store, sync_deployed_model, watch_deployments
 
 V1_URL_PREFIX: Final[str] = '/v1'
 
+logger = logging.getLogger(__name__)
 
-def _load_model() -> Model:
-    delay_model = DelayModel.load('./models/modelv1.0.pkl')
+
+def _load_model(file_name: str) -> Model:
+    delay_model = DelayModel.load(file_name)
+    delay_model.warm_up()
     model = Model.new_model()
+    # Every process loading the same default model gives it the same ID, so they agree on which model is deployed
+    model.id = uuid.uuid5(uuid.NAMESPACE_URL, f'depart:{file_name}')
     model.model = delay_model
     return model
 
 
+def _feature_cache(settings: Settings) -> FeatureCache | None:
+    if not settings.feature_cache_path:
+        return None
+    return FeatureCache(settings.feature_cache_path, max_bytes=settings.feature_cache_size)
+
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI) -> AsyncIterator[None]:
+    # The default model is loaded once the server starts rather than when this module is imported
+    settings = app_.state.settings
+    start = time.perf_counter()
+    default_model = _load_model(settings.default_model_path)
+    model_load_ms = (time.perf_counter() - start) * 1000
+    app_.state.model_store = create_model_store(settings.registry, settings.registry_path, default_model,
+                                                settings.model_memory_budget)
+    app_.state.model = DeployedModel.from_model(default_model)
+    app_.state.deployment_version = 0
+    # A persistent registry may already have a model deployed, by another process or before a restart
+    sync_deployed_model(app_.state)
+    app_.state.training_executor = TrainingExecutor(app_.state.model_store,
+                                                    max_workers=settings.training_workers,
+                                                    use_processes=settings.training_executor == 'process',
+                                                    chunk_size=settings.training_chunk_size,
+                                                    feature_cache=_feature_cache(settings),
+                                                    metrics=app_.state.metrics)
+    watchers = []
+    if settings.registry == 'sqlite':
+        watchers.append(asyncio.create_task(watch_deployments(app_.state, settings.registry_poll_interval)))
+    if settings.event_loop_lag_interval > 0:
+        watchers.append(asyncio.create_task(watch_event_loop(app_.state.metrics, settings.event_loop_lag_interval)))
+    if settings.profiling:
+        app_.state.profiler.start(settings.profiling)
+    app_.state.startup = {
+        'model_load_ms': model_load_ms,
+        'lifespan_startup_ms': (time.perf_counter() - start) * 1000
+    }
+    logger.info('Loaded the default model from %s in %.2fms', settings.default_model_path, model_load_ms)
+    yield
+    for watcher in watchers:
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+    app_.state.training_executor.shutdown()
+    app_.state.profiler.stop()
+    app_.state.model_store.close()
+
+
 app = FastAPI(
     title='Delay prediction Service',
     version='1.0.0',
     docs_url=None,
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
 
 app.include_router(init_router(V1_URL_PREFIX))
-app.state.model = _load_model()
-app.state.model_store = ModelStore(default_model=app.state.model)
+app.state.settings = Settings.from_env()
+app.state.metrics = ServiceMetrics()
+app.add_middleware(RequestMetricsMiddleware, metrics=app.state.metrics)
+app.state.profiler = Profiler(app.state.settings.profiling_path, interval=app.state.settings.profiling_interval)
+app.add_middleware(ProfilingMiddleware, profiler=app.state.profiler)
+app.state.model = None
+# A model run alongside the deployed model before it is deployed, see `PUT /v1/models/candidate`
+app.state.candidate = None
+app.state.model_store = ModelStore(default_model=None)
+app.state.deployment_version = 0
+app.state.training_executor = None
+app.state.startup = {}
+app.state.batcher = None
+if app.state.settings.batch_window_ms > 0:
+    app.state.batcher = PredictionBatcher(window=app.state.settings.batch_window_ms / 1000,
+                                          max_batch_size=app.state.settings.batch_max_size)
 
 if __name__ == '__main__':
     # if os.getenv('ENABLE_HTTPS') != 'False':
     #     config['ssl_keyfile'] = os.getenv('TLS_KEY_PATH', '/mnt/certs/tls.key')
     #     config['ssl_certfile'] = os.getenv('TLS_CERT_PATH', '/mnt/certs/tls.crt')
 
-    uvicorn.run(app)
+    # Each worker is a separate process, so workers only share models when a shared registry is used
+    uvicorn.run('app.main:app', workers=app.state.settings.workers)
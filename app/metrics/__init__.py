@@ -0,0 +1,18 @@
+from app.metrics.histogram import Histogram
+from app.metrics.middleware import ProfilingMiddleware, RequestMetricsMiddleware
+from app.metrics.profiling import PROFILING_MODES, Profiler
+from app.metrics.prometheus import PROMETHEUS_MEDIA_TYPE, format_histogram, format_metric
+from app.metrics.service import ServiceMetrics, watch_event_loop
+
+__all__ = [
+    'format_histogram',
+    'format_metric',
+    'Histogram',
+    'Profiler',
+    'PROFILING_MODES',
+    'ProfilingMiddleware',
+    'PROMETHEUS_MEDIA_TYPE',
+    'RequestMetricsMiddleware',
+    'ServiceMetrics',
+    'watch_event_loop'
+]
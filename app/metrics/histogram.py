@@ -0,0 +1,40 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+from threading import Lock
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = sorted(buckets)
+        # The final count holds observations above the largest bucket
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def labels(self) -> list[str]:
+        return [f'{bucket:g}' for bucket in self.buckets] + ['+Inf']
+
+    def collect(self) -> tuple[list[int], float]:
+        # The counts of every bucket and the sum of the observations, read together so that they agree
+        with self._lock:
+            return list(self._counts), self._sum
+
+    def snapshot(self) -> dict[str, float | dict[str, int]]:
+        counts, total = self.collect()
+        labels = self.labels
+        return {
+            'count': sum(counts),
+            'sum': total,
+            'buckets': dict(zip(labels, counts))
+        }
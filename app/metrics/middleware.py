@@ -0,0 +1,48 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.profiling import Profiler
+from app.metrics.service import ServiceMetrics
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: ServiceMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Requests are labelled by the operation that handled them rather than their URL, so IDs do not add series
+            handler = getattr(scope.get('endpoint'), '__name__', None) or 'unmatched'
+            self.metrics.observe_request(scope['method'], handler, status, time.perf_counter() - start)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, profiler: Profiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or self.profiler.mode != 'cprofile':
+            await self.app(scope, receive, send)
+            return
+        # Other requests handled while this one waits are run by the same thread, so they are in its profile too
+        name = scope['method'] + scope['path'].replace('/', '-')
+        with self.profiler.profile(name):
+            await self.app(scope, receive, send)
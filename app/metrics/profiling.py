@@ -0,0 +1,127 @@
+import cProfile
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Final
+
+from app.model import DelayModel
+
+PROFILING_MODES: Final[tuple[str, ...]] = ('cprofile', 'sampling')
+PROFILED_METHODS: Final[tuple[str, ...]] = ('preprocess', 'fit', 'predict', 'predict_with_proba', 'save', 'load')
+
+
+def _folded_stack(thread_name: str, frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join([thread_name, *reversed(names)])
+
+
+class Profiler:
+    def __init__(self, path: str, interval: float = 0.005) -> None:
+        self.path = path
+        # Seconds between samples of every thread's stack when sampling
+        self.interval = interval
+        self.mode: str | None = None
+        self._local = threading.local()
+        self._originals: dict[str, Any] = {}
+        self._stacks: Counter[str] = Counter()
+        self._sampler: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, mode: str) -> None:
+        if mode not in PROFILING_MODES:
+            raise ValueError(f'The profiling mode must be one of {PROFILING_MODES!r}, not {mode!r}')
+        self.stop()
+        os.makedirs(self.path, exist_ok=True)
+        self.mode = mode
+        if mode == 'cprofile':
+            self._wrap_model()
+        else:
+            self._stopped.clear()
+            self._sampler = threading.Thread(target=self._sample, name='depart-profiler', daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> str | None:
+        # Returns the file the samples were written to, as they are aggregated until sampling stops
+        mode, self.mode = self.mode, None
+        if mode == 'cprofile':
+            self._unwrap_model()
+        elif mode == 'sampling' and self._sampler is not None:
+            self._stopped.set()
+            self._sampler.join()
+            self._sampler = None
+            return self._write_stacks()
+        return None
+
+    def files(self) -> list[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path) if name.endswith(('.prof', '.folded')))
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        # A thread can only run one profile at a time, so calls made while it is already profiling are included
+        # in the outer profile. Disabled profiling costs a single comparison.
+        if self.mode != 'cprofile' or getattr(self._local, 'active', False):
+            yield
+            return
+        profile = cProfile.Profile()
+        self._local.active = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._local.active = False
+            profile.dump_stats(os.path.join(self.path, f'{time.time_ns()}-{name}.prof'))
+
+    def _wrap_model(self) -> None:
+        # The methods are only replaced while profiling, so a disabled profiler adds nothing to their calls
+        for name in PROFILED_METHODS:
+            original = DelayModel.__dict__[name]
+            self._originals[name] = original
+            if isinstance(original, classmethod):
+                setattr(DelayModel, name, classmethod(self._wrap(original.__func__, f'DelayModel.{name}')))
+            else:
+                setattr(DelayModel, name, self._wrap(original, f'DelayModel.{name}'))
+
+    def _unwrap_model(self) -> None:
+        for name, original in self._originals.items():
+            setattr(DelayModel, name, original)
+        self._originals.clear()
+
+    def _wrap(self, function: Callable[..., Any], name: str) -> Callable[..., Any]:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.profile(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def _sample(self) -> None:
+        sampler_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = [_folded_stack(names.get(thread_id, str(thread_id)), frame)
+                      for thread_id, frame in sys._current_frames().items()  # pylint: disable=protected-access
+                      if thread_id != sampler_id]
+            with self._lock:
+                self._stacks.update(stacks)
+
+    def _write_stacks(self) -> str:
+        # Each line is a stack and the number of times it was sampled, the format read by flame graph tools
+        with self._lock:
+            stacks, self._stacks = self._stacks, Counter()
+        file_name = os.path.join(self.path, f'{time.time_ns()}-stacks.folded')
+        with open(file_name, 'w', encoding='utf-8') as f:
+            f.writelines(f'{stack} {count}\n' for stack, count in stacks.most_common())
+        return file_name
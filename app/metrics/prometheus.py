@@ -0,0 +1,45 @@
+from collections.abc import Iterable, Mapping
+from typing import Final
+
+from app.metrics.histogram import Histogram
+
+PROMETHEUS_MEDIA_TYPE: Final[str] = 'text/plain; version=0.0.4; charset=utf-8'
+
+Labels = Mapping[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def format_metric(name: str, metric_type: str, description: str,
+                  samples: Iterable[tuple[Labels, float]]) -> list[str]:
+    lines = [f'# HELP {name} {description}', f'# TYPE {name} {metric_type}']
+    lines.extend(f'{name}{_format_labels(labels)} {_format_value(value)}' for labels, value in samples)
+    return lines
+
+
+def format_histogram(name: str, description: str, histograms: Iterable[tuple[Labels, Histogram]]) -> list[str]:
+    lines = [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+    for labels, histogram in histograms:
+        counts, total = histogram.collect()
+        # Histograms count the observations in each bucket, while Prometheus buckets include every smaller one
+        cumulative = 0
+        for bound, count in zip(histogram.labels, counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{_format_labels({**labels, "le": bound})} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+        lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return lines
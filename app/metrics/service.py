@@ -0,0 +1,97 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Final
+
+from app.metrics.histogram import Histogram
+from app.metrics.prometheus import format_histogram, format_metric
+
+PREDICTION_STAGES: Final[tuple[str, ...]] = ('encode_features', 'predict', 'encode_response')
+TRAINING_STAGES: Final[tuple[str, ...]] = ('read', 'preprocess', 'fit')
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                                             0.25, 0.5, 1, 2.5, 5, 10)
+TRAINING_BUCKETS: Final[tuple[float, ...]] = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+ROW_BUCKETS: Final[tuple[int, ...]] = tuple(4 ** exponent for exponent in range(11))
+
+
+class ServiceMetrics:
+    def __init__(self, max_models: int = 100) -> None:
+        # Every series is kept in this process, so recording an observation is a lookup and an increment
+        self.prediction_stages = {stage: Histogram(LATENCY_BUCKETS) for stage in PREDICTION_STAGES}
+        self.prediction_rows = Histogram(ROW_BUCKETS)
+        self.training_stages = {stage: Histogram(TRAINING_BUCKETS) for stage in TRAINING_STAGES}
+        self.training_durations = Histogram(TRAINING_BUCKETS)
+        self.event_loop_lag = Histogram(LATENCY_BUCKETS)
+        # Only the models trained most recently are reported, so that the number of series stays bounded
+        self.max_models = max_models
+        self._model_durations: OrderedDict[str, float] = OrderedDict()
+        self._requests: dict[tuple[str, str, str], Histogram] = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.prediction_stages[stage].observe(time.perf_counter() - start)
+
+    def observe_request(self, method: str, handler: str, status: int, seconds: float) -> None:
+        key = (method, handler, str(status))
+        if (histogram := self._requests.get(key)) is None:
+            with self._lock:
+                histogram = self._requests.setdefault(key, Histogram(LATENCY_BUCKETS))
+        histogram.observe(seconds)
+
+    def observe_training(self, model_id: str, seconds: float, timings: dict[str, float]) -> None:
+        self.training_durations.observe(seconds)
+        for stage, stage_seconds in timings.items():
+            if (histogram := self.training_stages.get(stage)) is not None:
+                histogram.observe(stage_seconds)
+        with self._lock:
+            self._model_durations[model_id] = seconds
+            self._model_durations.move_to_end(model_id)
+            while len(self._model_durations) > self.max_models:
+                self._model_durations.popitem(last=False)
+
+    def model_durations(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._model_durations)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            requests = sorted(self._requests.items())
+        return [
+            *format_histogram('depart_http_request_duration_seconds',
+                              'Time taken to respond to requests, including validating the request body',
+                              ((dict(zip(('method', 'handler', 'status'), key)), histogram)
+                               for key, histogram in requests)),
+            *format_histogram('depart_prediction_stage_duration_seconds',
+                              'Time taken by each stage of making predictions',
+                              (({'stage': stage}, histogram) for stage, histogram in self.prediction_stages.items())),
+            *format_histogram('depart_prediction_request_rows', 'Flights predicted in each request',
+                              [({}, self.prediction_rows)]),
+            *format_histogram('depart_training_stage_duration_seconds',
+                              'Time taken by each stage of training a model',
+                              (({'stage': stage}, histogram) for stage, histogram in self.training_stages.items())),
+            *format_histogram('depart_training_duration_seconds', 'Time taken to train each model',
+                              [({}, self.training_durations)]),
+            *format_metric('depart_model_training_duration_seconds', 'gauge',
+                           'Time taken to train the models trained most recently',
+                           (({'model': model_id}, seconds) for model_id, seconds in self.model_durations().items())),
+            *format_histogram('depart_event_loop_lag_seconds',
+                              'How late the event loop ran a callback scheduled at a fixed interval',
+                              [({}, self.event_loop_lag)])
+        ]
+
+
+async def watch_event_loop(metrics: ServiceMetrics, interval: float) -> None:
+    # A blocked event loop wakes this task up late, and the delay is how long other requests were held up
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        metrics.event_loop_lag.observe(max(loop.time() - start - interval, 0.0))
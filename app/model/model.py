@@ -1,9 +1,26 @@
+from __future__ import annotations
+
+import itertools
 import pickle
-from datetime import datetime
+import time
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LogisticRegression
+import numpy.typing as npt
+
+from app.model.preprocessing import (TRAINING_DTYPES, FlightLike, build_feature_index, encode_columns,
+                                     encode_flights, get_delays, get_min_diffs, one_hot_encode)
+from app.model.scorer import LinearScorer, all_binary_vectors, encode_binary_vectors, is_binary
+from app.model.serialization import (ModelArtifact, artifact_to_bytes, is_artifact, read_artifact, validate_artifact,
+                                     write_artifact)
+
+# pandas and scikit-learn are slow to import and only needed for training, so they are imported when first used
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
 
 
 def get_min_diff(data: pd.DataFrame) -> float:
@@ -16,63 +33,267 @@ def get_min_diff(data: pd.DataFrame) -> float:
 class DelayModel:
     def __init__(self) -> None:
         self._model = None  # type: LogisticRegression
+        self._scorer: LinearScorer | None = None
+        # Number of training rows for each target and feature vector, used to update the model with new data
+        self._counts: npt.NDArray[np.int64] | None = None
+        # Probability of delay above which a flight is predicted as delayed, `None` uses the estimator's own rule
+        self.threshold: float | None = None
+        # Rows predicted from the lookup tables of the scorer and rows that had to be computed
+        self.lookup_rows = 0
+        self.computed_rows = 0
+        # Seconds spent reading, preprocessing and fitting the data this model was trained on
+        self.training_timings: dict[str, float] = {}
 
     @classmethod
-    def load(cls, file_name: str) -> 'DelayModel':
+    def load(cls, file_name: str, allow_pickle: bool = True) -> 'DelayModel':
+        if is_artifact(file_name):
+            return cls.from_artifact(read_artifact(file_name))
+        if not allow_pickle:
+            raise ValueError(f'The file {file_name!r} is not a native model file')
+        # Pickled estimators are still accepted so that models saved by older versions can be loaded
         with open(file_name, 'rb') as f:
             model = pickle.load(f)
+        from sklearn.linear_model import LogisticRegression  # pylint: disable=import-outside-toplevel
         instance = cls()
         if not isinstance(model, LogisticRegression):
             raise AttributeError(f'The file {file_name!r} does not contain a valid model. '
                                  f'Expected type {type(LogisticRegression)!r} but got {type(model)!r} ')
         instance._model = model
+        instance._compile()
+
+        return instance
+
+    @classmethod
+    def from_artifact(cls, artifact: ModelArtifact) -> 'DelayModel':
+        instance = cls()
+        if artifact.features != instance.features:
+            raise ValueError('The features of the model do not match the features of DelayModel')
+        validate_artifact(artifact)
+        # Only the scorer is needed to make predictions, so no estimator is created
+        instance._scorer = LinearScorer(artifact.coef, artifact.intercept, artifact.classes)
+        instance._counts = artifact.counts
+        instance.threshold = artifact.threshold
 
         return instance
 
+    def to_artifact(self) -> ModelArtifact:
+        if self._model is not None:
+            scorer = LinearScorer(self._model.coef_[0], self._model.intercept_[0], self._model.classes_.tolist())
+        elif self._scorer is not None:
+            scorer = self._scorer
+        else:
+            raise ValueError('Only a fitted model can be saved')
+        return ModelArtifact(features=self.features, coef=scorer.coef, intercept=scorer.intercept,
+                             classes=scorer.classes, threshold=self.threshold, counts=self._counts,
+                             metadata={'created_at': datetime.now(timezone.utc).isoformat()})
+
     def preprocess(self, data: pd.DataFrame, target_column: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame] | pd.DataFrame:
-        data['min_diff'] = data.apply(get_min_diff, axis=1)
-
-        threshold_in_minutes = 15
-        data['delay'] = np.where(data['min_diff'] > threshold_in_minutes, 1, 0)
-        features = pd.concat([
-            pd.get_dummies(data['OPERA'], prefix='OPERA'),
-            pd.get_dummies(data['TIPOVUELO'], prefix='TIPOVUELO'),
-            pd.get_dummies(data['MES'], prefix='MES')],
-            axis=1
-        )
-        # For test data, see if there are any missing features
-        missing_columns = set(self.features) - set(features.columns)
-        # And if so, add them
-        for column in missing_columns:
-            features[column] = 0
-
-        top_features = features[self.features]
+        top_features = one_hot_encode(data, self.features)
         if target_column:
-            return top_features, pd.DataFrame(data[target_column])
+            data['min_diff'] = get_min_diffs(data)
+            data['delay'] = get_delays(data['min_diff'])
+            return top_features, data[[target_column]]
 
         return top_features
 
-    def fit(self, features: pd.DataFrame, target: pd.DataFrame) -> 'DelayModel':
+    def transform_for_inference(self, flights: Sequence[FlightLike]) -> npt.NDArray[np.float64]:
+        return encode_flights(flights, self._feature_index, len(self.features))
+
+    def transform_columns(self, columns: Mapping[str, Sequence[Any]]) -> npt.NDArray[np.float64]:
+        return encode_columns(columns, self._feature_index, len(self.features))
+
+    def fit(self, features: pd.DataFrame, target: pd.DataFrame | npt.NDArray[np.int64],
+            sample_weight: npt.NDArray[np.int64] | None = None) -> 'DelayModel':
+        from sklearn.linear_model import LogisticRegression  # pylint: disable=import-outside-toplevel
         n_y0 = len(features[features == 0])
         n_y1 = len(features[features == 1])
 
         self._model = LogisticRegression(class_weight={1: n_y0 / len(features), 0: n_y1 / len(features)})
-        self._model.fit(features, target)
+        start = time.perf_counter()
+        self._model.fit(features, target, sample_weight=sample_weight)
+        self.training_timings['fit'] = time.perf_counter() - start
+        self._counts = None
+        self._compile()
 
         return self
 
-    def train(self, file_name: str, target_col: str = 'delay') -> 'DelayModel':
+    def fit_counts(self, counts: npt.NDArray[np.int64]) -> 'DelayModel':
+        # `counts[label, code]` is the number of rows with the given target whose features pack to `code`.
+        # Fitting on each distinct row weighted by its count minimises the same loss as fitting on every row.
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        labels, codes = np.nonzero(counts)
+        features = pd.DataFrame(all_binary_vectors(len(self.features))[codes], columns=self.features)
+        self.fit(features, labels, sample_weight=counts[labels, codes])
+        self._counts = counts
+
+        return self
+
+    def count_features(self, features: pd.DataFrame, target: pd.DataFrame) -> npt.NDArray[np.int64]:
+        n_codes = 2 ** len(self.features)
+        codes = encode_binary_vectors(features.to_numpy(dtype=np.float64))
+        labels = target.to_numpy(dtype=np.int64).ravel()
+        if not np.isin(labels, (0, 1)).all():
+            raise ValueError('Only binary targets can be counted')
+        return np.bincount(labels * n_codes + codes, minlength=2 * n_codes).reshape(2, n_codes)
+
+    def count_file(self, file_name: str, chunksize: int,
+                   timings: dict[str, float] | None = None) -> npt.NDArray[np.int64]:
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        counts = np.zeros((2, 2 ** len(self.features)), dtype=np.int64)
+        read = preprocess = 0.0
+        reader = pd.read_csv(file_name, usecols=list(TRAINING_DTYPES), dtype=TRAINING_DTYPES, chunksize=chunksize)
+        with reader:
+            # Reading happens as each chunk is taken from the reader, so the time between chunks is split in two
+            start = time.perf_counter()
+            for chunk in reader:
+                read_end = time.perf_counter()
+                counts += self.count_features(*self.preprocess(chunk, 'delay'))
+                read += read_end - start
+                start = time.perf_counter()
+                preprocess += start - read_end
+        if timings is not None:
+            timings['read'] = timings.get('read', 0.0) + read
+            timings['preprocess'] = timings.get('preprocess', 0.0) + preprocess
+        return counts
+
+    def train(self, file_name: str, target_col: str = 'delay', chunksize: int | None = None) -> 'DelayModel':
+        self.training_timings = {}
+        if chunksize:
+            if target_col != 'delay':
+                raise ValueError('Chunked training only supports the delay target')
+            return self.fit_counts(self.count_file(file_name, chunksize, self.training_timings))
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        start = time.perf_counter()
         data = pd.read_csv(file_name)
+        read_end = time.perf_counter()
 
         features, target = self.preprocess(data, target_col)
-        return self.fit(features, target)
+        self.training_timings.update(read=read_end - start, preprocess=time.perf_counter() - read_end)
+        self.fit(features, target)
+        if target_col == 'delay':
+            self._counts = self.count_features(features, target)
+        return self
 
-    def predict(self, features: pd.DataFrame) -> list[int]:
-        return self._model.predict(features).tolist()
+    def update(self, file_name: str, chunksize: int = 100_000) -> 'DelayModel':
+        # Only the new data is read, it is added to the counts this model was trained on and a new model is fitted
+        if self._counts is None:
+            raise ValueError('Only models trained on the delay target by DelayModel.train can be updated')
+        timings: dict[str, float] = {}
+        model = self.update_counts(self.count_file(file_name, chunksize, timings))
+        model.training_timings.update(timings)
+        return model
 
-    def save(self, file_name: str) -> None:
-        with open(file_name, 'wb') as f:
-            pickle.dump(self._model, f)
+    def update_counts(self, counts: npt.NDArray[np.int64]) -> 'DelayModel':
+        if self._counts is None:
+            raise ValueError('Only models trained on the delay target by DelayModel.train can be updated')
+        model = DelayModel()
+        model.threshold = self.threshold
+        return model.fit_counts(self._counts + counts)
+
+    @property
+    def counts(self) -> npt.NDArray[np.int64] | None:
+        return self._counts
+
+    @property
+    def updatable(self) -> bool:
+        return self._counts is not None
+
+    @property
+    def nbytes(self) -> int:
+        # An estimate of the memory held by the model, from the arrays of the scorer, counts and estimator
+        arrays = [self._counts] + [getattr(self._model, name, None) for name in ('coef_', 'intercept_', 'classes_')]
+        size = sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+        return size + (self._scorer.nbytes if self._scorer is not None else 0)
+
+    def predict(self, features: pd.DataFrame | npt.NDArray[np.float64], threshold: float | None = None) -> list[int]:
+        threshold = self.threshold if threshold is None else threshold
+        if threshold is not None:
+            labels, _ = self.predict_with_proba(features, threshold)
+            return labels
+        if self._scorer is not None:
+            matrix = self._to_matrix(features)
+            if is_binary(matrix):
+                self.lookup_rows += len(matrix)
+                return self._scorer.predict(matrix).tolist()
+            self.computed_rows += len(matrix)
+            if self._model is None:
+                return self._scorer.evaluate(matrix)[0].tolist()
+        else:
+            self.computed_rows += len(features)
+        return self._model.predict(self._to_estimator_input(features)).tolist()
+
+    def predict_proba(self, features: pd.DataFrame | npt.NDArray[np.float64]) -> list[float]:
+        _, probabilities = self.predict_with_proba(features)
+        return probabilities
+
+    def predict_with_proba(self, features: pd.DataFrame | npt.NDArray[np.float64],
+                           threshold: float | None = None) -> tuple[list[int], list[float]]:
+        threshold = self.threshold if threshold is None else threshold
+        matrix = self._to_matrix(features)
+        if self._scorer is not None and is_binary(matrix):
+            self.lookup_rows += len(matrix)
+            labels, probabilities = self._scorer.predict_with_proba(matrix)
+        elif self._scorer is not None and self._model is None:
+            self.computed_rows += len(matrix)
+            labels, probabilities = self._scorer.evaluate(matrix)
+        else:
+            self.computed_rows += len(matrix)
+            estimator_input = self._to_estimator_input(features)
+            labels = self._model.predict(estimator_input)
+            probabilities = self._model.predict_proba(estimator_input)[:, 1]
+        if threshold is not None:
+            negative_class, positive_class = self._scorer.classes if self._scorer is not None else self._model.classes_
+            labels = np.where(probabilities >= threshold, positive_class, negative_class)
+
+        return labels.tolist(), probabilities.tolist()
+
+    def warm_up(self, n_rows: int = 64) -> None:
+        # Serves a synthetic batch with every known value of each feature column, so that anything built on first
+        # use is ready before the model is deployed. The rows are left out of the prediction stats.
+        columns = {column: [value for value, _ in zip(itertools.cycle(values), range(n_rows))]
+                   for column, values in self._feature_index.items()}
+        lookup_rows, computed_rows = self.lookup_rows, self.computed_rows
+        features = self.transform_columns(columns)
+        self.predict(features)
+        self.predict_with_proba(features, 0.5)
+        self.lookup_rows, self.computed_rows = lookup_rows, computed_rows
+
+    def prediction_stats(self) -> dict[str, int | float]:
+        total = self.lookup_rows + self.computed_rows
+        return {
+            'lookup_rows': self.lookup_rows,
+            'computed_rows': self.computed_rows,
+            'lookup_rate': self.lookup_rows / total if total else 0.0
+        }
+
+    def save(self, file_name: str, compress: bool = False) -> None:
+        write_artifact(self.to_artifact(), file_name, compress)
+
+    def to_bytes(self, compress: bool = False) -> bytes:
+        return artifact_to_bytes(self.to_artifact(), compress)
+
+    @staticmethod
+    def _to_matrix(features: pd.DataFrame | npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        return features if isinstance(features, np.ndarray) else features.to_numpy(dtype=np.float64)
+
+    def _to_estimator_input(self, features: pd.DataFrame | npt.NDArray[np.float64]) -> pd.DataFrame | npt.NDArray[Any]:
+        if isinstance(features, np.ndarray) and hasattr(self._model, 'feature_names_in_'):
+            # Avoids sklearn warning that the features are unnamed
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+            return pd.DataFrame(features, columns=self.features, copy=False)
+        return features
+
+    def _compile(self) -> None:
+        # The scorer is only used when it reproduces the estimator's output for every possible input
+        self._scorer = LinearScorer.from_estimator(self._model, self.features)
+
+    @cached_property
+    def _feature_index(self) -> dict[str, dict[str, int]]:
+        return build_feature_index(self.features)
+
+    @property
+    def feature_columns(self) -> list[str]:
+        return list(self._feature_index)
 
     @property
     def features(self) -> list[str]:
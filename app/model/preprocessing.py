@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Final, Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DATE_FORMAT: Final[str] = '%Y-%m-%d %H:%M:%S'
+DELAY_THRESHOLD_MINUTES: Final[int] = 15
+# The only columns of the training data that are needed to build the features and the `delay` target
+TRAINING_DTYPES: Final[dict[str, str]] = {
+    'Fecha-I': 'object',
+    'Fecha-O': 'object',
+    'OPERA': 'category',
+    'TIPOVUELO': 'category',
+    'MES': 'int8'
+}
+
+
+class FlightLike(Protocol):
+    opera: str
+    tipovuelo: str
+    mes: int
+
+
+def split_feature(feature: str) -> tuple[str, str]:
+    column, value = feature.split('_', 1)
+    return column, value
+
+
+def get_min_diffs(data: pd.DataFrame) -> pd.Series:
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    fecha_o = pd.to_datetime(data['Fecha-O'], format=DATE_FORMAT)
+    fecha_i = pd.to_datetime(data['Fecha-I'], format=DATE_FORMAT)
+    if fecha_o.isna().any() or fecha_i.isna().any():
+        raise ValueError('Both Fecha-O and Fecha-I must be set for every flight')
+    return (fecha_o - fecha_i).dt.total_seconds() / 60
+
+
+def get_delays(min_diffs: pd.Series) -> npt.NDArray[np.int64]:
+    return np.where(min_diffs > DELAY_THRESHOLD_MINUTES, 1, 0)
+
+
+def one_hot_encode(data: pd.DataFrame, features: Sequence[str]) -> pd.DataFrame:
+    # Each source column is factorized once, so the string comparisons below run once per distinct value
+    # rather than once per row. The output matches `pd.get_dummies` followed by selecting `features`:
+    # observed categories are boolean and categories absent from `data` are filled with integer zeros.
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    factorized: dict[str, tuple[npt.NDArray[np.intp], list[str]]] = {}
+    columns: dict[str, npt.NDArray[np.bool_ | np.int64]] = {}
+    for feature in features:
+        column, value = split_feature(feature)
+        if column not in factorized:
+            codes, uniques = pd.factorize(data[column])
+            factorized[column] = codes, [str(unique) for unique in uniques]
+        codes, uniques = factorized[column]
+        if value not in uniques:
+            columns[feature] = np.zeros(len(data), dtype=np.int64)
+            continue
+        # `pd.factorize` marks missing values with -1, which indexes the trailing `False`
+        lookup = np.array([unique == value for unique in uniques] + [False])
+        columns[feature] = lookup[codes]
+
+    return pd.DataFrame(columns, index=data.index)
+
+
+def build_feature_index(features: Sequence[str]) -> dict[str, dict[str, int]]:
+    index: dict[str, dict[str, int]] = {}
+    for position, feature in enumerate(features):
+        column, value = split_feature(feature)
+        index.setdefault(column, {})[value] = position
+    return index
+
+
+def encode_flights(flights: Sequence[FlightLike], feature_index: dict[str, dict[str, int]],
+                   n_features: int) -> npt.NDArray[np.float64]:
+    encoded = np.zeros((len(flights), n_features), dtype=np.float64)
+    # Feature columns map onto the lower-case attribute names of `FlightLike`, e.g. `OPERA` -> `opera`
+    lookups = [(column.lower(), values) for column, values in feature_index.items()]
+    for row, flight in enumerate(flights):
+        for attribute, values in lookups:
+            position = values.get(str(getattr(flight, attribute)))
+            if position is not None:
+                encoded[row, position] = 1.0
+    return encoded
+
+
+def encode_columns(columns: Mapping[str, Sequence[Any]], feature_index: dict[str, dict[str, int]],
+                   n_features: int) -> npt.NDArray[np.float64]:
+    # Gives the same features as `one_hot_encode` for raw column values, without building a DataFrame. Each
+    # distinct value is only looked up once, then the position of every row is set at once.
+    n_rows = len(next(iter(columns.values()), []))
+    encoded = np.zeros((n_rows, n_features), dtype=np.float64)
+    rows = np.arange(n_rows)
+    for column, values in columns.items():
+        if not (positions := feature_index.get(column)):
+            continue
+        lookup = {value: positions.get(str(value), -1) for value in dict.fromkeys(values)}
+        found = np.fromiter(map(lookup.__getitem__, values), dtype=np.intp, count=n_rows)
+        matched = found >= 0
+        encoded[rows[matched], found[matched]] = 1.0
+    return encoded
@@ -0,0 +1,79 @@
+from collections.abc import Sequence
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+MAX_FEATURES: Final[int] = 16
+
+
+def all_binary_vectors(n_features: int) -> npt.NDArray[np.float64]:
+    # Row `i` is the binary representation of `i`, with feature `j` stored in bit `j`
+    codes = np.arange(2 ** n_features)[:, np.newaxis]
+    return ((codes >> np.arange(n_features)) & 1).astype(np.float64)
+
+
+def encode_binary_vectors(features: npt.NDArray[Any]) -> npt.NDArray[np.intp]:
+    # The inverse of `all_binary_vectors`, each row of 0/1 features is packed into a single integer
+    return (features @ (2.0 ** np.arange(features.shape[1]))).astype(np.intp)
+
+
+def is_binary(features: npt.NDArray[Any]) -> bool:
+    return bool(((features == 0) | (features == 1)).all())
+
+
+class LinearScorer:
+    def __init__(self, coef: npt.NDArray[np.float64], intercept: float, classes: Sequence[int]) -> None:
+        n_features = len(coef)
+        if n_features > MAX_FEATURES:
+            raise ValueError(f'A lookup table can only be built for up to {MAX_FEATURES} features, got {n_features}')
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.classes = list(classes)
+        # With only binary features there are 2^n possible inputs, so every score is computed up front
+        scores = all_binary_vectors(n_features) @ self.coef + self.intercept
+        self._labels = np.where(scores > 0, self.classes[1], self.classes[0])
+        self._probabilities = 1.0 / (1.0 + np.exp(-scores))
+
+    @classmethod
+    def from_estimator(cls, estimator: Any, feature_names: Sequence[str]) -> 'LinearScorer | None':
+        coef = getattr(estimator, 'coef_', None)
+        classes = getattr(estimator, 'classes_', None)
+        if coef is None or classes is None or len(classes) != 2:
+            return None
+        if coef.shape != (1, len(feature_names)) or len(feature_names) > MAX_FEATURES:
+            return None
+        scorer = cls(coef[0], estimator.intercept_[0], classes.tolist())
+        if not scorer.matches(estimator, feature_names):
+            return None
+        return scorer
+
+    def matches(self, estimator: Any, feature_names: Sequence[str]) -> bool:
+        vectors = all_binary_vectors(len(self.coef))
+        if hasattr(estimator, 'feature_names_in_'):
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+            vectors = pd.DataFrame(vectors, columns=list(feature_names))
+        try:
+            expected_labels = estimator.predict(vectors)
+            expected_probabilities = estimator.predict_proba(vectors)[:, 1]
+        except ValueError:
+            return False
+        return bool(np.array_equal(expected_labels, self._labels)) and \
+            bool(np.allclose(expected_probabilities, self._probabilities, rtol=0, atol=1e-12))
+
+    @property
+    def nbytes(self) -> int:
+        return self.coef.nbytes + self._labels.nbytes + self._probabilities.nbytes
+
+    def evaluate(self, features: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        # Scores arbitrary features directly, for inputs that are not covered by the lookup tables
+        scores = features @ self.coef + self.intercept
+        return np.where(scores > 0, self.classes[1], self.classes[0]), 1.0 / (1.0 + np.exp(-scores))
+
+    def predict(self, features: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+        return self._labels[encode_binary_vectors(features)]
+
+    def predict_with_proba(self, features: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.int64],
+                                                                             npt.NDArray[np.float64]]:
+        codes = encode_binary_vectors(features)
+        return self._labels[codes], self._probabilities[codes]
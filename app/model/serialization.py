@@ -0,0 +1,189 @@
+import contextlib
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+# A native model file is laid out as:
+#   MAGIC | version (uint16) | header length (uint32) | JSON header | padding to 8 bytes | payload
+# The payload holds the coefficients as little-endian float64 followed by the optional training counts as
+# little-endian int64, and the header holds everything else along with a SHA-256 checksum of the file.
+# Files may also be compressed as a whole with gzip.
+MAGIC: Final[bytes] = b'DEPARTM\x00'
+_GZIP_MAGIC: Final[bytes] = b'\x1f\x8b'
+FORMAT_VERSION: Final[int] = 1
+_PREAMBLE: Final[struct.Struct] = struct.Struct('<8sHI')
+_ALIGNMENT: Final[int] = 8
+# Larger than any model with up to `MAX_FEATURES` features, so a small compressed file can not expand without limit
+MAX_ARTIFACT_SIZE: Final[int] = 64 * 1024 * 1024
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+@dataclass
+class ModelArtifact:
+    features: list[str]
+    coef: npt.NDArray[np.float64]
+    intercept: float
+    classes: list[int]
+    threshold: float | None = None
+    counts: npt.NDArray[np.int64] | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def is_artifact(file_name: str) -> bool:
+    with open(file_name, 'rb') as f:
+        head = f.read(len(MAGIC))
+    return head == MAGIC or head.startswith(_GZIP_MAGIC)
+
+
+def _checksum(header: dict[str, Any], payload: bytes | memoryview) -> str:
+    digest = hashlib.sha256(json.dumps(header, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value: Any) -> bool:
+    return (_is_int(value) or isinstance(value, float)) and bool(np.isfinite(value))
+
+
+def _validate_header(features: Any, classes: Any, intercept: Any, threshold: Any, metadata: Any) -> None:
+    # The checksum only detects accidental damage, so the header is checked before anything is built from it
+    if not isinstance(features, list) or not all(isinstance(feature, str) for feature in features):
+        raise ArtifactError('The features of the model must be a list of names')
+    if not isinstance(classes, list) or len(classes) != 2 or not all(_is_int(label) for label in classes):
+        raise ArtifactError('The model must have exactly two integer classes')
+    if not _is_number(intercept):
+        raise ArtifactError('The intercept of the model must be a number')
+    if threshold is not None and not (_is_number(threshold) and 0 <= threshold <= 1):
+        raise ArtifactError('The threshold of the model must be between 0 and 1')
+    if not isinstance(metadata, dict):
+        raise ArtifactError('The metadata of the model must be an object')
+
+
+def validate_artifact(artifact: ModelArtifact) -> None:
+    if len(artifact.coef) != len(artifact.features):
+        raise ArtifactError('The model must have one coefficient for each feature')
+    if len(artifact.classes) != 2:
+        raise ArtifactError('The model must have exactly two classes')
+    if artifact.counts is not None and artifact.counts.shape != (2, 2 ** len(artifact.features)):
+        raise ArtifactError('The training counts of the model do not match its features')
+
+
+def artifact_to_bytes(artifact: ModelArtifact, compress: bool = False) -> bytes:
+    coef = np.ascontiguousarray(artifact.coef, dtype='<f8')
+    payload = coef.tobytes()
+    header: dict[str, Any] = {
+        'features': list(artifact.features),
+        'classes': [int(label) for label in artifact.classes],
+        'intercept': float(artifact.intercept),
+        'threshold': artifact.threshold,
+        'n_coef': len(coef),
+        'counts_shape': None,
+        'metadata': artifact.metadata
+    }
+    if artifact.counts is not None:
+        header['counts_shape'] = list(artifact.counts.shape)
+        payload += np.ascontiguousarray(artifact.counts, dtype='<i8').tobytes()
+    header['checksum'] = _checksum(header, payload)
+
+    encoded_header = json.dumps(header, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    padding = -(_PREAMBLE.size + len(encoded_header)) % _ALIGNMENT
+    encoded_header += b' ' * padding
+    data = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded_header)) + encoded_header + payload
+    return gzip.compress(data, mtime=0) if compress else data
+
+
+def _decompress(view: memoryview) -> bytes:
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(view, MAX_ARTIFACT_SIZE + 1)
+    except zlib.error as e:
+        raise ArtifactError('The compressed model is corrupt') from e
+    if len(data) > MAX_ARTIFACT_SIZE:
+        raise ArtifactError(f'The model is larger than {MAX_ARTIFACT_SIZE} bytes once decompressed')
+    if not decompressor.eof:
+        raise ArtifactError('The compressed model is corrupt')
+    return data
+
+
+def artifact_from_buffer(buffer: bytes | memoryview | mmap.mmap) -> ModelArtifact:
+    # Views are released explicitly, otherwise a memory map could not be closed after an error
+    with memoryview(buffer) as view:
+        if bytes(view[:len(_GZIP_MAGIC)]) == _GZIP_MAGIC:
+            return artifact_from_buffer(_decompress(view))
+        if len(view) < _PREAMBLE.size:
+            raise ArtifactError('The file is too short to be a model')
+        magic, version, header_length = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC:
+            raise ArtifactError('The file is not a model')
+        if version != FORMAT_VERSION:
+            raise ArtifactError(f'Unsupported model format version {version}, expected {FORMAT_VERSION}')
+        payload_start = _PREAMBLE.size + header_length
+        try:
+            header = json.loads(bytes(view[_PREAMBLE.size:payload_start]))
+            checksum = header.pop('checksum')
+            features, classes, intercept = header['features'], header['classes'], header['intercept']
+            threshold, metadata = header['threshold'], header['metadata']
+            n_coef, counts_shape = header['n_coef'], header['counts_shape']
+        except (AttributeError, KeyError, TypeError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ArtifactError('The model header is corrupt') from e
+        _validate_header(features, classes, intercept, threshold, metadata)
+        if not _is_int(n_coef) or n_coef != len(features):
+            raise ArtifactError('The model must have one coefficient for each feature')
+        if counts_shape is not None and counts_shape != [2, 2 ** len(features)]:
+            raise ArtifactError('The training counts of the model do not match its features')
+
+        with view[payload_start:] as payload:
+            if _checksum(header, payload) != checksum:
+                raise ArtifactError('The model checksum does not match its contents')
+            n_counts = int(np.prod(counts_shape)) if counts_shape is not None else 0
+            if len(payload) != 8 * (n_coef + n_counts):
+                raise ArtifactError('The model payload does not match its header')
+            # Arrays are copied out of the buffer so it can be closed once the artifact has been read
+            coef = np.frombuffer(payload, dtype='<f8', count=n_coef).astype(np.float64)
+            counts = None
+            if counts_shape is not None:
+                counts = np.frombuffer(payload, dtype='<i8', offset=8 * n_coef).astype(np.int64).reshape(counts_shape)
+
+    return ModelArtifact(features=features, coef=coef, intercept=float(intercept), classes=classes,
+                         threshold=threshold, counts=counts, metadata=metadata)
+
+
+def write_artifact(artifact: ModelArtifact, file_name: str, compress: bool = False) -> None:
+    # The file is written under a temporary name first, so that it is never read while incomplete
+    temporary_file_name = f'{file_name}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temporary_file_name, 'wb') as f:
+            f.write(artifact_to_bytes(artifact, compress))
+        os.replace(temporary_file_name, file_name)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary_file_name)
+        raise
+
+
+def read_artifact(file_name: str) -> ModelArtifact:
+    with open(file_name, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            # Empty files can not be memory mapped
+            raise ArtifactError('The file is too short to be a model') from e
+    with buffer:
+        return artifact_from_buffer(buffer)
@@ -0,0 +1,8 @@
+from app.serving.batcher import PredictionBatcher
+from app.serving.candidate import CANDIDATE_MODES, CandidateDeployment
+
+__all__ = [
+    'CANDIDATE_MODES',
+    'CandidateDeployment',
+    'PredictionBatcher'
+]
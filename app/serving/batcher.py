@@ -0,0 +1,91 @@
+import asyncio
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+
+from app.metrics import Histogram
+from app.model import DelayModel
+
+BatchKey = tuple[int, float | None, bool]
+BatchResult = tuple[list[int], list[float] | None]
+
+
+@dataclass
+class _Batch:
+    model: DelayModel
+    threshold: float | None
+    probabilities: bool
+    loop: asyncio.AbstractEventLoop
+    features: list[npt.NDArray[np.float64]] = field(default_factory=list)
+    futures: list['asyncio.Future[BatchResult]'] = field(default_factory=list)
+    n_rows: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class PredictionBatcher:
+    def __init__(self, window: float, max_batch_size: int) -> None:
+        self.window = window
+        self.max_batch_size = max_batch_size
+        buckets = [2 ** exponent for exponent in range(max_batch_size.bit_length() + 1)]
+        self.batch_sizes = Histogram(buckets)
+        self.requests_per_batch = Histogram(buckets)
+        self._batches: dict[BatchKey, _Batch] = {}
+
+    async def predict(self, model: DelayModel, features: npt.NDArray[np.float64], threshold: float | None = None,
+                      probabilities: bool = False) -> BatchResult:
+        loop = asyncio.get_running_loop()
+        # Requests are only coalesced when they would have produced the same kind of output from the same model
+        key = (id(model), threshold, probabilities)
+        batch = self._batches.get(key)
+        if batch is None or batch.loop is not loop:
+            batch = _Batch(model, threshold, probabilities, loop)
+            batch.timer = loop.call_later(self.window, self._flush, key, batch)
+            self._batches[key] = batch
+
+        future: asyncio.Future[BatchResult] = loop.create_future()
+        batch.features.append(features)
+        batch.futures.append(future)
+        batch.n_rows += len(features)
+        if batch.n_rows >= self.max_batch_size:
+            self._flush(key, batch)
+
+        return await future
+
+    def stats(self) -> dict[str, float | dict[str, float | dict[str, int]]]:
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch_size': self.max_batch_size,
+            'batch_sizes': self.batch_sizes.snapshot(),
+            'requests_per_batch': self.requests_per_batch.snapshot()
+        }
+
+    def _flush(self, key: BatchKey, batch: _Batch) -> None:
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        if not batch.futures:
+            return
+        futures, batch.futures = batch.futures, []
+        self.batch_sizes.observe(batch.n_rows)
+        self.requests_per_batch.observe(len(futures))
+
+        try:
+            features = np.concatenate(batch.features)
+            if batch.probabilities:
+                labels, probabilities = batch.model.predict_with_proba(features, batch.threshold)
+            else:
+                labels, probabilities = batch.model.predict(features, batch.threshold), None
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for future, request_features in zip(futures, batch.features):
+            end = start + len(request_features)
+            if not future.done():
+                future.set_result((labels[start:end], probabilities[start:end] if probabilities is not None else None))
+            start = end
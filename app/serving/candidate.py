@@ -0,0 +1,98 @@
+import asyncio
+import random
+import time
+from collections.abc import Callable, Sequence
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+from app.metrics import Histogram
+from app.metrics.service import LATENCY_BUCKETS
+from app.model import DelayModel
+
+CANDIDATE_MODES: Final[tuple[str, ...]] = ('shadow', 'canary')
+
+# Each model encodes the flights with its own feature index, so a request is transformed again for the candidate
+Transform = Callable[[DelayModel], npt.NDArray[np.float64]]
+CandidateStats = dict[str, str | float | int | None | dict[str, float | dict[str, int]]]
+
+
+class CandidateDeployment:
+    def __init__(self, model_id: str, model: DelayModel, mode: str, percentage: float, max_pending: int = 8) -> None:
+        if mode not in CANDIDATE_MODES:
+            raise ValueError(f'The candidate mode must be one of {CANDIDATE_MODES!r}, not {mode!r}')
+        self.model_id = model_id
+        self.model = model
+        self.mode = mode
+        # Percentage of prediction requests that are shadowed by, or routed to, the candidate
+        self.percentage = percentage
+        # Shadow requests are dropped rather than queued once this many are being scored
+        self.max_pending = max_pending
+        self.requests = 0
+        self.dropped = 0
+        self.failures = 0
+        self.rows = 0
+        self.agreeing_rows = 0
+        self.latencies = {'deployed': Histogram(LATENCY_BUCKETS), 'candidate': Histogram(LATENCY_BUCKETS)}
+        self._pending: set[asyncio.Task[None]] = set()
+        self._random = random.Random()
+
+    def routes(self) -> bool:
+        # Whether a canary candidate serves this request instead of the deployed model
+        if self.mode != 'canary' or not self._sample():
+            return False
+        self.requests += 1
+        return True
+
+    def shadow(self, transform: Transform, labels: Sequence[int], threshold: float | None) -> None:
+        # Scores the same request with the candidate once the deployed model has answered it. The candidate is run
+        # in a worker thread by a task that is not awaited, so the response is sent without waiting for it.
+        if self.mode != 'shadow' or not self._sample():
+            return
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self.requests += 1
+        task = asyncio.get_running_loop().create_task(self._score(transform, np.asarray(labels), threshold))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def wait(self) -> None:
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def stats(self) -> CandidateStats:
+        return {
+            'model': self.model_id,
+            'mode': self.mode,
+            'percentage': self.percentage,
+            'requests': self.requests,
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'rows': self.rows,
+            'agreement': self.agreeing_rows / self.rows if self.rows else None,
+            'deployed_latency': self.latencies['deployed'].snapshot(),
+            'candidate_latency': self.latencies['candidate'].snapshot()
+        }
+
+    def _sample(self) -> bool:
+        return self._random.random() * 100 < self.percentage
+
+    async def _score(self, transform: Transform, labels: npt.NDArray[np.int_], threshold: float | None) -> None:
+        try:
+            candidate_labels, seconds = await asyncio.to_thread(self._predict, transform, threshold)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # A candidate that can not score the request is counted rather than failing a request already answered
+            candidate_labels, seconds = None, 0.0
+        if candidate_labels is None or len(candidate_labels) != len(labels):
+            self.failures += 1
+            return
+        self.latencies['candidate'].observe(seconds)
+        self.rows += len(labels)
+        self.agreeing_rows += int(np.count_nonzero(candidate_labels == labels))
+
+    def _predict(self, transform: Transform, threshold: float | None) -> tuple[npt.NDArray[np.int_], float]:
+        start = time.perf_counter()
+        labels = np.asarray(self.model.predict(transform(self.model), threshold))
+        return labels, time.perf_counter() - start
@@ -0,0 +1,42 @@
+import json
+from collections.abc import Sequence
+from typing import Final
+
+import numpy as np
+
+# orjson is an optional dependency, the standard library encoder is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    ORJSON_AVAILABLE = False
+else:
+    ORJSON_AVAILABLE = True
+
+JSON_MEDIA_TYPE: Final[str] = 'application/json'
+
+
+def _encode_labels(labels: Sequence[int]) -> bytes:
+    # The labels are the classes 0 and 1, so each one is encoded as a single digit and the array is built at once
+    try:
+        digits = np.frombuffer(bytes(labels), dtype=np.uint8)
+    except (TypeError, ValueError):
+        digits = None
+    if digits is None or digits.size == 0 or digits.max() > 9:
+        return json.dumps(list(labels), separators=(',', ':')).encode('utf-8')
+    encoded = np.full(2 * len(digits) + 1, ord(','), dtype=np.uint8)
+    encoded[0], encoded[-1] = ord('['), ord(']')
+    encoded[1:-1:2] = digits + ord('0')
+    return encoded.tobytes()
+
+
+def encode_predictions(labels: Sequence[int], probabilities: Sequence[float] | None = None) -> bytes:
+    # Encodes `{'predictions': labels, 'probabilities': probabilities}` to JSON that decodes to the same values as
+    # `JSONResponse` would give, though orjson may format some floats differently, e.g. `1e-05` as `0.00001`
+    if ORJSON_AVAILABLE:
+        content = {'predictions': labels} if probabilities is None else \
+            {'predictions': labels, 'probabilities': probabilities}
+        return orjson.dumps(content)
+    encoded = b'{"predictions":' + _encode_labels(labels)
+    if probabilities is not None:
+        encoded += b',"probabilities":' + json.dumps(probabilities, separators=(',', ':')).encode('utf-8')
+    return encoded + b'}'
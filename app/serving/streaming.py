@@ -0,0 +1,71 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from typing import IO, Any, Final
+
+from app.model import DelayModel
+
+NDJSON_MEDIA_TYPE: Final[str] = 'application/x-ndjson'
+CSV_MEDIA_TYPE: Final[str] = 'text/csv'
+
+Record = dict[str, Any]
+
+
+def read_records(body: IO[bytes], media_type: str) -> Iterator[Record]:
+    # Lines are decoded one at a time so only the current chunk of the body is ever held in memory
+    lines = (line.decode('utf-8') for line in body)
+    if media_type == CSV_MEDIA_TYPE:
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError('Each line must contain a JSON object')
+        yield record
+
+
+def missing_columns(record: Record, columns: Sequence[str]) -> list[str]:
+    return [column for column in columns if column not in record and column.lower() not in record]
+
+
+def _value(record: Record, column: str) -> Any:
+    value = record.get(column, record.get(column.lower()))
+    if value is None or value == '':
+        raise KeyError(column)
+    return value
+
+
+def predict_records(records: Iterable[Record], model: DelayModel, chunk_size: int, threshold: float | None = None,
+                    probabilities: bool = False) -> Iterator[tuple[list[int], list[float] | None]]:
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        features = model.transform_columns({column: [_value(record, column) for record in chunk]
+                                            for column in model.feature_columns})
+        if probabilities:
+            yield model.predict_with_proba(features, threshold)
+        else:
+            yield model.predict(features, threshold), None
+
+
+def encode_ndjson(labels: list[int], probabilities: list[float] | None) -> bytes:
+    if probabilities is None:
+        lines = [f'{{"prediction": {label}}}\n' for label in labels]
+    else:
+        lines = [f'{{"prediction": {label}, "probability": {probability!r}}}\n'
+                 for label, probability in zip(labels, probabilities)]
+    return ''.join(lines).encode('utf-8')
+
+
+def encode_csv(labels: list[int], probabilities: list[float] | None) -> bytes:
+    if probabilities is None:
+        lines = [f'{label}\n' for label in labels]
+    else:
+        lines = [f'{label},{probability!r}\n' for label, probability in zip(labels, probabilities)]
+    return ''.join(lines).encode('utf-8')
+
+
+def csv_header(probabilities: bool) -> bytes:
+    return b'prediction,probability\n' if probabilities else b'prediction\n'
@@ -0,0 +1,67 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Settings:
+    default_model_path: str = './models/modelv1.0.depart'
+    workers: int = 1
+    # Either `memory`, `journal` to keep models in `registry_path` across restarts, or `sqlite` to also share them
+    # and the deployed model between processes
+    registry: str = 'memory'
+    registry_path: str = './registry'
+    # How often each process checks whether another process has deployed a different model
+    registry_poll_interval: float = 1.0
+    # Bytes of trained models each process keeps loaded, 0 keeps every model loaded
+    model_memory_budget: int = 0
+    training_workers: int = 2
+    training_executor: str = 'process'
+    # Rows read from the training data at a time, 0 reads the whole file at once
+    training_chunk_size: int = 100_000
+    # Directory where the preprocessed training data is cached, so that training again on the same data skips
+    # reading it. Empty disables the cache.
+    feature_cache_path: str = ''
+    feature_cache_size: int = 64 * 1024 * 1024
+    # Requests for predictions are coalesced for up to this long, 0 disables batching
+    batch_window_ms: float = 0
+    batch_max_size: int = 256
+    stream_chunk_size: int = 10_000
+    # Streamed request bodies larger than this many bytes are spooled to disk
+    stream_spool_size: int = 16 * 1024 * 1024
+    # Pickled models can run arbitrary code when loaded, disable this to only accept native model uploads
+    allow_pickle_uploads: bool = True
+    # Models uploaded in the request body are rejected above this many bytes
+    max_upload_size: int = 16 * 1024 * 1024
+    # How often, in seconds, the event loop is checked for being held up by blocking work, 0 disables the check
+    event_loop_lag_interval: float = 0.5
+    # Either `cprofile` or `sampling` to profile from startup, profiling can also be started and stopped at runtime
+    profiling: str = ''
+    profiling_path: str = './profiles'
+    # Seconds between samples of every thread's stack when sampling
+    profiling_interval: float = 0.005
+
+    @classmethod
+    def from_env(cls) -> 'Settings':
+        return cls(
+            default_model_path=os.getenv('DEFAULT_MODEL_PATH', cls.default_model_path),
+            workers=int(os.getenv('WORKERS', str(cls.workers))),
+            registry=os.getenv('REGISTRY', cls.registry),
+            registry_path=os.getenv('REGISTRY_PATH', cls.registry_path),
+            registry_poll_interval=float(os.getenv('REGISTRY_POLL_INTERVAL', str(cls.registry_poll_interval))),
+            model_memory_budget=int(os.getenv('MODEL_MEMORY_BUDGET', str(cls.model_memory_budget))),
+            training_workers=int(os.getenv('TRAINING_WORKERS', str(cls.training_workers))),
+            training_executor=os.getenv('TRAINING_EXECUTOR', cls.training_executor),
+            training_chunk_size=int(os.getenv('TRAINING_CHUNK_SIZE', str(cls.training_chunk_size))),
+            feature_cache_path=os.getenv('FEATURE_CACHE_PATH', cls.feature_cache_path),
+            feature_cache_size=int(os.getenv('FEATURE_CACHE_SIZE', str(cls.feature_cache_size))),
+            batch_window_ms=float(os.getenv('BATCH_WINDOW_MS', str(cls.batch_window_ms))),
+            batch_max_size=int(os.getenv('BATCH_MAX_SIZE', str(cls.batch_max_size))),
+            stream_chunk_size=int(os.getenv('STREAM_CHUNK_SIZE', str(cls.stream_chunk_size))),
+            stream_spool_size=int(os.getenv('STREAM_SPOOL_SIZE', str(cls.stream_spool_size))),
+            allow_pickle_uploads=os.getenv('ALLOW_PICKLE_UPLOADS', str(cls.allow_pickle_uploads)).lower() == 'true',
+            max_upload_size=int(os.getenv('MAX_UPLOAD_SIZE', str(cls.max_upload_size))),
+            event_loop_lag_interval=float(os.getenv('EVENT_LOOP_LAG_INTERVAL', str(cls.event_loop_lag_interval))),
+            profiling=os.getenv('PROFILING', cls.profiling),
+            profiling_path=os.getenv('PROFILING_PATH', cls.profiling_path),
+            profiling_interval=float(os.getenv('PROFILING_INTERVAL', str(cls.profiling_interval)))
+        )
@@ -1,5 +1,17 @@
+from app.store.deployment import DeployedModel, deploy_model, serve_models, sync_deployed_model, watch_deployments
+from app.store.journal_store import JournalModelStore
 from app.store.model_store import ModelStore
+from app.store.registry import create_model_store
+from app.store.sqlite_store import SQLiteModelStore
 
 __all__ = [
-    'ModelStore'
+    'create_model_store',
+    'deploy_model',
+    'DeployedModel',
+    'JournalModelStore',
+    'ModelStore',
+    'serve_models',
+    'SQLiteModelStore',
+    'sync_deployed_model',
+    'watch_deployments'
 ]
@@ -0,0 +1,28 @@
+import os
+
+from app.model import DelayModel
+
+
+class ArtifactDirectory:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def file_name(self, model_id: str) -> str:
+        return os.path.join(self.path, f'{model_id}.depart')
+
+    def save(self, model_id: str, model: DelayModel) -> None:
+        # Other processes may read the artifact at any time, which is safe as models are written atomically
+        model.save(self.file_name(model_id))
+
+    def load(self, model_id: str) -> DelayModel | None:
+        try:
+            return DelayModel.load(self.file_name(model_id), allow_pickle=False)
+        except FileNotFoundError:
+            return None
+
+    def delete(self, model_id: str) -> None:
+        try:
+            os.remove(self.file_name(model_id))
+        except FileNotFoundError:
+            pass
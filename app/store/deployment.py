@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import uuid
+from dataclasses import dataclass
+
+from starlette.datastructures import State
+
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from app.store.model_store import ModelStore
+
+# Deployments are made from worker threads, the event loop and the thread watching the registry, so recording a
+# deployment in the store and publishing it to the state are done together
+_deployment_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DeployedModel:
+    # The model requests are served by. It holds on to the trained model rather than the store's mutable `Model`,
+    # so a request is never served by a model that has since been unloaded or replaced.
+    id: uuid.UUID
+    model: DelayModel | None
+
+    @classmethod
+    def from_model(cls, model: Model) -> 'DeployedModel':
+        return cls(model.id, model.model)
+
+
+def _published(store: ModelStore[str, Model], model: Model | None) -> DeployedModel | None:
+    if model is None:
+        return None
+    if model.model is None and (stored := store.get(str(model.id))) is not None:
+        # Reading a model that has been unloaded from the store loads it again
+        model = stored
+    return DeployedModel.from_model(model)
+
+
+def _warm_up(model: DeployedModel | None) -> None:
+    if model is not None and model.model is not None:
+        model.model.warm_up()
+
+
+def _served_ids(state: State) -> set[str]:
+    served = set()
+    if (model := getattr(state, 'model', None)) is not None:
+        served.add(str(model.id))
+    if (candidate := getattr(state, 'candidate', None)) is not None:
+        served.add(candidate.model_id)
+    return served
+
+
+def serve_models(state: State) -> None:
+    # The deployed model and candidate this process serves are never unloaded by the store's memory budget
+    state.model_store.serve(_served_ids(state))
+
+
+def deploy_model(state: State, model: Model | None) -> None:
+    # `None` deploys the default model. The model is warmed up before it replaces the deployed model in a single
+    # assignment, so each request is served by either the previous model or the new one once it is ready.
+    store = state.model_store
+    deployed = _published(store, model if model is not None else store.default_model)
+    _warm_up(deployed)
+    with _deployment_lock:
+        # Both models are kept loaded while requests may still be served by the previous one
+        if deployed is not None:
+            store.serve(_served_ids(state) | {str(deployed.id)})
+        state.deployment_version = store.deploy(str(model.id) if model is not None else None)
+        state.model = deployed
+        # Deploying the candidate promotes it, so it is no longer run alongside itself
+        candidate = getattr(state, 'candidate', None)
+        if candidate is not None and deployed is not None and candidate.model_id == str(deployed.id):
+            state.candidate = None
+        serve_models(state)
+
+
+def sync_deployed_model(state: State) -> bool:
+    # Picks up a model that was deployed through another process sharing the same store
+    store = state.model_store
+    version = store.deployment_version
+    if version == state.deployment_version:
+        return False
+    model_id = store.deployed_id
+    model = store.get(model_id) if model_id is not None else None
+    deployed = _published(store, model) if model is not None and model.status == Status.COMPLETED else None
+    if deployed is None or deployed.model is None:
+        deployed = _published(store, store.default_model)
+    _warm_up(deployed)
+    with _deployment_lock:
+        # Another deployment may have been made while the model was loaded, it is picked up by the next check
+        if store.deployment_version != version or state.deployment_version == version:
+            return False
+        if deployed is not None:
+            store.serve(_served_ids(state) | {str(deployed.id)})
+        state.model = deployed
+        state.deployment_version = version
+        serve_models(state)
+    return True
+
+
+async def watch_deployments(state: State, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        # Reading the store can load a model from disk, so it is kept off the event loop
+        await asyncio.to_thread(sync_deployed_model, state)
@@ -0,0 +1,146 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from app.api.errors import TrainingInterruptedError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from app.store.artifacts import ArtifactDirectory
+from app.store.model_store import KT, VT, ModelStore
+from app.store.records import model_from_record, model_to_record
+
+Entry = dict[str, Any]
+
+
+@dataclass
+class JournalModelStore(ModelStore[KT, VT]):
+    # Every change to the store is appended to a journal and synced to disk before the call making it returns, and
+    # trained models are saved next to it in the native format before the journal refers to them. Replaying the
+    # journal restores the store after a restart without loading any models, they are only read when first used.
+    path: str = './registry'
+    # The journal is rewritten once it holds this many more entries than there are models
+    compact_after: int = 1000
+    _journal: IO[str] = field(init=False, repr=False)
+    _artifacts: ArtifactDirectory = field(init=False, repr=False)
+    _with_artifact: set[str] = field(default_factory=set, init=False, repr=False)
+    _n_entries: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self._artifacts = ArtifactDirectory(os.path.join(self.path, 'artifacts'))
+        self._journal_path = os.path.join(self.path, 'models.journal')
+        self._replay()
+        self._journal = open(self._journal_path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+        # Jobs do not survive a restart, so models that were still training can never complete
+        for model in list(self._data.values()):
+            if model.status in (Status.PENDING, Status.RUNNING):
+                model.errors.append(TrainingInterruptedError())
+                model.status = Status.FAILED
+                self._put(model)
+
+    def _replay(self) -> None:
+        if not os.path.exists(self._journal_path):
+            return
+        with open(self._journal_path, 'rb+') as journal:
+            offset = 0
+            while line := journal.readline():
+                try:
+                    entry = json.loads(line)
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    if journal.readline():
+                        raise
+                    # Only the last entry can be incomplete, when the process stopped while writing it
+                    journal.truncate(offset)
+                    break
+                self._apply(entry)
+                offset = journal.tell()
+
+    def _apply(self, entry: Entry) -> None:
+        self._n_entries += 1
+        if entry['op'] == 'put':
+            model_id = entry['model']['id']
+            self._data[model_id] = model_from_record(entry['model'])  # type: ignore[assignment]
+            if entry['artifact']:
+                self._with_artifact.add(model_id)
+        elif entry['op'] == 'delete':
+            self._data.pop(entry['id'], None)
+            self._with_artifact.discard(entry['id'])
+        elif entry['op'] == 'deploy':
+            self._deployed_id, self._deployment_version = entry['id'], entry['version']
+
+    def _append(self, entry: Entry) -> None:
+        self._journal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._n_entries += 1
+        if self._n_entries > len(self._data) + self.compact_after:
+            self._compact()
+
+    def _put(self, model: Model) -> None:
+        model_id = str(model.id)
+        self._append({'op': 'put', 'model': model_to_record(model), 'artifact': model_id in self._with_artifact})
+
+    def _compact(self) -> None:
+        # The journal is replaced by the smallest journal that gives the same store
+        temporary_path = f'{self._journal_path}.tmp'
+        entries: list[Entry] = [{'op': 'put', 'model': model_to_record(model), 'artifact': str(model_id) in
+                                 self._with_artifact} for model_id, model in self._data.items()]
+        entries.append({'op': 'deploy', 'id': self._deployed_id, 'version': self._deployment_version})
+        with open(temporary_path, 'w', encoding='utf-8') as journal:
+            journal.writelines(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._journal.close()
+        os.replace(temporary_path, self._journal_path)
+        self._journal = open(self._journal_path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+        self._n_entries = len(entries)
+
+    def update_status(self, model_id: KT, status: Status) -> None:
+        with self._lock:
+            super().update_status(model_id, status)
+            self._put(self._data[model_id])
+
+    def update_model(self, model_id: KT, model: DelayModel) -> None:
+        with self._lock:
+            super().update_model(model_id, model)
+            self._artifacts.save(str(model_id), model)
+            self._with_artifact.add(str(model_id))
+            self._put(self._data[model_id])
+
+    def deploy(self, model_id: KT | None) -> int:
+        with self._lock:
+            version = super().deploy(model_id)
+            self._append({'op': 'deploy', 'id': None if model_id is None else str(model_id), 'version': version})
+        return version
+
+    def clear(self) -> None:
+        with self._lock:
+            for model_id in list(self):
+                del self[model_id]
+
+    def close(self) -> None:
+        with self._lock:
+            self._journal.close()
+
+    def __setitem__(self, model_id: KT, value: VT) -> None:
+        with self._lock:
+            if value.model is not None:
+                self._artifacts.save(str(model_id), value.model)
+                self._with_artifact.add(str(model_id))
+            super().__setitem__(model_id, value)
+            self._put(value)
+
+    def __delitem__(self, model_id: KT) -> None:
+        with self._lock:
+            super().__delitem__(model_id)
+            self._append({'op': 'delete', 'id': str(model_id)})
+            self._artifacts.delete(str(model_id))
+            self._with_artifact.discard(str(model_id))
+
+    def _unload(self, model_id: str, model: Model) -> None:
+        model.model = None
+
+    def _reload(self, model_id: str) -> DelayModel | None:
+        return self._artifacts.load(model_id) if model_id in self._with_artifact else None
@@ -1,9 +1,12 @@
-from collections.abc import MutableMapping, Iterator
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, MutableMapping, Iterator
 from dataclasses import dataclass, field
 from typing import Any, TypeVar
 
 from app.api.resources import Model
 from app.model.model import DelayModel
+from app.model.serialization import artifact_from_buffer, artifact_to_bytes
 from app.api.schemas import Status
 
 KT = TypeVar('KT', bound=str)
@@ -13,7 +16,21 @@ VT = TypeVar('VT', bound=Model)
 @dataclass
 class ModelStore(MutableMapping[KT, VT]):
     default_model: Model | None
+    # Bytes of trained models to keep in memory, 0 keeps every model. Once it is exceeded, the least recently used
+    # models are unloaded until they are next read, apart from the deployed and served models.
+    memory_budget: int = 0
     _data: dict[KT, VT] = field(default_factory=dict, init=False)
+    _deployed_id: KT | None = field(default=None, init=False)
+    _deployment_version: int = field(default=0, init=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+    # The size of each loaded model, from least to most recently used
+    _loaded: OrderedDict[str, int] = field(default_factory=OrderedDict, init=False, repr=False)
+    _evicted: dict[str, bytes] = field(default_factory=dict, init=False, repr=False)
+    # Models this process serves, which lag behind the deployed model when it is deployed through another process
+    _served: frozenset[str] = field(default=frozenset(), init=False, repr=False)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
 
     def update_status(self, model_id: KT, status: Status) -> None:
         if model_id not in self:
@@ -26,7 +43,84 @@ class ModelStore(MutableMapping[KT, VT]):
         self[str(model.id)] = model  # type: ignore
 
     def update_model(self, model_id: KT, model: DelayModel) -> None:
-        self[model_id].model = model
+        with self._lock:
+            self[model_id].model = model
+            self._track(str(model_id), model)
+
+    def deploy(self, model_id: KT | None) -> int:
+        # `None` deploys the default model. The version increases with every deployment so that other processes
+        # sharing the store can tell when the deployed model has changed.
+        self._deployed_id = model_id
+        self._deployment_version += 1
+        return self._deployment_version
+
+    def serve(self, model_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._served = frozenset(model_ids)
+
+    @property
+    def deployed_id(self) -> KT | None:
+        return self._deployed_id
+
+    @property
+    def deployment_version(self) -> int:
+        return self._deployment_version
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'memory_budget': self.memory_budget,
+                'loaded_models': len(self._loaded),
+                'loaded_bytes': sum(self._loaded.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _use(self, model_id: str, model: Model) -> None:
+        # Called whenever a model is read, reloading it if it has been unloaded
+        if model.model is not None:
+            self.hits += 1
+            self._track(model_id, model.model)
+        elif (delay_model := self._reload(model_id)) is not None:
+            self.misses += 1
+            model.model = delay_model
+            self._track(model_id, delay_model)
+
+    def _track(self, model_id: str, model: DelayModel) -> None:
+        if model_id in self._loaded:
+            self._loaded.move_to_end(model_id)
+            return
+        self._loaded[model_id] = model.nbytes
+        if not self.memory_budget:
+            return
+        pinned = {str(self.deployed_id), model_id, *self._served}
+        for candidate in list(self._loaded):
+            if sum(self._loaded.values()) <= self.memory_budget:
+                break
+            if candidate in pinned or (model := self._data.get(candidate)) is None:  # type: ignore[arg-type]
+                continue
+            self._unload(candidate, model)
+            del self._loaded[candidate]
+            self.evictions += 1
+
+    def _forget(self, model_id: str) -> None:
+        self._loaded.pop(model_id, None)
+        self._evicted.pop(model_id, None)
+
+    def _unload(self, model_id: str, model: Model) -> None:
+        # Models are only kept in their compact serialized form, stores that save models to disk reload them instead
+        if model.model is not None:
+            self._evicted[model_id] = artifact_to_bytes(model.model.to_artifact())
+        model.model = None
+
+    def _reload(self, model_id: str) -> DelayModel | None:
+        if (data := self._evicted.pop(model_id, None)) is None:
+            return None
+        return DelayModel.from_artifact(artifact_from_buffer(data))
 
     def get(self, model_id: KT) -> VT | None:  # type: ignore
         if model_id in self:
@@ -34,16 +128,28 @@ class ModelStore(MutableMapping[KT, VT]):
         return None
 
     def clear(self) -> None:
-        self._data.clear()
+        with self._lock:
+            self._data.clear()
+            self._loaded.clear()
+            self._evicted.clear()
 
     def __setitem__(self, model_id: KT, value: VT) -> None:
-        self._data[model_id] = value
+        with self._lock:
+            self._forget(str(model_id))
+            self._data[model_id] = value
+            if value.model is not None:
+                self._track(str(model_id), value.model)
 
     def __delitem__(self, model_id: KT) -> None:
-        del self._data[model_id]
+        with self._lock:
+            del self._data[model_id]
+            self._forget(str(model_id))
 
     def __getitem__(self, model_id: KT) -> VT:
-        return self._data[model_id]
+        with self._lock:
+            model = self._data[model_id]
+            self._use(str(model_id), model)
+            return model
 
     def __len__(self) -> int:
         return len(self._data)
@@ -0,0 +1,35 @@
+import uuid
+from typing import Any
+
+from app.api.errors.error_response import Error
+from app.api.resources import Model
+from app.api.schemas import Status
+
+Record = dict[str, Any]
+
+
+def _error_from_json(data: dict[str, str]) -> Error:
+    error = Error()
+    error.code, error.message, error.status_code = data['code'], data['message'], int(data['status'])
+    return error
+
+
+def model_to_record(model: Model) -> Record:
+    return {
+        'id': str(model.id),
+        'status': model.status.value,
+        'errors': [error.json() for error in model.errors],
+        'parent_id': str(model.parent_id) if model.parent_id is not None else None
+    }
+
+
+def model_from_record(record: Record) -> Model:
+    model = Model(id=uuid.UUID(record['id']), status=Status(record['status']))
+    refresh_model(model, record)
+    return model
+
+
+def refresh_model(model: Model, record: Record) -> None:
+    model.status = Status(record['status'])
+    model.errors = [_error_from_json(error) for error in record['errors']]
+    model.parent_id = uuid.UUID(record['parent_id']) if record['parent_id'] is not None else None
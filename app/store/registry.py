@@ -0,0 +1,17 @@
+from app.api.resources import Model
+from app.store.journal_store import JournalModelStore
+from app.store.model_store import ModelStore
+from app.store.sqlite_store import SQLiteModelStore
+
+REGISTRIES = ('memory', 'journal', 'sqlite')
+
+
+def create_model_store(registry: str, path: str, default_model: Model | None,
+                       memory_budget: int = 0) -> ModelStore[str, Model]:
+    if registry == 'memory':
+        return ModelStore(default_model=default_model, memory_budget=memory_budget)
+    if registry == 'journal':
+        return JournalModelStore(default_model=default_model, memory_budget=memory_budget, path=path)
+    if registry == 'sqlite':
+        return SQLiteModelStore(default_model=default_model, memory_budget=memory_budget, path=path)
+    raise ValueError(f'Unknown model registry {registry!r}, expected one of {", ".join(REGISTRIES)}')
@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from app.store.artifacts import ArtifactDirectory
+from app.store.model_store import KT, VT, ModelStore
+from app.store.records import model_from_record, model_to_record, refresh_model
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS models (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    errors TEXT NOT NULL,
+    parent_id TEXT,
+    has_artifact INTEGER NOT NULL DEFAULT 0,
+    revision INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS deployment (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    model_id TEXT,
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO deployment (id, model_id, version) VALUES (1, NULL, 0);
+'''
+
+
+@dataclass
+class SQLiteModelStore(ModelStore[KT, VT]):
+    # Several processes can open the same registry, e.g. the workers of a single uvicorn server. Model metadata and
+    # the deployed model are kept in an SQLite database, and trained models are saved next to it in the native format.
+    path: str = './registry'
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _artifacts: ArtifactDirectory = field(init=False, repr=False)
+    # The revision of each row when it was last read or written by this process
+    _revisions: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self._artifacts = ArtifactDirectory(os.path.join(self.path, 'artifacts'))
+        self._connection = sqlite3.connect(os.path.join(self.path, 'registry.db'), timeout=30, isolation_level=None,
+                                           check_same_thread=False)
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def _write(self, model: Model, has_artifact: bool = False) -> None:
+        record = model_to_record(model)
+        with self._transaction() as connection:
+            connection.execute(
+                'INSERT INTO models (id, status, errors, parent_id, has_artifact) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET status = excluded.status, errors = excluded.errors, '
+                'parent_id = excluded.parent_id, has_artifact = MAX(has_artifact, excluded.has_artifact), '
+                'revision = revision + 1',
+                (record['id'], record['status'], json.dumps(record['errors']), record['parent_id'], int(has_artifact)))
+            (revision,) = connection.execute('SELECT revision FROM models WHERE id = ?', (record['id'],)).fetchone()
+            self._revisions[record['id']] = revision
+
+    def update_status(self, model_id: KT, status: Status) -> None:
+        with self._lock:
+            super().update_status(model_id, status)
+            self._write(self._data[model_id])
+
+    def update_model(self, model_id: KT, model: DelayModel) -> None:
+        with self._lock:
+            super().update_model(model_id, model)
+            self._artifacts.save(str(model_id), model)
+            self._write(self._data[model_id], has_artifact=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            for model_id in list(self):
+                del self[model_id]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def deploy(self, model_id: KT | None) -> int:
+        with self._transaction() as connection:
+            connection.execute('UPDATE deployment SET model_id = ?, version = version + 1 WHERE id = 1',
+                               (None if model_id is None else str(model_id),))
+            (version,) = connection.execute('SELECT version FROM deployment WHERE id = 1').fetchone()
+        return int(version)
+
+    @property
+    def deployed_id(self) -> KT | None:
+        with self._lock:
+            (model_id,) = self._connection.execute('SELECT model_id FROM deployment WHERE id = 1').fetchone()
+        return model_id
+
+    @property
+    def deployment_version(self) -> int:
+        with self._lock:
+            (version,) = self._connection.execute('SELECT version FROM deployment WHERE id = 1').fetchone()
+        return int(version)
+
+    def __setitem__(self, model_id: KT, value: VT) -> None:
+        with self._lock:
+            if value.model is not None:
+                self._artifacts.save(str(model_id), value.model)
+            super().__setitem__(model_id, value)
+            self._write(value, has_artifact=value.model is not None)
+
+    def __delitem__(self, model_id: KT) -> None:
+        with self._lock:
+            deleted = self._connection.execute('DELETE FROM models WHERE id = ?', (str(model_id),)).rowcount
+            self._artifacts.delete(str(model_id))
+            self._data.pop(model_id, None)
+            self._revisions.pop(str(model_id), None)
+            self._forget(str(model_id))
+        if not deleted:
+            raise KeyError(model_id)
+
+    def __getitem__(self, model_id: KT) -> VT:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT status, errors, parent_id, has_artifact, revision FROM models WHERE id = ?',
+                (str(model_id),)).fetchone()
+            if row is None:
+                self._data.pop(model_id, None)
+                self._revisions.pop(str(model_id), None)
+                self._forget(str(model_id))
+                raise KeyError(model_id)
+            status, errors, parent_id, has_artifact, revision = row
+            record: dict[str, Any] = {'id': str(model_id), 'status': status, 'errors': json.loads(errors),
+                                      'parent_id': parent_id}
+            # Rows that have only been changed by this process are not refreshed, so that changes which have not
+            # been written yet, such as errors added before a status update, are kept
+            if (model := self._data.get(model_id)) is None:
+                model = model_from_record(record)
+                self._data[model_id] = model  # type: ignore[assignment]
+            elif self._revisions.get(str(model_id)) != revision:
+                refresh_model(model, record)
+            self._revisions[str(model_id)] = revision
+            if has_artifact or model.model is not None:
+                self._use(str(model_id), model)
+            return model  # type: ignore[return-value]
+
+    def _unload(self, model_id: str, model: Model) -> None:
+        model.model = None
+
+    def _reload(self, model_id: str) -> DelayModel | None:
+        return self._artifacts.load(model_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute('SELECT COUNT(*) FROM models').fetchone()
+        return int(count)
+
+    def __contains__(self, item: Any) -> bool:
+        with self._lock:
+            row = self._connection.execute('SELECT 1 FROM models WHERE id = ?', (str(item),)).fetchone()
+        return row is not None
+
+    def __iter__(self) -> Iterator[KT]:
+        with self._lock:
+            rows = self._connection.execute('SELECT id FROM models ORDER BY rowid').fetchall()
+        return iter([model_id for (model_id,) in rows])
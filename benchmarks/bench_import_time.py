@@ -0,0 +1,46 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Lines of `python -X importtime` look like `import time:   self [us] | cumulative | imported package`
+_IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+_HEAVY_MODULES = ('pandas', 'scipy', 'sklearn')
+
+
+def _import_times(module: str) -> dict[str, int]:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            check=True, capture_output=True, text=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if match := _IMPORT_TIME_PATTERN.match(line):
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Import time of the app, failing if it exceeds a budget')
+    parser.add_argument('--module', default='app.main')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Number of the slowest top level packages to show')
+    parser.add_argument('--max-ms', type=float, default=None, help='Exit with an error above this import time')
+    args = parser.parse_args()
+
+    runs = [_import_times(args.module) for _ in range(args.repeat)]
+    # The fastest run is the least affected by noise from the rest of the system
+    best = min(runs, key=lambda times: times[args.module])
+    total_ms = best[args.module] / 1000
+    top_level = {name: micros for name, micros in best.items() if '.' not in name}
+    print(f'import {args.module}: {total_ms:.1f}ms (best of {args.repeat})')
+    for name, micros in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f'{name:>30} {micros / 1000:>10.1f}ms')
+
+    failures = [f'{module} is imported' for module in _HEAVY_MODULES if module in best]
+    if args.max_ms is not None and total_ms > args.max_ms:
+        failures.append(f'the import took {total_ms:.1f}ms, more than the budget of {args.max_ms:.1f}ms')
+    if failures:
+        sys.exit('Import time regression: ' + ', '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
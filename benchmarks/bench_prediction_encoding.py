@@ -0,0 +1,56 @@
+import argparse
+import time
+from collections.abc import Callable
+from unittest import mock
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+from app.serving import encoding
+from app.serving.encoding import encode_predictions
+
+
+def _time(func: Callable[..., object], *args: object, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _json_response(labels: list[int], probabilities: list[float] | None) -> bytes:
+    content = {'predictions': labels} if probabilities is None else \
+        {'predictions': labels, 'probabilities': probabilities}
+    return JSONResponse(content=content).body
+
+
+def _stdlib(labels: list[int], probabilities: list[float] | None) -> bytes:
+    with mock.patch.object(encoding, 'ORJSON_AVAILABLE', False):
+        return encode_predictions(labels, probabilities)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare encoding prediction responses with JSONResponse and '
+                                                 'encode_predictions')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f'orjson {"is" if encoding.ORJSON_AVAILABLE else "is not"} installed')
+    print(f'{"flights":>8} {"probabilities":>14} {"JSONResponse (ms)":>18} {"stdlib (ms)":>12} {"orjson (ms)":>12}')
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        labels = rng.integers(0, 2, size).tolist()
+        for probabilities in (None, rng.random(size).tolist()):
+            baseline = _time(_json_response, labels, probabilities, repeat=args.repeat)
+            stdlib = _time(_stdlib, labels, probabilities, repeat=args.repeat)
+            orjson = '-'
+            if encoding.ORJSON_AVAILABLE:
+                orjson = f'{_time(encode_predictions, labels, probabilities, repeat=args.repeat) * 1000:.3f}'
+            print(f'{size:>8} {str(probabilities is not None):>14} {baseline * 1000:>18.3f} {stdlib * 1000:>12.3f} '
+                  f'{orjson:>12}')
+
+
+if __name__ == '__main__':
+    main()
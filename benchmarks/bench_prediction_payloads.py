@@ -0,0 +1,63 @@
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from fastapi.testclient import TestClient
+
+from app.api.schemas import ColumnarPredictionInput, PredictionInput
+from app.main import app
+from app.model import DelayModel
+from benchmarks.synthetic import make_flights
+
+
+def _payloads(n_flights: int) -> tuple[bytes, bytes]:
+    data = make_flights(n_flights)
+    rows = {'flights': data[['OPERA', 'TIPOVUELO', 'MES', 'Fecha-O', 'Fecha-I']].to_dict(orient='records')}
+    columns = {column: data[column].tolist() for column in ('OPERA', 'TIPOVUELO', 'MES', 'Fecha-O', 'Fecha-I')}
+    return json.dumps(rows).encode('utf-8'), json.dumps(columns).encode('utf-8')
+
+
+def _time(func: Callable[..., object], *args: object, repeat: int, **kwargs: object) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _parse_rows(model: DelayModel, body: bytes) -> object:
+    return model.transform_for_inference(PredictionInput.model_validate_json(body).flights)
+
+
+def _parse_columns(model: DelayModel, body: bytes) -> object:
+    return model.transform_columns(ColumnarPredictionInput.model_validate_json(body).columns())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare predictions for flights sent as rows and as columns')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    model = DelayModel()
+    headers = {'content-type': 'application/json'}
+    print(f'{"flights":>8} {"rows parse (ms)":>16} {"columns parse (ms)":>19} '
+          f'{"rows request (ms)":>18} {"columns request (ms)":>21}')
+    with TestClient(app) as client:
+        for size in args.sizes:
+            rows, columns = _payloads(size)
+            # Parsing covers validating the body and encoding the features, as done by the two endpoints
+            timings = [
+                _time(_parse_rows, model, rows, repeat=args.repeat),
+                _time(_parse_columns, model, columns, repeat=args.repeat),
+                _time(client.post, '/v1/predictions', content=rows, headers=headers, repeat=args.repeat),
+                _time(client.post, '/v1/predictions/columns', content=columns, headers=headers, repeat=args.repeat)
+            ]
+            print(f'{size:>8} {timings[0] * 1000:>16.3f} {timings[1] * 1000:>19.3f} '
+                  f'{timings[2] * 1000:>18.3f} {timings[3] * 1000:>21.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.model import DelayModel
+from app.model.model import get_min_diff
+from benchmarks.synthetic import make_flights
+
+
+def legacy_preprocess(model: DelayModel, data: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # The row-wise implementation `DelayModel.preprocess` used before it was vectorized, the tests check that both
+    # give the same features
+    data['min_diff'] = data.apply(get_min_diff, axis=1)
+    data['delay'] = np.where(data['min_diff'] > 15, 1, 0)
+    features = pd.concat([
+        pd.get_dummies(data['OPERA'], prefix='OPERA'),
+        pd.get_dummies(data['TIPOVUELO'], prefix='TIPOVUELO'),
+        pd.get_dummies(data['MES'], prefix='MES')],
+        axis=1
+    )
+    for column in set(model.features) - set(features.columns):
+        features[column] = 0
+    return features[model.features], pd.DataFrame(data['delay'])
+
+
+def _time(func: Callable[[pd.DataFrame], object], data: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        frame = data.copy()
+        start = time.perf_counter()
+        func(frame)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare the row-wise and vectorized DelayModel.preprocess')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-limit', type=int, default=1_000_000,
+                        help='Skip the row-wise implementation above this many rows')
+    args = parser.parse_args()
+
+    model = DelayModel()
+    print(f'{"rows":>10} {"row-wise (s)":>14} {"vectorized (s)":>16} {"speedup":>9}')
+    for size in args.sizes:
+        data = make_flights(size)
+        vectorized = _time(lambda frame: model.preprocess(frame, 'delay'), data, args.repeat)
+        if size <= args.legacy_limit:
+            legacy = _time(lambda frame: legacy_preprocess(model, frame), data, 1)
+            print(f'{size:>10} {legacy:>14.4f} {vectorized:>16.4f} {legacy / vectorized:>8.1f}x')
+        else:
+            print(f'{size:>10} {"-":>14} {vectorized:>16.4f} {"-":>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api.schemas import Status
+from app.jobs import TrainingExecutor
+from app.main import app
+from benchmarks.synthetic import make_flights
+
+_PREDICT_DATA = {
+    'flights': [
+        {
+            'opera': 'Grupo LATAM',
+            'tipovuelo': 'I',
+            'mes': 7,
+            'Fecha-O': '2017-07-01 23:30:00',
+            'Fecha-I': '2017-07-01 23:32:00'
+        }
+    ]
+}
+
+
+def _percentile(latencies: list[float], percentile: float) -> float:
+    return statistics.quantiles(latencies, n=100)[int(percentile) - 1] * 1000
+
+
+def _measure(client: TestClient, n_requests: int) -> list[float]:
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        resp = client.post('/v1/predictions', json=_PREDICT_DATA)
+        latencies.append(time.perf_counter() - start)
+        assert resp.status_code == 200
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    print(f'{label:<28} n={len(latencies):<6} p50={_percentile(latencies, 50):7.3f}ms '
+          f'p99={_percentile(latencies, 99):7.3f}ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Prediction latency while models are trained in the background')
+    parser.add_argument('--rows', type=int, default=300_000, help='Rows in the synthetic training data')
+    parser.add_argument('--trainings', type=int, default=4, help='Number of models trained concurrently')
+    parser.add_argument('--requests', type=int, default=500, help='Prediction requests in the baseline')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='process')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, TestClient(app) as client:
+        data_source = os.path.join(tmp_dir, 'flights.csv')
+        make_flights(args.rows).to_csv(data_source, index=False)
+        app.state.training_executor = TrainingExecutor(app.state.model_store, max_workers=args.trainings,
+                                                       use_processes=args.executor == 'process')
+
+        _report('idle', _measure(client, args.requests))
+
+        start = time.perf_counter()
+        model_ids = []
+        for _ in range(args.trainings):
+            resp = client.post('/v1/models', json={'data_source': data_source})
+            assert resp.status_code == 202
+            model_ids.append(resp.json()['id'])
+
+        latencies: list[float] = []
+        terminal = (Status.COMPLETED, Status.FAILED)
+        while not all(app.state.model_store[model_id].status in terminal for model_id in model_ids):
+            latencies.extend(_measure(client, 10))
+        elapsed = time.perf_counter() - start
+
+        _report(f'{args.trainings} trainings ({args.executor})', latencies)
+        statuses = [app.state.model_store[model_id].status.value for model_id in model_ids]
+        print(f'trainings finished in {elapsed:.2f}s with statuses {statuses}')
+        app.state.training_executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import make_flights
+
+# Run in a fresh interpreter so that the peak RSS only covers a single training run
+_TRAIN_SCRIPT = '''
+import json, resource, sys, time, warnings
+warnings.simplefilter('ignore')
+from app.model import DelayModel
+start = time.perf_counter()
+DelayModel().train(sys.argv[1], chunksize=int(sys.argv[2]) or None)
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+'''
+
+
+def _write_replicated(base_file: str, file_name: str, replicas: int) -> None:
+    with open(base_file, encoding='utf-8') as f:
+        header = f.readline()
+        body = f.read()
+    with open(file_name, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for _ in range(replicas):
+            f.write(body)
+
+
+def _train(file_name: str, chunk_size: int) -> dict[str, float]:
+    result = subprocess.run([sys.executable, '-c', _TRAIN_SCRIPT, file_name, str(chunk_size)],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Peak memory and time of full and chunked training')
+    parser.add_argument('--rows', type=int, default=20_000, help='Rows in the 1x dataset')
+    parser.add_argument('--replicas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--full-limit', type=int, default=10, help='Skip full training above this many replicas')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_file = os.path.join(tmp_dir, 'base.csv')
+        make_flights(args.rows).to_csv(base_file, index=False)
+        print(f'{"dataset":>8} {"rows":>10} {"mode":>8} {"time (s)":>10} {"peak RSS (MB)":>14}')
+        for replicas in args.replicas:
+            file_name = os.path.join(tmp_dir, f'flights_{replicas}x.csv')
+            _write_replicated(base_file, file_name, replicas)
+            modes = [('chunked', args.chunk_size)]
+            if replicas <= args.full_limit:
+                modes.insert(0, ('full', 0))
+            for mode, chunk_size in modes:
+                result = _train(file_name, chunk_size)
+                print(f'{f"{replicas}x":>8} {args.rows * replicas:>10} {mode:>8} {result["seconds"]:>10.2f} '
+                      f'{result["peak_rss_mb"]:>14.1f}')
+            os.remove(file_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import json
+from typing import Any
+
+_METRICS = ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_rss_mb')
+
+
+def _load(file_name: str) -> dict[str, Any]:
+    with open(file_name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _change(before: float | None, after: float | None) -> str:
+    if before is None or after is None:
+        return f'{"n/a":>9}'
+    if not before:
+        return f'{"":>9}'
+    return f'{(after - before) / before * 100:>+8.1f}%'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare two results files written by the benchmark suite')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    args = parser.parse_args()
+
+    before, after = _load(args.before), _load(args.after)
+    print(f'before: {before.get("commit")}  after: {after.get("commit")}')
+    if before.get('config') != after.get('config'):
+        print('The results were recorded with different settings, so they may not be comparable')
+    print(f'{"transport":<11} {"scenario":<21} {"metric":<15} {"before":>10} {"after":>10} {"change":>9}')
+    for transport, scenarios in after['results'].items():
+        for scenario, result in scenarios.items():
+            previous = before['results'].get(transport, {}).get(scenario)
+            if previous is None:
+                continue
+            for metric in _METRICS:
+                old, new = previous.get(metric), result.get(metric)
+                old_text = f'{old:>10.2f}' if old is not None else f'{"n/a":>10}'
+                new_text = f'{new:>10.2f}' if new is not None else f'{"n/a":>10}'
+                print(f'{transport:<11} {scenario:<21} {metric:<15} {old_text} {new_text} {_change(old, new)}')
+
+
+if __name__ == '__main__':
+    main()
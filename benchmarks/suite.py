@@ -0,0 +1,335 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from app.settings import Settings
+from benchmarks.synthetic import make_flights
+
+_API_KEY = 'admin=benchmark'
+_ADMIN_HEADERS = {'X-api-key': _API_KEY}
+_TERMINAL_STATUSES = ('completed', 'failed')
+
+Send = Callable[[], httpx.Response]
+
+
+@dataclass
+class Config:
+    requests: int
+    concurrency: int
+    batch_size: int
+    training_rows: int
+    trainings: int
+    deploys: int
+    executor: str
+
+
+@dataclass
+class Workload:
+    data_source: str
+    single: bytes
+    batch: bytes
+    # Scenarios that need a model file upload the default model
+    model: bytes
+
+
+def _flights(n_flights: int, seed: int) -> bytes:
+    data = make_flights(n_flights, seed=seed)
+    flights = data[['OPERA', 'TIPOVUELO', 'MES', 'Fecha-O', 'Fecha-I']].to_dict(orient='records')
+    return json.dumps({'flights': flights}).encode('utf-8')
+
+
+def _percentile(latencies: list[float], percentile: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] * 1000 if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method='inclusive')[percentile - 1] * 1000
+
+
+def _summarise(latencies: list[float], elapsed: float, errors: int) -> dict[str, float]:
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': _percentile(latencies, 50),
+        'p95_ms': _percentile(latencies, 95),
+        'p99_ms': _percentile(latencies, 99)
+    }
+
+
+def _timed(send: Send) -> tuple[float, bool]:
+    start = time.perf_counter()
+    resp = send()
+    return time.perf_counter() - start, resp.status_code < 400
+
+
+def _run_requests(send: Send, n_requests: int, concurrency: int) -> dict[str, float]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: _timed(send), range(n_requests)))
+    elapsed = time.perf_counter() - start
+    return _summarise([latency for latency, _ in results], elapsed, sum(not ok for _, ok in results))
+
+
+def _post_json(client: httpx.Client, url: str, body: bytes) -> Send:
+    return lambda: client.post(url, content=body, headers={'content-type': 'application/json'})
+
+
+def _wait_for_models(client: httpx.Client, model_ids: list[str], timeout: float = 600) -> list[str]:
+    deadline = time.monotonic() + timeout
+    while True:
+        statuses = [client.get(f'/v1/models/{model_id}').json()['status'] for model_id in model_ids]
+        if all(status in _TERMINAL_STATUSES for status in statuses) or time.monotonic() > deadline:
+            return statuses
+        time.sleep(0.05)
+
+
+def _upload(client: httpx.Client, content: bytes) -> httpx.Response:
+    return client.post('/v1/models/upload', content=content, headers={'content-type': 'application/octet-stream'})
+
+
+def single_prediction(client: httpx.Client, workload: Workload, config: Config) -> dict[str, Any]:
+    return _run_requests(_post_json(client, '/v1/predictions', workload.single), config.requests, config.concurrency)
+
+
+def batch_prediction(client: httpx.Client, workload: Workload, config: Config) -> dict[str, Any]:
+    n_requests = max(config.requests // 20, 5)
+    result = _run_requests(_post_json(client, '/v1/predictions', workload.batch), n_requests, config.concurrency)
+    return {**result, 'flights_per_second': result['throughput_rps'] * config.batch_size}
+
+
+def training_and_serving(client: httpx.Client, workload: Workload, config: Config) -> dict[str, Any]:
+    # Predictions are measured for as long as the models are trained, to show how training affects serving
+    start = time.perf_counter()
+    model_ids = []
+    for _ in range(config.trainings):
+        resp = client.post('/v1/models', json={'data_source': workload.data_source})
+        model_ids.append(resp.json()['id'])
+
+    done = threading.Event()
+    statuses: list[str] = []
+
+    def wait() -> None:
+        statuses.extend(_wait_for_models(client, model_ids))
+        done.set()
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    send = _post_json(client, '/v1/predictions', workload.single)
+    latencies, errors = [], 0
+    predictions_start = time.perf_counter()
+    while not done.is_set():
+        latency, ok = _timed(send)
+        latencies.append(latency)
+        errors += not ok
+    waiter.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        **_summarise(latencies, time.perf_counter() - predictions_start, errors),
+        'training_seconds': elapsed,
+        'trainings_completed': statuses.count('completed')
+    }
+
+
+def export_model(client: httpx.Client, workload: Workload, config: Config) -> dict[str, Any]:
+    model_id = _upload(client, workload.model).json()['id']
+    params = {'export': True, 'download': True}
+    return _run_requests(lambda: client.get(f'/v1/models/{model_id}', params=params),
+                         max(config.requests // 10, 5), config.concurrency)
+
+
+def upload_model(client: httpx.Client, workload: Workload, config: Config) -> dict[str, Any]:
+    return _run_requests(lambda: _upload(client, workload.model), max(config.requests // 10, 5), config.concurrency)
+
+
+def deploy_churn(client: httpx.Client, workload: Workload, config: Config) -> dict[str, Any]:
+    # Models are deployed one after another while predictions are made, to show the cost of switching models.
+    # The default model is not in the store and can not be deployed again, so this runs after every other scenario
+    # and leaves an uploaded model deployed.
+    model_ids = [_upload(client, workload.model).json()['id'] for _ in range(2)]
+
+    def deploy(index: int) -> httpx.Response:
+        model_id = model_ids[index % len(model_ids)]
+        return client.put('/v1/models/deploy', params={'model-id': model_id}, headers=_ADMIN_HEADERS)
+
+    stopped = threading.Event()
+    deploys: list[tuple[float, bool]] = []
+
+    def churn() -> None:
+        for index in range(config.deploys):
+            deploys.append(_timed(functools.partial(deploy, index)))
+        stopped.set()
+
+    start = time.perf_counter()
+    churner = threading.Thread(target=churn)
+    churner.start()
+    send = _post_json(client, '/v1/predictions', workload.single)
+    latencies, errors = [], 0
+    while not stopped.is_set():
+        latency, ok = _timed(send)
+        latencies.append(latency)
+        errors += not ok
+    churner.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        **_summarise(latencies, elapsed, errors),
+        'deploys': _summarise([latency for latency, _ in deploys], elapsed, sum(not ok for _, ok in deploys))
+    }
+
+
+# Scenarios always run in this order, `deploy_churn` must stay last as it changes the deployed model
+SCENARIOS: dict[str, Callable[[httpx.Client, Workload, Config], dict[str, Any]]] = {
+    'single_prediction': single_prediction,
+    'batch_prediction': batch_prediction,
+    'training_and_serving': training_and_serving,
+    'export_model': export_model,
+    'upload_model': upload_model,
+    'deploy_churn': deploy_churn
+}
+
+
+def _peak_rss_mb(pid: int | None = None) -> float | None:
+    # The peak resident set size of the process serving requests over its whole life so far
+    if pid is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    try:
+        with open(f'/proc/{pid}/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+@contextmanager
+def _in_process(config: Config) -> Iterator[tuple[httpx.Client, int | None]]:
+    os.environ['TRAINING_EXECUTOR'] = config.executor
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as client:
+        yield client, None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return int(s.getsockname()[1])
+
+
+@contextmanager
+def _over_socket(config: Config) -> Iterator[tuple[httpx.Client, int | None]]:
+    port = _free_port()
+    env = {**os.environ, 'TRAINING_EXECUTOR': config.executor}
+    command = [sys.executable, '-W', 'ignore', '-m', 'uvicorn', 'app.main:app', '--port', str(port),
+               '--log-level', 'warning']
+    with subprocess.Popen(command, env=env) as server:
+        try:
+            with httpx.Client(base_url=f'http://127.0.0.1:{port}', timeout=600,
+                              limits=httpx.Limits(max_connections=config.concurrency * 2)) as client:
+                deadline = time.monotonic() + 60
+                while True:
+                    try:
+                        if client.get('/v1/health').status_code == 204:
+                            break
+                    except httpx.TransportError:
+                        if time.monotonic() > deadline or server.poll() is not None:
+                            raise
+                    time.sleep(0.1)
+                yield client, server.pid
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+TRANSPORTS = {
+    'in_process': _in_process,
+    'socket': _over_socket
+}
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(config: Config, transports: list[str], scenarios: list[str], seed: int) -> dict[str, Any]:
+    os.environ['API_KEY'] = _API_KEY
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_source = os.path.join(tmp_dir, 'flights.csv')
+        make_flights(config.training_rows, seed=seed).to_csv(data_source, index=False)
+        with open(Settings.from_env().default_model_path, 'rb') as f:
+            model = f.read()
+        workload = Workload(data_source, _flights(1, seed), _flights(config.batch_size, seed), model)
+        for transport in transports:
+            results[transport] = {}
+            with TRANSPORTS[transport](config) as (client, pid):
+                for name in (name for name in SCENARIOS if name in scenarios):
+                    result = SCENARIOS[name](client, workload, config)
+                    result['peak_rss_mb'] = _peak_rss_mb(pid)
+                    results[transport][name] = result
+                    print(f'{transport:<11} {name:<21} p50={result["p50_ms"]:8.3f}ms p99={result["p99_ms"]:8.3f}ms '
+                          f'{result["throughput_rps"]:9.1f} req/s', file=sys.stderr)
+    return {
+        'commit': _commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'config': asdict(config),
+        'results': results
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run the benchmark suite and write the results to a JSON file')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--transports', nargs='+', choices=list(TRANSPORTS), default=list(TRANSPORTS))
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=1000, help='Requests made by the prediction scenarios')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+    parser.add_argument('--batch-size', type=int, default=10_000, help='Flights in each large batch')
+    parser.add_argument('--training-rows', type=int, default=100_000, help='Rows in the synthetic training data')
+    parser.add_argument('--trainings', type=int, default=2, help='Models trained at once while serving')
+    parser.add_argument('--deploys', type=int, default=50, help='Models deployed one after another')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='process')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help='Run a small version of every scenario')
+    args = parser.parse_args()
+
+    config = Config(requests=args.requests, concurrency=args.concurrency, batch_size=args.batch_size,
+                    training_rows=args.training_rows, trainings=args.trainings, deploys=args.deploys,
+                    executor=args.executor)
+    if args.quick:
+        config = Config(requests=100, concurrency=4, batch_size=1000, training_rows=5000, trainings=1, deploys=5,
+                        executor=args.executor)
+    results = run(config, args.transports, args.scenarios, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f'Wrote the results to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
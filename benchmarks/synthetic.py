@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    'Fecha-I', 'Vlo-I', 'Ori-I', 'Des-I', 'Emp-I', 'Fecha-O', 'Vlo-O', 'Ori-O', 'Des-O', 'Emp-O',
+    'DIA', 'MES', 'AÑO', 'DIANOM', 'TIPOVUELO', 'OPERA', 'SIGLAORI', 'SIGLADES'
+]
+
+OPERATORS = [
+    'Grupo LATAM', 'Sky Airline', 'Aerolineas Argentinas', 'Copa Air', 'Latin American Wings', 'Avianca',
+    'JetSmart SPA', 'Gol Trans', 'American Airlines', 'Air Canada', 'Iberia', 'Delta Air'
+]
+
+_DAY_NAMES = ['Lunes', 'Martes', 'Miercoles', 'Jueves', 'Viernes', 'Sabado', 'Domingo']
+
+
+def make_flights(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    scheduled = pd.Timestamp('2017-01-01') + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, n_rows), unit='min')
+    delayed = rng.random(n_rows) < 0.2
+    offsets = np.where(delayed, rng.integers(16, 120, n_rows), rng.integers(-5, 16, n_rows))
+    operated = scheduled + pd.to_timedelta(offsets, unit='min')
+    flight_numbers = rng.integers(1, 1000, n_rows)
+
+    return pd.DataFrame({
+        'Fecha-I': scheduled.strftime('%Y-%m-%d %H:%M:%S'),
+        'Vlo-I': flight_numbers,
+        'Ori-I': 'SCEL',
+        'Des-I': 'KMIA',
+        'Emp-I': 'AAL',
+        'Fecha-O': operated.strftime('%Y-%m-%d %H:%M:%S'),
+        'Vlo-O': flight_numbers,
+        'Ori-O': 'SCEL',
+        'Des-O': 'KMIA',
+        'Emp-O': 'AAL',
+        'DIA': scheduled.day,
+        'MES': scheduled.month,
+        'AÑO': scheduled.year,
+        'DIANOM': [_DAY_NAMES[day] for day in scheduled.dayofweek],
+        'TIPOVUELO': rng.choice(['I', 'N'], n_rows),
+        'OPERA': rng.choice(OPERATORS, n_rows),
+        'SIGLAORI': 'Santiago',
+        'SIGLADES': 'Miami'
+    }, columns=COLUMNS)
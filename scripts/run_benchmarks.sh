@@ -0,0 +1,5 @@
+#!/bin/bash
+
+cd "$(dirname "$0")/.." || exit
+
+python -W ignore -m benchmarks.suite "$@"
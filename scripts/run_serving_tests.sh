@@ -0,0 +1,5 @@
+#!/bin/bash
+
+cd "$(dirname "$0")/.." || exit
+
+python -W ignore -m unittest discover -s "$(pwd)/tests/serving" -p 'test*'
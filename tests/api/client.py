@@ -0,0 +1,14 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def start_client(test_case: type[unittest.TestCase]) -> TestClient:
+    # Entering the client runs the lifespan of the app, which loads the default model and starts the training
+    # executor. The client is closed once every test in the class has run.
+    client = TestClient(app)
+    client.__enter__()  # pylint: disable=unnecessary-dunder-call
+    test_case.addClassCleanup(client.__exit__, None, None, None)
+    return client
@@ -1,21 +1,21 @@
 import os
 import random
 import string
+import time
 import unittest
 import uuid
 
-from fastapi.testclient import TestClient
 from sklearn.linear_model import LogisticRegression
 
 from app.api.errors import ModelNotFoundError
 from app.api.resources import Model
 from app.api.schemas import Status
-from app.main import app
 from app.model import DelayModel
+from tests.api.client import start_client
+from tests.flights import flights_csv
 
 
 class TestE2EWorkflow(unittest.TestCase):
-    _TRAIN_DATA = './data/data.csv'
     _PREDICT_DATA = {
         'flights': [
             {
@@ -30,9 +30,19 @@ class TestE2EWorkflow(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
+        cls._TRAIN_DATA = flights_csv()
         random.seed(15)
 
+    def _wait_for_model(self, model_id: str, timeout: float = 30) -> str:
+        # Poll the model until training has either completed or failed
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.client.get(f'/v1/models/{model_id}').json()['status']
+            if status in (Status.COMPLETED.value, Status.FAILED.value) or time.monotonic() > deadline:
+                return status
+            time.sleep(0.05)
+
     def test_e2e_model_success(self) -> None:
         # First check that a model has been loaded and is running
         self.assertIsNotNone(self.client.app.state.model)
@@ -40,7 +50,7 @@ class TestE2EWorkflow(unittest.TestCase):
         self.assertIsInstance(self.client.app.state.model.model, DelayModel)
         # Now let's create a new model
         create_model_resp = self.client.post('/v1/models', json={'data_source': self._TRAIN_DATA})
-        self.assertEqual(create_model_resp.status_code, 201)
+        self.assertEqual(create_model_resp.status_code, 202)
         create_model_resp_json = create_model_resp.json()
         model_id = create_model_resp_json['id']
         self.assertCountEqual(['id', 'status', 'deployed'], create_model_resp_json)
@@ -49,8 +59,10 @@ class TestE2EWorkflow(unittest.TestCase):
             _ = uuid.UUID(model_id)
         except ValueError:
             self.fail('The model ID must be a valid UUID')
-        # The status should be `completed`
-        self.assertEqual(create_model_resp_json['status'], Status.COMPLETED.value)
+        # The status should be `pending` as training runs in the background
+        self.assertEqual(create_model_resp_json['status'], Status.PENDING.value)
+        # Wait for training to finish
+        self.assertEqual(self._wait_for_model(model_id), Status.COMPLETED.value)
         # The model should not be deployed
         self.assertFalse(create_model_resp_json['deployed'])
         # A location header should be present
@@ -129,7 +141,7 @@ class TestE2EWorkflow(unittest.TestCase):
 
     def test_e2e_workflow_with_model_upload(self) -> None:
         create_model_resp = self.client.post('/v1/models', json={'data_source': self._TRAIN_DATA})
-        self.assertEqual(create_model_resp.status_code, 201)
+        self.assertEqual(create_model_resp.status_code, 202)
         create_model_resp_json = create_model_resp.json()
         model_id = create_model_resp_json['id']
         self.assertCountEqual(['id', 'status', 'deployed'], create_model_resp_json.keys())
@@ -138,7 +150,8 @@ class TestE2EWorkflow(unittest.TestCase):
             _ = uuid.UUID(model_id)
         except ValueError:
             self.fail('The model ID must be a valid UUID')
-        self.assertEqual(create_model_resp_json['status'], Status.COMPLETED.value)
+        self.assertEqual(create_model_resp_json['status'], Status.PENDING.value)
+        self.assertEqual(self._wait_for_model(model_id), Status.COMPLETED.value)
         # A location header should be present
         self.assertIn('location', create_model_resp.headers)
         self.assertEqual(f'{self.client.base_url}/v1/models/{model_id}', create_model_resp.headers['location'])
@@ -169,8 +182,8 @@ class TestE2EWorkflow(unittest.TestCase):
         self.assertEqual(len(self.client.app.state.model_store), 2)
         self.assertIn(model_id, self.client.app.state.model_store)
         # Neither model should be deployed yet
-        self.assertNotEqual(model_id, self.client.app.state.model)
-        self.assertNotEqual(uploaded_model_id, self.client.app.state.model)
+        self.assertNotEqual(model_id, str(self.client.app.state.model.id))
+        self.assertNotEqual(uploaded_model_id, str(self.client.app.state.model.id))
         # The status of the model should be `completed`
         self.assertEqual(resp_json['status'], Status.COMPLETED.value)
         # the model is stored as a `Model` resource
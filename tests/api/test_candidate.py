@@ -0,0 +1,125 @@
+import os
+import time
+import unittest
+import uuid
+
+from app.api.errors import ModelNotFoundError, ModelNotReadyError, UnauthorizedError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from tests.api.client import start_client
+
+
+class TestCandidate(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+    data = {
+        'flights': [
+            {
+                'opera': 'Grupo LATAM',
+                'tipovuelo': 'I',
+                'mes': 7,
+                'Fecha-O': '2017-07-01 23:30:00',
+                'Fecha-I': '2017-07-01 23:32:00'
+            }
+        ]
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+        os.environ['API_KEY'] = 'admin=secret'
+        cls.headers = {'X-api-key': 'admin=secret'}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        del os.environ['API_KEY']
+
+    def setUp(self) -> None:
+        state = self.client.app.state
+        # Other tests may have replaced the deployed model
+        state.model = state.model_store.default_model
+        model = Model.new_model()
+        model.model = DelayModel.load(self._MODEL_PATH)
+        state.model_store.add_model(model)
+        state.model_store.update_status(str(model.id), Status.COMPLETED)
+        self.model_id = str(model.id)
+        self.addCleanup(setattr, state, 'candidate', None)
+        self.addCleanup(state.model_store.pop, self.model_id, None)
+
+    def _start(self, mode: str, percentage: float = 100) -> None:
+        resp = self.client.put(f'/v1/models/candidate?model-id={self.model_id}',
+                               json={'mode': mode, 'percentage': percentage}, headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['model'], self.model_id)
+        self.assertEqual(resp.json()['mode'], mode)
+
+    def _candidate(self) -> dict[str, object]:
+        resp = self.client.get('/v1/models/candidate', headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_shadow_scores_requests(self) -> None:
+        self._start('shadow')
+        expected = self.client.post('/v1/predictions', json=self.data).json()
+        resp = self.client.post('/v1/predictions/columns', json={'OPERA': ['Avianca'], 'TIPOVUELO': ['N'], 'MES': [3]})
+        self.assertEqual(resp.status_code, 200)
+        # Requests are still answered by the deployed model
+        self.assertEqual(self.client.post('/v1/predictions', json=self.data).json(), expected)
+
+        # The candidate scores each request in the background, after the response has been sent
+        deadline = time.monotonic() + 5
+        while (candidate := self._candidate())['rows'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(candidate['requests'], 3)
+        self.assertEqual(candidate['rows'], 3)
+        self.assertEqual(candidate['agreement'], 1.0)
+
+    def test_canary_serves_requests(self) -> None:
+        self._start('canary')
+        resp = self.client.post('/v1/predictions', json=self.data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self._candidate()['requests'], 1)
+        stats = self.client.get('/v1/stats').json()
+        self.assertEqual(stats['candidate']['candidate_latency']['count'], 1)
+        self.assertEqual(stats['candidate']['deployed_latency']['count'], 0)
+        metrics = self.client.get('/v1/metrics').text
+        self.assertIn(f'depart_candidate_requests_total{{model="{self.model_id}",mode="canary"}} 1', metrics)
+
+    def test_stop_candidate(self) -> None:
+        self._start('canary', percentage=0)
+        resp = self.client.delete('/v1/models/candidate', headers=self.headers)
+        self.assertEqual(resp.status_code, 204)
+        self.assertIsNone(self._candidate()['mode'])
+        self.assertNotIn('candidate', self.client.get('/v1/stats').json())
+
+    def test_deploying_the_candidate_promotes_it(self) -> None:
+        self._start('shadow')
+        self.addCleanup(setattr, self.client.app.state, 'model', self.client.app.state.model)
+        resp = self.client.put(f'/v1/models/deploy?model-id={self.model_id}', headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNone(self.client.app.state.candidate)
+
+    def test_candidate_must_be_completed(self) -> None:
+        resp = self.client.put(f'/v1/models/candidate?model-id={uuid.uuid4()}', json={'mode': 'shadow'},
+                               headers=self.headers)
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(resp.json()['errors'][0], ModelNotFoundError().json())
+
+        model = Model.new_model()
+        self.client.app.state.model_store.add_model(model)
+        self.addCleanup(self.client.app.state.model_store.pop, str(model.id), None)
+        resp = self.client.put(f'/v1/models/candidate?model-id={model.id}', json={'mode': 'shadow'},
+                               headers=self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()['errors'][0], ModelNotReadyError().json())
+
+    def test_candidate_requires_api_key(self) -> None:
+        resp = self.client.put(f'/v1/models/candidate?model-id={self.model_id}', json={'mode': 'shadow'},
+                               headers={'X-api-key': 'user=secret'})
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json()['errors'][0], UnauthorizedError().json())
+        self.assertIsNone(self.client.app.state.candidate)
+
+
+if __name__ == '__main__':
+    unittest.main()
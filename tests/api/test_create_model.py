@@ -1,26 +1,26 @@
 import unittest
 import uuid
 
-from fastapi.testclient import TestClient
 from sklearn.linear_model import LogisticRegression
 
 from app.api.errors import DataFormatError
 from app.api.resources import Model
-from app.main import app
+from app.api.schemas import Status
 from app.model import DelayModel
+from tests.api.client import start_client
+from tests.flights import flights_csv
 
 
 class TestCreateModel(unittest.TestCase):
-    _DATA_PATH = './data/data.csv'
-
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
+        cls._DATA_PATH = flights_csv()
 
     def test_create_model_success(self) -> None:
         # Create a model with a valid data path
         resp = self.client.post('/v1/models', json={'data_source': self._DATA_PATH})
-        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.status_code, 202)
         resp_json = resp.json()
         # The response should have 2 keys - the model ID and the status
         self.assertCountEqual(['id', 'status', 'deployed'], resp_json.keys())
@@ -29,8 +29,8 @@ class TestCreateModel(unittest.TestCase):
             _ = uuid.UUID(resp_json['id'])
         except ValueError:
             self.fail('The model ID is not a valid UUID')
-        # The status should be completed as we do not support asynchronous training
-        self.assertEqual(resp_json['status'], 'completed')
+        # The status should be pending as training runs in the background
+        self.assertEqual(resp_json['status'], 'pending')
         # The response should contain a location header
         self.assertIn('location', resp.headers)
         expected_location = f'{self.client.base_url}/v1/models/{resp_json["id"]}'
@@ -41,7 +41,7 @@ class TestCreateModel(unittest.TestCase):
     def test_create_model_saves_to_model_store(self) -> None:
         # Create a model with a valid data path
         resp = self.client.post('/v1/models', json={'data_source': self._DATA_PATH})
-        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.status_code, 202)
         resp_json = resp.json()
         # Check the ID is a valid UUID
         try:
@@ -50,7 +50,10 @@ class TestCreateModel(unittest.TestCase):
             self.fail('The model ID is not a valid UUID')
         # Check the model has been added to the model store
         self.assertIn(resp_json['id'], self.client.app.state.model_store)
+        # Once training has finished the model should have been updated
+        self.client.app.state.training_executor.wait(resp_json['id'])
         model = self.client.app.state.model_store[resp_json['id']]
+        self.assertEqual(model.status, Status.COMPLETED)
         # The model should be a Model resource
         self.assertIsInstance(model, Model)
         # The model resource should contain a DelayModel
@@ -70,17 +73,21 @@ class TestCreateModel(unittest.TestCase):
         self.assertEqual(resp.status_code, 422)
 
     def test_create_model_with_missing_columns(self) -> None:
-        # Attempting to train a model without the required columns should succeed but the model status should be `failed`
+        # Attempting to train a model without the required columns should be accepted but the model status should
+        # become `failed`
         resp = self.client.post('/v1/models', json={'data_source': './data/bad_data.csv'})
-        self.assertEqual(resp.status_code, 201)
-        resp_json = resp.json()
-        # There should be 3 keys in the response
-        self.assertCountEqual(['id', 'status', 'errors', 'deployed'], resp_json.keys())
+        self.assertEqual(resp.status_code, 202)
+        model_id = resp.json()['id']
         # Check the model ID is valid
         try:
-            _ = uuid.UUID(resp_json['id'])
+            _ = uuid.UUID(model_id)
         except ValueError:
             self.fail('The model ID is not a valid UUID')
+        self.client.app.state.training_executor.wait(model_id)
+        resp = self.client.get(f'/v1/models/{model_id}')
+        resp_json = resp.json()
+        # There should be 4 keys in the response
+        self.assertCountEqual(['id', 'status', 'errors', 'deployed'], resp_json.keys())
         # Errors should be a list with 1 error
         self.assertIsInstance(resp_json['errors'], list)
         self.assertEqual(len(resp_json['errors']), 1)
@@ -91,6 +98,18 @@ class TestCreateModel(unittest.TestCase):
         # The model should not be deployed
         self.assertFalse(resp_json['deployed'])
 
+    def test_create_model_applies_threshold(self) -> None:
+        resp = self.client.post('/v1/models', json={'data_source': self._DATA_PATH, 'threshold': 0.3})
+        self.assertEqual(resp.status_code, 202)
+        model_id = resp.json()['id']
+        self.client.app.state.training_executor.wait(model_id)
+        model = self.client.app.state.model_store[model_id]
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertEqual(model.model.threshold, 0.3)
+
+    def test_create_model_with_invalid_threshold(self) -> None:
+        resp = self.client.post('/v1/models', json={'data_source': self._DATA_PATH, 'threshold': 2})
+        self.assertEqual(resp.status_code, 422)
 
 if __name__ == '__main__':
     unittest.main()
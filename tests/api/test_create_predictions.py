@@ -1,8 +1,9 @@
 import unittest
 
-from fastapi.testclient import TestClient
-
-from app.main import app
+from app.api.errors import ModelUnavailableError
+from app.api.resources import Model
+from app.store import DeployedModel
+from tests.api.client import start_client
 
 
 class TestCreatePredictions(unittest.TestCase):
@@ -20,7 +21,17 @@ class TestCreatePredictions(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
+
+    @staticmethod
+    def _flight(opera: str, tipovuelo: str, mes: int) -> dict[str, str | int]:
+        return {
+            'opera': opera,
+            'tipovuelo': tipovuelo,
+            'mes': mes,
+            'Fecha-O': '2017-01-01 23:30:00',
+            'Fecha-I': '2017-01-01 23:32:00'
+        }
 
     def test_can_get_prediction(self) -> None:
         resp = self.client.post('/v1/predictions', json=self.data)
@@ -94,6 +105,43 @@ class TestCreatePredictions(unittest.TestCase):
         # There should be the same number of predictions as rows
         self.assertEqual(1, len(resp_json['predictions']))
 
+    def test_can_get_probabilities(self) -> None:
+        data = {'flights': [self._flight('Grupo LATAM', 'I', 7), self._flight('Copa Air', 'N', 3)]}
+        resp = self.client.post('/v1/predictions?probabilities=true', json=data)
+        self.assertEqual(resp.status_code, 200)
+        resp_json = resp.json()
+        # Both the labels and the probabilities should be returned
+        self.assertCountEqual(['predictions', 'probabilities'], resp_json.keys())
+        self.assertEqual(len(data['flights']), len(resp_json['predictions']))
+        self.assertEqual(len(data['flights']), len(resp_json['probabilities']))
+        # Probabilities must be valid and consistent with the default labels
+        for label, probability in zip(resp_json['predictions'], resp_json['probabilities']):
+            self.assertGreaterEqual(probability, 0)
+            self.assertLessEqual(probability, 1)
+            self.assertEqual(label, int(probability > 0.5))
+
+    def test_can_get_predictions_with_threshold(self) -> None:
+        data = {'flights': [self._flight('Grupo LATAM', 'I', 7), self._flight('Copa Air', 'N', 3)]}
+        # Every flight is delayed with a threshold of 0
+        resp = self.client.post('/v1/predictions?threshold=0', json=data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['predictions'], [1, 1])
+        # And no flight is delayed with a threshold of 1
+        resp = self.client.post('/v1/predictions?threshold=1', json=data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['predictions'], [0, 0])
+        # The threshold also applies when probabilities are returned
+        resp = self.client.post('/v1/predictions?threshold=0&probabilities=true', json=data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['predictions'], [1, 1])
+
+    def test_predict_fails_with_invalid_threshold(self) -> None:
+        data = {'flights': [self._flight('Grupo LATAM', 'I', 7)]}
+        resp = self.client.post('/v1/predictions?threshold=1.5', json=data)
+        self.assertEqual(resp.status_code, 422)
+        resp = self.client.post('/v1/predictions?threshold=-0.1', json=data)
+        self.assertEqual(resp.status_code, 422)
+
     def test_predict_fails_with_missing_required_column(self) -> None:
         # Predict should fail with missing required column `opera`
         data = self.data.copy()
@@ -137,6 +185,45 @@ class TestCreatePredictions(unittest.TestCase):
         resp = self.client.post('/v1/predictions', json=data)
         self.assertEqual(resp.status_code, 422)
 
+    def test_predict_fails_without_deployed_model(self) -> None:
+        state = self.client.app.state
+        self.addCleanup(setattr, state, 'model', state.model)
+        # Neither a missing model nor a model that has not been trained should fail with an unexpected error
+        for model in (None, DeployedModel.from_model(Model.new_model())):
+            state.model = model
+            rows = {'flights': [self._flight('Avianca', 'I', 1)]}
+            columns = {'OPERA': ['Avianca'], 'TIPOVUELO': ['I'], 'MES': [1]}
+            for url, body in (('/v1/predictions', rows), ('/v1/predictions/columns', columns)):
+                resp = self.client.post(url, json=body)
+                self.assertEqual(resp.status_code, 503)
+                self.assertEqual(resp.json()['errors'][0], ModelUnavailableError().json())
+            resp = self.client.post('/v1/predictions/stream', content=b'{}\n',
+                                    headers={'content-type': 'application/x-ndjson'})
+            self.assertEqual(resp.status_code, 503)
+
+    def test_can_get_predictions_from_columns(self) -> None:
+        flights = [self._flight('Grupo LATAM', 'I', 7), self._flight('Copa Air', 'N', 3), self._flight('Avianca', 'I', 12)]
+        columns = {
+            'OPERA': [flight['opera'] for flight in flights],
+            'TIPOVUELO': [flight['tipovuelo'] for flight in flights],
+            'MES': [flight['mes'] for flight in flights],
+            'DIA': [1, 2, 3]
+        }
+        resp = self.client.post('/v1/predictions/columns?probabilities=true', json=columns)
+        self.assertEqual(resp.status_code, 200)
+        # The predictions should match the same flights sent as rows
+        expected = self.client.post('/v1/predictions?probabilities=true', json={'flights': flights})
+        self.assertEqual(resp.json(), expected.json())
+        resp = self.client.post('/v1/predictions/columns?threshold=0', json=columns)
+        self.assertEqual(resp.json(), {'predictions': [1, 1, 1]})
+
+    def test_predict_from_columns_fails_with_invalid_columns(self) -> None:
+        columns = {'OPERA': ['Grupo LATAM', 'Copa Air'], 'TIPOVUELO': ['I', 'N'], 'MES': [7, 3]}
+        for invalid_columns in ({**columns, 'MES': [7]}, {'OPERA': [], 'TIPOVUELO': [], 'MES': []},
+                                {'OPERA': columns['OPERA'], 'MES': columns['MES']}, {**columns, 'MES': ['July', 3]}):
+            resp = self.client.post('/v1/predictions/columns', json=invalid_columns)
+            self.assertEqual(resp.status_code, 422)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+import dataclasses
+import json
+import unittest
+
+from app.api.errors import DataFormatError, UnsupportedMediaTypeError
+from tests.api.client import start_client
+
+
+class TestCreatePredictionsStream(unittest.TestCase):
+    flights = [
+        {'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'I', 'MES': 7, 'Fecha-O': '2017-07-01 23:30:00',
+         'Fecha-I': '2017-07-01 23:32:00'},
+        {'OPERA': 'Copa Air', 'TIPOVUELO': 'N', 'MES': 3, 'Fecha-O': '2017-03-05 18:30:00',
+         'Fecha-I': '2017-03-05 23:36:00'},
+        {'opera': 'Latin American Wings', 'tipovuelo': 'I', 'mes': 12, 'Fecha-O': '2017-12-01 10:00:00',
+         'Fecha-I': '2017-12-01 10:30:00'},
+        {'OPERA': 'Sky Airline', 'TIPOVUELO': 'N', 'MES': 10, 'Fecha-O': '2017-10-01 10:00:00',
+         'Fecha-I': '2017-10-01 10:30:00'},
+        {'OPERA': 'Avianca', 'TIPOVUELO': 'I', 'MES': 1, 'Fecha-O': '2017-01-01 10:00:00',
+         'Fecha-I': '2017-01-01 10:30:00'}
+    ]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+
+    def setUp(self) -> None:
+        # Other tests may have replaced the deployed model
+        self.client.app.state.model = self.client.app.state.model_store.default_model
+        self.settings = self.client.app.state.settings
+        # Use a small chunk size so that the predictions are produced across several chunks
+        self.client.app.state.settings = dataclasses.replace(self.settings, stream_chunk_size=2)
+
+    def tearDown(self) -> None:
+        self.client.app.state.settings = self.settings
+
+    def _expected(self, probabilities: bool = False) -> dict[str, list[int] | list[float]]:
+        url = '/v1/predictions?probabilities=true' if probabilities else '/v1/predictions'
+        resp = self.client.post(url, json={'flights': self.flights})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    @staticmethod
+    def _ndjson(records: list[dict[str, str | int]]) -> str:
+        return ''.join(json.dumps(record) + '\n' for record in records)
+
+    def test_can_stream_ndjson_predictions(self) -> None:
+        resp = self.client.post('/v1/predictions/stream', content=self._ndjson(self.flights),
+                                headers={'Content-Type': 'application/x-ndjson'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers['content-type'].startswith('application/x-ndjson'))
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        # There should be one prediction per flight, matching the predictions endpoint
+        self.assertEqual([line['prediction'] for line in lines], self._expected()['predictions'])
+
+    def test_can_stream_csv_predictions(self) -> None:
+        rows = ['Fecha-I,Fecha-O,MES,TIPOVUELO,OPERA']
+        rows += [f'{flight["Fecha-I"]},{flight["Fecha-O"]},{flight.get("MES", flight.get("mes"))},'
+                 f'{flight.get("TIPOVUELO", flight.get("tipovuelo"))},{flight.get("OPERA", flight.get("opera"))}'
+                 for flight in self.flights]
+        resp = self.client.post('/v1/predictions/stream', content='\n'.join(rows) + '\n',
+                                headers={'Content-Type': 'text/csv'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers['content-type'].startswith('text/csv'))
+        lines = resp.text.splitlines()
+        # The response should have a header and one prediction per flight
+        self.assertEqual(lines[0], 'prediction')
+        self.assertEqual([int(line) for line in lines[1:]], self._expected()['predictions'])
+
+    def test_can_stream_probabilities(self) -> None:
+        resp = self.client.post('/v1/predictions/stream?probabilities=true', content=self._ndjson(self.flights),
+                                headers={'Content-Type': 'application/x-ndjson'})
+        self.assertEqual(resp.status_code, 200)
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        expected = self._expected(probabilities=True)
+        self.assertEqual([line['prediction'] for line in lines], expected['predictions'])
+        for line, probability in zip(lines, expected['probabilities']):
+            self.assertAlmostEqual(line['probability'], probability)
+
+    def test_stream_with_no_records(self) -> None:
+        resp = self.client.post('/v1/predictions/stream', content='', headers={'Content-Type': 'text/csv'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.text, 'prediction\n')
+
+    def test_stream_fails_with_unsupported_media_type(self) -> None:
+        resp = self.client.post('/v1/predictions/stream', json={'flights': self.flights})
+        self.assertEqual(resp.status_code, 415)
+        self.assertEqual(resp.json()['errors'][0], UnsupportedMediaTypeError().json())
+
+    def test_stream_fails_with_missing_columns(self) -> None:
+        records = [{'OPERA': 'Grupo LATAM', 'MES': 7}]
+        resp = self.client.post('/v1/predictions/stream', content=self._ndjson(records),
+                                headers={'Content-Type': 'application/x-ndjson'})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()['errors'][0], DataFormatError().json())
+
+    def test_stream_ends_with_error_for_malformed_record(self) -> None:
+        body = self._ndjson(self.flights[:3]) + 'not json\n' + self._ndjson(self.flights[3:])
+        resp = self.client.post('/v1/predictions/stream', content=body,
+                                headers={'Content-Type': 'application/x-ndjson'})
+        self.assertEqual(resp.status_code, 200)
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        # The first full chunk should have been predicted before the stream was ended by an error
+        self.assertEqual(len(lines), 3)
+        self.assertIn('prediction', lines[0])
+        self.assertEqual(lines[-1], {'errors': [DataFormatError().json()]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,22 +2,21 @@ import random
 import unittest
 import uuid
 
-from fastapi.testclient import TestClient
-
 from app.api.errors import ModelNotFoundError, RemoveModelForbiddenError
 from app.api.resources import Model
-from app.main import app
+from tests.api.client import start_client
+from tests.flights import flights_csv
 
 
 class TestDeleteModel(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
         random.seed(15)
 
     def setUp(self) -> None:
-        resp = self.client.post('/v1/models', json={'data_source': './data/data.csv'})
-        assert resp.status_code == 201
+        resp = self.client.post('/v1/models', json={'data_source': flights_csv()})
+        assert resp.status_code == 202
         self.model_id = resp.json()['id']
 
     def tearDown(self) -> None:
@@ -52,8 +51,8 @@ class TestDeleteModel(unittest.TestCase):
 
     def test_delete_single_model(self) -> None:
         # Add multiple models to the model store
-        create_model_resp = self.client.post('/v1/models', json={'data_source': './data/data.csv'})
-        self.assertEqual(create_model_resp.status_code, 201)
+        create_model_resp = self.client.post('/v1/models', json={'data_source': flights_csv()})
+        self.assertEqual(create_model_resp.status_code, 202)
         # Check there are two models in the model store
         self.assertEqual(len(self.client.app.state.model_store), 2)
         # And that one of the models is the one we created earlier
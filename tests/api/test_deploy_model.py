@@ -4,18 +4,16 @@ import string
 import unittest
 import uuid
 
-from fastapi.testclient import TestClient
-
 from app.api.errors import UnauthorizedError, ForbiddenError, ModelNotFoundError, ModelNotReadyError
 from app.api.resources import Model
 from app.api.schemas import Status
-from app.main import app
+from tests.api.client import start_client
 
 
 class TestDeployModel(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
         api_key = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
         os.environ['API_KEY'] = f'admin={api_key}'
         cls.api_key = api_key
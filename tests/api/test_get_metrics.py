@@ -0,0 +1,69 @@
+import unittest
+
+from app.metrics import PROMETHEUS_MEDIA_TYPE
+from app.serving import PredictionBatcher
+from tests.api.client import start_client
+
+
+class TestGetMetrics(unittest.TestCase):
+    data = {
+        'flights': [
+            {
+                'opera': 'Grupo LATAM',
+                'tipovuelo': 'I',
+                'mes': 7,
+                'Fecha-O': '2017-07-01 23:30:00',
+                'Fecha-I': '2017-07-01 23:32:00'
+            }
+        ]
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+
+    def setUp(self) -> None:
+        # Other tests may have replaced the deployed model
+        self.client.app.state.model = self.client.app.state.model_store.default_model
+
+    def tearDown(self) -> None:
+        self.client.app.state.batcher = None
+
+    def _samples(self) -> dict[str, float]:
+        resp = self.client.get('/v1/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers['content-type'], PROMETHEUS_MEDIA_TYPE)
+        samples = {}
+        for line in resp.text.splitlines():
+            if not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_get_metrics_counts_prediction_stages(self) -> None:
+        before = self._samples()
+        self.client.post('/v1/predictions', json=self.data)
+        after = self._samples()
+        for stage in ('encode_features', 'predict', 'encode_response'):
+            name = f'depart_prediction_stage_duration_seconds_count{{stage="{stage}"}}'
+            self.assertEqual(after[name], before[name] + 1)
+        self.assertEqual(after['depart_prediction_request_rows_sum'], before['depart_prediction_request_rows_sum'] + 1)
+        requests = 'depart_http_request_duration_seconds_count{method="POST",handler="post_predictions",status="200"}'
+        self.assertEqual(after[requests], before.get(requests, 0) + 1)
+
+    def test_get_metrics_reports_model_store(self) -> None:
+        samples = self._samples()
+        self.assertEqual(samples['depart_model_store_models'], len(self.client.app.state.model_store))
+        self.assertIn('depart_model_store_loaded_bytes', samples)
+        self.assertIn('depart_event_loop_lag_seconds_count', samples)
+
+    def test_get_metrics_with_batching(self) -> None:
+        self.client.app.state.batcher = PredictionBatcher(window=0.001, max_batch_size=64)
+        self.client.post('/v1/predictions', json=self.data)
+        samples = self._samples()
+        self.assertEqual(samples['depart_batch_rows_count'], 1)
+        self.assertEqual(samples['depart_batch_requests_sum'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,23 @@
+import os
+import tempfile
 import unittest
 
-from fastapi.testclient import TestClient
+import numpy as np
 
-from app.api.errors import DataFormatError
+from app.api.errors import DataFormatError, ModelNotReadyError
 from app.api.resources import Model
 from app.api.schemas import Status
-from app.main import app
+from app.model import DelayModel
+from app.model.serialization import artifact_from_buffer
+from tests.api.client import start_client
 
 
 class TestGetModel(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
 
     def setUp(self) -> None:
         model = Model.new_model()
@@ -52,10 +58,11 @@ class TestGetModel(unittest.TestCase):
     def test_can_retrieve_failed_model(self) -> None:
         # Create a new model that failed
         create_resp = self.client.post('/v1/models', json={'data_source': './data/bad_data.csv'})
-        self.assertEqual(create_resp.status_code, 201)
-        self.assertEqual(create_resp.json()['status'], Status.FAILED.value)
+        self.assertEqual(create_resp.status_code, 202)
+        self.assertEqual(create_resp.json()['status'], Status.PENDING.value)
 
         model_id = create_resp.json()['id']
+        self.client.app.state.training_executor.wait(model_id)
         resp = self.client.get(f'/v1/models/{model_id}')
         self.assertEqual(resp.status_code, 200)
         resp_json = resp.json()
@@ -87,8 +94,43 @@ class TestGetModel(unittest.TestCase):
         # The `deployed` flag should be false
         self.assertFalse(resp_json['deployed'])
 
+    def _trained_model(self) -> str:
+        model = Model.new_model()
+        self.client.app.state.model_store.add_model(model)
+        self.client.app.state.model_store.update_model(str(model.id), DelayModel.load(self._MODEL_PATH))
+        self.client.app.state.model_store.update_status(str(model.id), Status.COMPLETED)
+        return str(model.id)
+
     def test_can_export_completed_model(self) -> None:
-        ...
+        model_id = self._trained_model()
+        with tempfile.TemporaryDirectory() as directory:
+            for compress in (False, True):
+                file_name = os.path.join(directory, f'model-{compress}.depart')
+                resp = self.client.get(f'/v1/models/{model_id}',
+                                       params={'export': True, 'file_name': file_name, 'compress': compress})
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp.json()['download'], 'OK')
+                # The exported model should make the same predictions and no temporary file should be left behind
+                exported = DelayModel.load(file_name, allow_pickle=False)
+                self.assertEqual(exported.predict_proba(np.eye(10)),
+                                 self.client.app.state.model_store[model_id].model.predict_proba(np.eye(10)))
+            self.assertCountEqual(os.listdir(directory), ['model-False.depart', 'model-True.depart'])
+            self.assertLess(os.path.getsize(os.path.join(directory, 'model-True.depart')),
+                            os.path.getsize(os.path.join(directory, 'model-False.depart')))
+
+    def test_can_download_completed_model(self) -> None:
+        model_id = self._trained_model()
+        resp = self.client.get(f'/v1/models/{model_id}', params={'export': True, 'download': True, 'compress': True})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers['content-type'], 'application/octet-stream')
+        self.assertEqual(resp.headers['content-disposition'], f'attachment; filename="{model_id}.depart.gz"')
+        artifact = artifact_from_buffer(resp.content)
+        np.testing.assert_array_equal(artifact.coef, DelayModel.load(self._MODEL_PATH).to_artifact().coef)
+
+    def test_can_not_export_model_without_delay_model(self) -> None:
+        resp = self.client.get(f'/v1/models/{self.model_id}', params={'export': True, 'download': True})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()['errors'][0]['code'], ModelNotReadyError.code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,74 @@
+import unittest
+
+from app.serving import PredictionBatcher
+from tests.api.client import start_client
+
+
+class TestGetStats(unittest.TestCase):
+    data = {
+        'flights': [
+            {
+                'opera': 'Grupo LATAM',
+                'tipovuelo': 'I',
+                'mes': 7,
+                'Fecha-O': '2017-07-01 23:30:00',
+                'Fecha-I': '2017-07-01 23:32:00'
+            }
+        ]
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+
+    def setUp(self) -> None:
+        # Other tests may have replaced the deployed model
+        self.client.app.state.model = self.client.app.state.model_store.default_model
+
+    def tearDown(self) -> None:
+        self.client.app.state.batcher = None
+
+    def test_get_stats_without_batching(self) -> None:
+        resp = self.client.get('/v1/stats')
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn('batching', resp.json())
+
+    def test_get_stats_reports_lookups(self) -> None:
+        model = self.client.app.state.model
+        lookup_rows = model.model.lookup_rows
+        for _ in range(2):
+            self.client.post('/v1/predictions', json=self.data)
+
+        resp = self.client.get('/v1/stats')
+        predictions = resp.json()['predictions']
+        self.assertEqual(predictions['model'], str(model.id))
+        self.assertEqual(predictions['lookup_rows'], lookup_rows + 2)
+        self.assertEqual(predictions['computed_rows'], 0)
+        self.assertEqual(predictions['lookup_rate'], 1.0)
+
+    def test_get_stats_reports_model_store(self) -> None:
+        resp = self.client.get('/v1/stats')
+        self.assertEqual(resp.status_code, 200)
+        self.assertCountEqual(['memory_budget', 'loaded_models', 'loaded_bytes', 'hits', 'misses', 'evictions'],
+                              resp.json()['model_store'])
+
+    def test_get_stats_with_batching(self) -> None:
+        self.client.app.state.batcher = PredictionBatcher(window=0.001, max_batch_size=64)
+        # Predictions should be served through the batcher
+        for _ in range(3):
+            resp = self.client.post('/v1/predictions', json=self.data)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(len(resp.json()['predictions']), 1)
+        resp = self.client.post('/v1/predictions?probabilities=true', json=self.data)
+        self.assertCountEqual(['predictions', 'probabilities'], resp.json())
+
+        resp = self.client.get('/v1/stats')
+        self.assertEqual(resp.status_code, 200)
+        batching = resp.json()['batching']
+        self.assertEqual(batching['max_batch_size'], 64)
+        self.assertEqual(batching['batch_sizes']['count'], 4)
+        self.assertEqual(batching['batch_sizes']['sum'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import dataclasses
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+class TestPersistentRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.settings = app.state.settings
+        app.state.settings = dataclasses.replace(self.settings, registry='journal', registry_path=self.directory.name)
+
+    def tearDown(self) -> None:
+        app.state.settings = self.settings
+        self.directory.cleanup()
+
+    @mock.patch.dict(os.environ, {'API_KEY': 'admin=secret'})
+    def test_models_survive_a_restart(self) -> None:
+        with TestClient(app) as client:
+            resp = client.post('/v1/models/upload', json={'model_location': './models/modelv1.0.depart',
+                                                          'threshold': 0.3})
+            model_id = resp.json()['id']
+            resp = client.put(f'/v1/models/deploy?model-id={model_id}', headers={'X-api-key': 'admin=secret'})
+            self.assertEqual(resp.status_code, 200)
+
+        with TestClient(app) as client:
+            resp = client.get(f'/v1/models/{model_id}')
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json(), {'id': model_id, 'status': 'completed', 'deployed': True})
+            self.assertEqual(client.app.state.model.model.threshold, 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
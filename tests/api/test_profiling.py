@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from app.api.errors import UnauthorizedError
+from tests.api.client import start_client
+
+
+class TestProfiling(unittest.TestCase):
+    data = {
+        'flights': [
+            {
+                'opera': 'Grupo LATAM',
+                'tipovuelo': 'I',
+                'mes': 7,
+                'Fecha-O': '2017-07-01 23:30:00',
+                'Fecha-I': '2017-07-01 23:32:00'
+            }
+        ]
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+        os.environ['API_KEY'] = 'admin=secret'
+        cls.headers = {'X-api-key': 'admin=secret'}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        del os.environ['API_KEY']
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        profiler = self.client.app.state.profiler
+        self.addCleanup(setattr, profiler, 'path', profiler.path)
+        self.addCleanup(profiler.stop)
+        profiler.path = directory.name
+        # Other tests may have replaced the deployed model
+        self.client.app.state.model = self.client.app.state.model_store.default_model
+
+    def test_profile_requests(self) -> None:
+        resp = self.client.put('/v1/profiling', json={'mode': 'cprofile'}, headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['mode'], 'cprofile')
+        self.client.post('/v1/predictions', json=self.data)
+
+        resp = self.client.put('/v1/profiling', json={'mode': None}, headers=self.headers)
+        self.assertIsNone(resp.json()['mode'])
+        files = [name for name in resp.json()['files'] if name.endswith('POST-v1-predictions.prof')]
+        self.assertEqual(len(files), 1)
+        # Once profiling stops no more profiles are written
+        self.client.post('/v1/predictions', json=self.data)
+        resp = self.client.get('/v1/profiling', headers=self.headers)
+        self.assertEqual([name for name in resp.json()['files'] if name.endswith('POST-v1-predictions.prof')], files)
+
+    def test_sample_requests(self) -> None:
+        self.client.put('/v1/profiling', json={'mode': 'sampling'}, headers=self.headers)
+        self.client.post('/v1/predictions', json=self.data)
+        resp = self.client.put('/v1/profiling', json={'mode': None}, headers=self.headers)
+        self.assertEqual(len(resp.json()['files']), 1)
+        self.assertTrue(resp.json()['files'][0].endswith('.folded'))
+
+    def test_profiling_requires_api_key(self) -> None:
+        resp = self.client.put('/v1/profiling', json={'mode': 'cprofile'}, headers={'X-api-key': 'user=secret'})
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json()['errors'][0], UnauthorizedError().json())
+        self.assertIsNone(self.client.app.state.profiler.mode)
+
+    def test_unknown_mode(self) -> None:
+        resp = self.client.put('/v1/profiling', json={'mode': 'tracing'}, headers=self.headers)
+        self.assertEqual(resp.status_code, 422)
+
+
+if __name__ == '__main__':
+    unittest.main()
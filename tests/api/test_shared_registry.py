@@ -0,0 +1,61 @@
+import dataclasses
+import tempfile
+import time
+import unittest
+
+from app.api.resources import Model
+from app.main import app
+from app.store import SQLiteModelStore
+from tests.api.client import start_client
+
+
+class TestSharedRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.addClassCleanup(cls.directory.cleanup)
+        settings = app.state.settings
+        app.state.settings = dataclasses.replace(settings, registry='sqlite', registry_path=cls.directory.name,
+                                                 registry_poll_interval=0.05)
+        cls.addClassCleanup(setattr, app.state, 'settings', settings)
+        cls.client = start_client(cls)
+
+    def setUp(self) -> None:
+        # Another worker using the same registry
+        self.other_store: SQLiteModelStore[str, Model] = SQLiteModelStore(default_model=None,
+                                                                          path=self.directory.name)
+
+    def tearDown(self) -> None:
+        self.other_store.close()
+        self.client.app.state.model_store.clear()
+
+    def _wait_for_deployed_model(self, model_id: str, timeout: float = 5) -> None:
+        deadline = time.monotonic() + timeout
+        while str(self.client.app.state.model.id) != model_id and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_uploaded_model_is_visible_to_other_workers(self) -> None:
+        resp = self.client.post('/v1/models/upload', json={'model_location': './models/modelv1.0.depart'})
+        self.assertEqual(resp.status_code, 201)
+
+        model = self.other_store[resp.json()['id']]
+        self.assertEqual(model.status.value, resp.json()['status'])
+        self.assertIsNotNone(model.model)
+
+    def test_deployment_by_other_worker_is_picked_up(self) -> None:
+        resp = self.client.post('/v1/models/upload', json={'model_location': './models/modelv1.0.depart'})
+        model_id = resp.json()['id']
+
+        self.other_store.deploy(model_id)
+        self._wait_for_deployed_model(model_id)
+        self.assertEqual(str(self.client.app.state.model.id), model_id)
+        self.assertTrue(self.client.get(f'/v1/models/{model_id}').json()['deployed'])
+
+        self.other_store.deploy(None)
+        default_model_id = str(self.client.app.state.model_store.default_model.id)
+        self._wait_for_deployed_model(default_model_id)
+        self.assertEqual(str(self.client.app.state.model.id), default_model_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+import unittest
+
+from app.model import DelayModel
+from tests.api.client import start_client
+
+# Run in a fresh interpreter, as other tests will already have imported the heavy libraries
+_SERVE_SCRIPT = '''
+import sys
+from fastapi.testclient import TestClient
+import app.main
+imported_on_load = sorted(module for module in ('pandas', 'scipy', 'sklearn') if module in sys.modules)
+with TestClient(app.main.app) as client:
+    flight = {'OPERA': 'Grupo LATAM', 'TIPOVUELO': 'I', 'MES': 7, 'Fecha-O': '', 'Fecha-I': ''}
+    resp = client.post('/v1/predictions', json={'flights': [flight]})
+    assert resp.status_code == 200, resp.text
+imported_on_serve = sorted(module for module in ('pandas', 'scipy', 'sklearn') if module in sys.modules)
+print(','.join(imported_on_load), ','.join(imported_on_serve), sep='|')
+'''
+
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+
+    def test_serving_does_not_import_training_libraries(self) -> None:
+        result = subprocess.run([sys.executable, '-c', _SERVE_SCRIPT], capture_output=True, text=True, check=True)
+        imported_on_load, imported_on_serve = result.stdout.strip().split('|')
+
+        self.assertEqual(imported_on_load, '')
+        self.assertEqual(imported_on_serve, '')
+
+    def test_default_model_is_loaded_on_startup(self) -> None:
+        default_model = self.client.app.state.model_store.default_model
+        self.assertIsNotNone(default_model)
+        self.assertIsInstance(default_model.model, DelayModel)
+        # The shipped model is in the native format, so it is served without an estimator
+        self.assertIsNone(default_model.model._model)  # pylint: disable=protected-access
+
+    def test_startup_timings_are_reported(self) -> None:
+        resp = self.client.get('/v1/stats')
+        self.assertEqual(resp.status_code, 200)
+        startup = resp.json()['startup']
+        self.assertCountEqual(['model_load_ms', 'lifespan_startup_ms'], startup)
+        self.assertGreaterEqual(startup['lifespan_startup_ms'], startup['model_load_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
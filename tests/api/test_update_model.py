@@ -0,0 +1,82 @@
+import unittest
+import uuid
+
+from app.api.errors import DataFormatError, ModelNotFoundError, ModelNotReadyError, ModelNotUpdatableError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from tests.api.client import start_client
+from tests.flights import flights_csv
+
+
+class TestUpdateModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = start_client(cls)
+        cls._DATA_PATH = flights_csv()
+        cls.delay_model = DelayModel().train(cls._DATA_PATH, chunksize=10000)
+
+    def setUp(self) -> None:
+        model = Model.new_model()
+        self.client.app.state.model_store.add_model(model)
+        self.client.app.state.model_store.update_model(str(model.id), self.delay_model)
+        self.client.app.state.model_store.update_status(str(model.id), Status.COMPLETED)
+        self.model_id = str(model.id)
+
+    def tearDown(self) -> None:
+        self.client.app.state.model_store.clear()
+
+    def test_update_model_success(self) -> None:
+        resp = self.client.post(f'/v1/models/{self.model_id}/data', json={'data_source': self._DATA_PATH})
+        self.assertEqual(resp.status_code, 202)
+        resp_json = resp.json()
+        # A new model is created that references the model it was built from
+        self.assertCountEqual(['id', 'status', 'deployed', 'parent'], resp_json)
+        self.assertNotEqual(resp_json['id'], self.model_id)
+        self.assertEqual(resp_json['parent'], self.model_id)
+        self.assertEqual(resp_json['status'], Status.PENDING.value)
+        self.assertEqual(resp.headers['location'], f'{self.client.base_url}/v1/models/{resp_json["id"]}')
+
+        self.client.app.state.training_executor.wait(resp_json['id'])
+        model = self.client.app.state.model_store[resp_json['id']]
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertIsNot(model.model, self.delay_model)
+        # The new model has been trained on the data twice, so each feature vector should have double the count
+        self.assertEqual(model.model._counts.sum(), 2 * self.delay_model._counts.sum())  # pylint: disable=protected-access
+        # The existing model is unchanged
+        self.assertIs(self.client.app.state.model_store[self.model_id].model, self.delay_model)
+
+    def test_update_unknown_model_fails(self) -> None:
+        resp = self.client.post(f'/v1/models/{uuid.uuid4()}/data', json={'data_source': self._DATA_PATH})
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(resp.json()['errors'][0]['code'], ModelNotFoundError.code)
+
+    def test_update_pending_model_fails(self) -> None:
+        model = Model.new_model()
+        self.client.app.state.model_store.add_model(model)
+        resp = self.client.post(f'/v1/models/{model.id}/data', json={'data_source': self._DATA_PATH})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()['errors'][0]['code'], ModelNotReadyError.code)
+
+    def test_update_model_without_counts_fails(self) -> None:
+        # A model loaded from a pickle does not record the data it was trained on
+        model = Model.new_model()
+        self.client.app.state.model_store.add_model(model)
+        self.client.app.state.model_store.update_model(str(model.id), DelayModel.load('./models/modelv1.0.pkl'))
+        self.client.app.state.model_store.update_status(str(model.id), Status.COMPLETED)
+        resp = self.client.post(f'/v1/models/{model.id}/data', json={'data_source': self._DATA_PATH})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()['errors'][0]['code'], ModelNotUpdatableError.code)
+
+    def test_update_model_with_bad_data_fails(self) -> None:
+        resp = self.client.post(f'/v1/models/{self.model_id}/data', json={'data_source': './data/bad_data.csv'})
+        self.assertEqual(resp.status_code, 202)
+        model_id = resp.json()['id']
+        self.client.app.state.training_executor.wait(model_id)
+        model = self.client.app.state.model_store[model_id]
+        self.assertEqual(model.status, Status.FAILED)
+        self.assertEqual(model.errors[0].code, DataFormatError.code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,20 @@
+import asyncio
+import dataclasses
+import os
+import tempfile
 import unittest
 import uuid
+from unittest import mock
 
-from fastapi.testclient import TestClient
+import numpy as np
+from starlette.requests import ClientDisconnect
 
-from app.api.errors import UnsupportedModelTypeError
+from app.api.errors import ModelTooLargeError, UnsupportedModelTypeError
 from app.api.resources import Model
 from app.api.schemas import Status
-from app.main import app
 from app.model import DelayModel
+from app.model.serialization import artifact_to_bytes
+from tests.api.client import start_client
 
 
 class TestUploadModel(unittest.TestCase):
@@ -15,7 +22,7 @@ class TestUploadModel(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
-        cls.client = TestClient(app)
+        cls.client = start_client(cls)
 
     def tearDown(self) -> None:
         self.client.app.state.model_store.clear()
@@ -75,7 +82,7 @@ class TestUploadModel(unittest.TestCase):
         self.assertEqual(len(self.client.app.state.model_store), 0)
 
     def test_upload_fails_with_non_binary_file(self) -> None:
-        resp = self.client.post('/v1/models/upload', json={'model_location': './data/data.csv'})
+        resp = self.client.post('/v1/models/upload', json={'model_location': './data/bad_data.csv'})
         self.assertEqual(resp.status_code, 400)
         resp_json = resp.json()
         # The response should have one field - `errors`
@@ -87,6 +94,106 @@ class TestUploadModel(unittest.TestCase):
         # The model store should still be empty
         self.assertEqual(len(self.client.app.state.model_store), 0)
 
+    def test_can_upload_native_model(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'model.depart')
+            delay_model = DelayModel.load(self._TEST_MODEL)
+            delay_model.threshold = 0.4
+            delay_model.save(file_name)
+            resp = self.client.post('/v1/models/upload', json={'model_location': file_name})
+
+        self.assertEqual(resp.status_code, 201)
+        model = self.client.app.state.model_store[resp.json()['id']]
+        # The threshold is read from the model file when none is given in the request
+        self.assertEqual(model.model.threshold, 0.4)
+
+    def test_upload_pickle_fails_when_disallowed(self) -> None:
+        settings = self.client.app.state.settings
+        self.client.app.state.settings = dataclasses.replace(settings, allow_pickle_uploads=False)
+        try:
+            resp = self.client.post('/v1/models/upload', json={'model_location': self._TEST_MODEL})
+        finally:
+            self.client.app.state.settings = settings
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()['errors'][0], UnsupportedModelTypeError().json())
+        self.assertEqual(len(self.client.app.state.model_store), 0)
+
+    def test_can_upload_model_in_body(self) -> None:
+        delay_model = DelayModel.load(self._TEST_MODEL)
+        resp = self.client.post('/v1/models/upload', params={'threshold': 0.3},
+                                content=delay_model.to_bytes(compress=True),
+                                headers={'content-type': 'application/octet-stream'})
+
+        self.assertEqual(resp.status_code, 201)
+        model = self.client.app.state.model_store[resp.json()['id']]
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertEqual(model.model.threshold, 0.3)
+        self.assertEqual(model.model.predict_proba(np.eye(10)), delay_model.predict_proba(np.eye(10)))
+
+    def test_upload_in_body_fails_when_too_large(self) -> None:
+        settings = self.client.app.state.settings
+        self.client.app.state.settings = dataclasses.replace(settings, max_upload_size=1024)
+        try:
+            # Both a declared length and a streamed body without one are checked
+            for content in (b'\0' * 2048, iter([b'\0' * 1000, b'\0' * 1000])):
+                resp = self.client.post('/v1/models/upload', content=content,
+                                        headers={'content-type': 'application/octet-stream'})
+                self.assertEqual(resp.status_code, 413)
+                self.assertEqual(resp.json()['errors'][0], ModelTooLargeError().json())
+        finally:
+            self.client.app.state.settings = settings
+        self.assertEqual(len(self.client.app.state.model_store), 0)
+
+    def test_upload_location_fails_when_too_large(self) -> None:
+        settings = self.client.app.state.settings
+        self.client.app.state.settings = dataclasses.replace(settings, max_upload_size=16)
+        try:
+            body = f'{{"model_location": "{self._TEST_MODEL}"}}'.encode()
+            for content in (body, iter([body[:10], body[10:]])):
+                resp = self.client.post('/v1/models/upload', content=content,
+                                        headers={'content-type': 'application/json'})
+                self.assertEqual(resp.status_code, 413)
+                self.assertEqual(resp.json()['errors'][0], ModelTooLargeError().json())
+        finally:
+            self.client.app.state.settings = settings
+        self.assertEqual(len(self.client.app.state.model_store), 0)
+
+    def test_received_model_is_removed_when_client_disconnects(self) -> None:
+        messages = iter([{'type': 'http.request', 'body': b'\0' * 10, 'more_body': True}, {'type': 'http.disconnect'}])
+        scope = {'type': 'http', 'http_version': '1.1', 'method': 'POST', 'scheme': 'http', 'path': '/v1/models/upload',
+                 'raw_path': b'/v1/models/upload', 'root_path': '', 'query_string': b'', 'server': ('test', 80),
+                 'headers': [(b'content-type', b'application/octet-stream')], 'state': {}}
+
+        async def receive() -> dict[str, object]:
+            return next(messages)
+
+        async def send(_: dict[str, object]) -> None:
+            pass
+
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(tempfile, 'tempdir', directory):
+            with self.assertRaises(ClientDisconnect):
+                asyncio.run(self.client.app(scope, receive, send))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_upload_in_body_fails_with_wrong_model(self) -> None:
+        for content in (b'', b'not a model', DelayModel.load(self._TEST_MODEL).to_bytes()[:100]):
+            resp = self.client.post('/v1/models/upload', content=content,
+                                    headers={'content-type': 'application/octet-stream'})
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(resp.json()['errors'][0], UnsupportedModelTypeError().json())
+        self.assertEqual(len(self.client.app.state.model_store), 0)
+
+    def test_upload_in_body_fails_with_inconsistent_model(self) -> None:
+        artifact = DelayModel.load(self._TEST_MODEL).to_artifact()
+        for bad_artifact in (dataclasses.replace(artifact, coef=artifact.coef[:3]),
+                             dataclasses.replace(artifact, classes=[0])):
+            resp = self.client.post('/v1/models/upload', content=artifact_to_bytes(bad_artifact),
+                                    headers={'content-type': 'application/octet-stream'})
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(resp.json()['errors'][0], UnsupportedModelTypeError().json())
+        self.assertEqual(len(self.client.app.state.model_store), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
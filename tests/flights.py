@@ -0,0 +1,18 @@
+import atexit
+import functools
+import os
+import shutil
+import tempfile
+
+from benchmarks.synthetic import make_flights
+
+
+@functools.cache
+def flights_csv(n_rows: int = 20_000, seed: int = 0) -> str:
+    # The flights the service is trained on in production are not part of the repository, so tests train on flights
+    # generated from a fixed seed. Each file is written once for the whole test run.
+    directory = tempfile.mkdtemp(prefix='depart-flights-')
+    atexit.register(shutil.rmtree, directory, True)
+    file_name = os.path.join(directory, 'flights.csv')
+    make_flights(n_rows, seed=seed).to_csv(file_name, index=False)
+    return file_name
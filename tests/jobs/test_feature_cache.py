@@ -0,0 +1,120 @@
+import functools
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import numpy as np
+
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.jobs import FeatureCache, TrainingExecutor
+from app.model import DelayModel
+from app.store import ModelStore
+from tests.flights import flights_csv
+
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._DATA_PATH = flights_csv()
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cache = FeatureCache(os.path.join(self.directory.name, 'cache'))
+        self.features = DelayModel().features
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _counts(self, value: int = 1) -> np.ndarray:
+        return np.full((2, 2 ** len(self.features)), value, dtype=np.int64)
+
+    def test_counts_are_cached(self) -> None:
+        key = FeatureCache.key(self._DATA_PATH, self.features)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, self._counts(3))
+
+        np.testing.assert_array_equal(self.cache.get(key), self._counts(3))
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_key_changes_with_data_source(self) -> None:
+        data_path = os.path.join(self.directory.name, 'data.csv')
+        shutil.copyfile(self._DATA_PATH, data_path)
+        key = FeatureCache.key(data_path, self.features)
+
+        self.assertEqual(FeatureCache.key(data_path, self.features), key)
+        self.assertNotEqual(FeatureCache.key(data_path, self.features[:-1]), key)
+        with open(data_path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertNotEqual(FeatureCache.key(data_path, self.features), key)
+
+    def test_missing_data_source(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            FeatureCache.key('./data/missing.csv', self.features)
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        self.cache.put('first', self._counts())
+        entry_size = self.cache.stats()['bytes']
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.put('second', self._counts())
+        os.utime(self.cache._file_name('first'), ns=(1, 1))  # pylint: disable=protected-access
+        self.cache.put('third', self._counts())
+
+        self.assertIsNone(self.cache.get('first'))
+        self.assertIsNotNone(self.cache.get('second'))
+        self.assertIsNotNone(self.cache.get('third'))
+        stats = self.cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], self.cache.max_bytes)
+
+    def test_corrupt_entry_is_a_miss(self) -> None:
+        with open(self.cache._file_name('corrupt'), 'wb') as f:  # pylint: disable=protected-access
+            f.write(b'not an array')
+
+        self.assertIsNone(self.cache.get('corrupt'))
+
+    def test_repeated_training_uses_cache(self) -> None:
+        model_store: ModelStore[str, Model] = ModelStore(default_model=None)
+        executor = TrainingExecutor(model_store, max_workers=1, feature_cache=self.cache)
+        models = [Model.new_model() for _ in range(2)]
+        try:
+            for model in models:
+                model_store.add_model(model)
+                executor.submit(model, self._DATA_PATH).result(timeout=60)
+        finally:
+            executor.shutdown()
+
+        self.assertTrue(all(model.status == Status.COMPLETED for model in models))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        first, second = (model.model.to_artifact() for model in models)
+        np.testing.assert_array_equal(first.coef, second.coef)
+        np.testing.assert_array_equal(first.counts, second.counts)
+
+    def test_url_data_source_is_not_cached(self) -> None:
+        class QuietHandler(SimpleHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        handler = functools.partial(QuietHandler, directory=os.path.dirname(os.path.abspath(self._DATA_PATH)))
+        with ThreadingHTTPServer(('127.0.0.1', 0), handler) as server:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            data_source = f'http://127.0.0.1:{server.server_address[1]}/{os.path.basename(self._DATA_PATH)}'
+
+            model_store: ModelStore[str, Model] = ModelStore(default_model=None)
+            executor = TrainingExecutor(model_store, max_workers=1, feature_cache=self.cache)
+            model = Model.new_model()
+            try:
+                model_store.add_model(model)
+                executor.submit(model, data_source).result(timeout=60)
+            finally:
+                executor.shutdown()
+                server.shutdown()
+
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
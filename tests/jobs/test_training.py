@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+
+from app.api.errors import DataFormatError, InternalServerError, InvalidDataSourceError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.jobs import TrainingExecutor
+from app.metrics import ServiceMetrics
+from app.model import DelayModel
+from app.store import ModelStore
+from tests.flights import flights_csv
+
+
+class TestTrainingExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self._DATA_PATH = flights_csv()
+        self.model_store = ModelStore(default_model=None)
+        self.executor = TrainingExecutor(self.model_store, max_workers=2)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+    def _new_model(self) -> Model:
+        model = Model.new_model()
+        self.model_store.add_model(model)
+        return model
+
+    def test_training_completes_model(self) -> None:
+        model = self._new_model()
+        self.executor.submit(model, self._DATA_PATH, threshold=0.4).result(timeout=60)
+        # The model should be trained and completed
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertIsInstance(model.model, DelayModel)
+        self.assertEqual(model.model.threshold, 0.4)
+        self.assertEqual(model.errors, [])
+
+    def test_training_fails_with_missing_columns(self) -> None:
+        model = self._new_model()
+        self.executor.submit(model, './data/bad_data.csv').result(timeout=60)
+        # The model should have failed with a `DataFormatError`
+        self.assertEqual(model.status, Status.FAILED)
+        self.assertEqual(len(model.errors), 1)
+        self.assertIsInstance(model.errors[0], DataFormatError)
+        self.assertIsNone(model.model)
+
+    def test_training_fails_with_unexpected_error(self) -> None:
+        for error, expected in ((PermissionError('data.csv'), InvalidDataSourceError),
+                                (MemoryError(), InternalServerError)):
+            model = self._new_model()
+            with mock.patch('app.jobs.training.train_model', side_effect=error), \
+                    self.assertLogs('app.jobs.training', level='ERROR'):
+                self.executor.submit(model, self._DATA_PATH).result(timeout=60)
+            # The model should not be left running
+            self.assertEqual(model.status, Status.FAILED)
+            self.assertEqual(len(model.errors), 1)
+            self.assertIsInstance(model.errors[0], expected)
+
+    def test_training_fails_when_model_can_not_be_saved(self) -> None:
+        model = self._new_model()
+        with mock.patch.object(self.model_store, 'update_model', side_effect=OSError('disk full')), \
+                self.assertLogs('app.jobs.training', level='ERROR'):
+            self.executor.submit(model, self._DATA_PATH).result(timeout=60)
+        # The model should not be left running
+        self.assertEqual(model.status, Status.FAILED)
+        self.assertEqual(len(model.errors), 1)
+        self.assertIsInstance(model.errors[0], InternalServerError)
+
+    def test_concurrent_trainings(self) -> None:
+        models = [self._new_model() for _ in range(3)]
+        futures = [self.executor.submit(model, self._DATA_PATH) for model in models]
+        for future in futures:
+            future.result(timeout=60)
+        self.assertTrue(all(model.status == Status.COMPLETED for model in models))
+
+    def test_training_in_process_pool(self) -> None:
+        executor = TrainingExecutor(self.model_store, max_workers=1, use_processes=True)
+        try:
+            model = self._new_model()
+            executor.submit(model, self._DATA_PATH).result(timeout=60)
+        finally:
+            executor.shutdown()
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertIsInstance(model.model, DelayModel)
+
+    def test_wait_for_model(self) -> None:
+        model = self._new_model()
+        self.executor.submit(model, self._DATA_PATH)
+        self.executor.wait(str(model.id), timeout=60)
+        self.assertEqual(model.status, Status.COMPLETED)
+        # Waiting on a model without a job returns immediately
+        self.executor.wait(str(model.id))
+
+    def test_training_records_metrics(self) -> None:
+        metrics = ServiceMetrics()
+        executor = TrainingExecutor(self.model_store, max_workers=1, chunk_size=5000, metrics=metrics)
+        try:
+            model = self._new_model()
+            executor.submit(model, self._DATA_PATH).result(timeout=60)
+        finally:
+            executor.shutdown()
+        self.assertCountEqual(['read', 'preprocess', 'fit'], model.model.training_timings)
+        self.assertEqual(metrics.training_durations.count, 1)
+        self.assertTrue(all(histogram.count == 1 for histogram in metrics.training_stages.values()))
+        self.assertIn(str(model.id), metrics.model_durations())
+
+    def test_deleted_model_is_discarded(self) -> None:
+        model = self._new_model()
+        del self.model_store[str(model.id)]
+        # The job should finish without raising even though the model has been removed
+        self.executor.submit(model, self._DATA_PATH).result(timeout=60)
+        self.assertNotIn(str(model.id), self.model_store)
+
+
+if __name__ == '__main__':
+    unittest.main()
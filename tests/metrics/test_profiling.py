@@ -0,0 +1,69 @@
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from app.metrics import Profiler
+from app.model import DelayModel
+
+
+class TestProfiler(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.profiler = Profiler(os.path.join(self.directory.name, 'profiles'), interval=0.001)
+        self.addCleanup(self.profiler.stop)
+
+    def test_disabled_profiler_leaves_model_unchanged(self) -> None:
+        predict = DelayModel.predict
+        self.profiler.start('cprofile')
+        self.assertIsNot(DelayModel.predict, predict)
+        self.profiler.stop()
+        self.assertIs(DelayModel.predict, predict)
+        self.assertIsNone(self.profiler.mode)
+
+    def test_cprofile_writes_a_profile_of_each_call(self) -> None:
+        self.profiler.start('cprofile')
+        model = DelayModel.load(self._MODEL_PATH)
+        model.predict(model.transform_columns({'OPERA': ['Grupo LATAM'], 'TIPOVUELO': ['I'], 'MES': [7]}))
+        self.profiler.stop()
+
+        files = self.profiler.files()
+        self.assertEqual(len(files), 2)
+        self.assertTrue(files[0].endswith('DelayModel.load.prof'))
+        self.assertTrue(files[1].endswith('DelayModel.predict.prof'))
+        stats = pstats.Stats(os.path.join(self.profiler.path, files[1]))
+        self.assertIn('predict', stats.get_stats_profile().func_profiles)
+
+    def test_nested_calls_are_in_the_outer_profile(self) -> None:
+        self.profiler.start('cprofile')
+        with self.profiler.profile('outer'):
+            with self.profiler.profile('inner'):
+                pass
+        self.assertEqual(len(self.profiler.files()), 1)
+        self.assertTrue(self.profiler.files()[0].endswith('outer.prof'))
+
+    def test_sampling_writes_folded_stacks(self) -> None:
+        self.profiler.start('sampling')
+        time.sleep(0.05)
+        file_name = self.profiler.stop()
+
+        self.assertIsNotNone(file_name)
+        with open(str(file_name), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertGreater(len(lines), 0)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn(';', stack)
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            self.profiler.start('tracing')
+        self.assertIsNone(self.profiler.mode)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import time
+import unittest
+
+from app.metrics import Histogram, ServiceMetrics, format_histogram, format_metric, watch_event_loop
+
+
+class TestPrometheusFormat(unittest.TestCase):
+    def test_format_histogram_is_cumulative(self) -> None:
+        histogram = Histogram([1, 10])
+        for value in (0.5, 5, 5, 50):
+            histogram.observe(value)
+        lines = format_histogram('depart_test', 'A test histogram', [({'stage': 'fit'}, histogram)])
+        self.assertEqual(lines, [
+            '# HELP depart_test A test histogram',
+            '# TYPE depart_test histogram',
+            'depart_test_bucket{stage="fit",le="1"} 1',
+            'depart_test_bucket{stage="fit",le="10"} 3',
+            'depart_test_bucket{stage="fit",le="+Inf"} 4',
+            'depart_test_sum{stage="fit"} 60.5',
+            'depart_test_count{stage="fit"} 4'
+        ])
+
+    def test_format_metric_escapes_labels(self) -> None:
+        lines = format_metric('depart_test', 'gauge', 'A test gauge', [({'model': 'a"b\\c'}, 1.5), ({}, 2)])
+        self.assertEqual(lines[2:], ['depart_test{model="a\\"b\\\\c"} 1.5', 'depart_test 2'])
+
+
+class TestServiceMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = ServiceMetrics(max_models=2)
+
+    def test_time_stage(self) -> None:
+        with self.metrics.time_stage('predict'):
+            time.sleep(0.001)
+        self.assertEqual(self.metrics.prediction_stages['predict'].count, 1)
+        self.assertEqual(self.metrics.prediction_stages['encode_response'].count, 0)
+
+    def test_only_recent_models_are_kept(self) -> None:
+        for model_id in ('a', 'b', 'c'):
+            self.metrics.observe_training(model_id, 1.0, {'read': 0.5, 'fit': 0.5})
+        self.assertEqual(list(self.metrics.model_durations()), ['b', 'c'])
+        self.assertEqual(self.metrics.training_durations.count, 3)
+        self.assertEqual(self.metrics.training_stages['read'].count, 3)
+        self.assertEqual(self.metrics.training_stages['preprocess'].count, 0)
+
+    def test_render_labels_requests_by_handler(self) -> None:
+        self.metrics.observe_request('GET', 'get_model', 200, 0.01)
+        text = '\n'.join(self.metrics.render())
+        self.assertIn('depart_http_request_duration_seconds_count{method="GET",handler="get_model",status="200"} 1',
+                      text)
+
+    def test_watch_event_loop_measures_lag(self) -> None:
+        async def block_loop() -> None:
+            task = asyncio.create_task(watch_event_loop(self.metrics, 0.001))
+            await asyncio.sleep(0.005)
+            time.sleep(0.05)
+            await asyncio.sleep(0.005)
+            task.cancel()
+
+        asyncio.run(block_loop())
+        counts, total = self.metrics.event_loop_lag.collect()
+        self.assertGreater(sum(counts), 0)
+        self.assertGreaterEqual(total, 0.04)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,16 @@
+import os
+import tempfile
 import unittest
 
+import numpy as np
 import pandas as pd
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
 from app.model import DelayModel
+from tests.flights import flights_csv
+
+DATASET_PATH = './data/data.csv'
 
 
 class TestModel(unittest.TestCase):
@@ -27,7 +33,7 @@ class TestModel(unittest.TestCase):
 
     def setUp(self) -> None:
         self.model = DelayModel()
-        self.data = pd.read_csv(filepath_or_buffer='./data/data.csv')
+        self.data = pd.read_csv(filepath_or_buffer=flights_csv())
 
     def test_model_preprocess_for_training(self) -> None:
         features, target = self.model.preprocess(data=self.data, target_column='delay')
@@ -47,8 +53,11 @@ class TestModel(unittest.TestCase):
         self.assertEqual(features.shape[1], len(self.FEATURES_COLS))
         self.assertEqual(set(features.columns), set(self.FEATURES_COLS))
 
+    @unittest.skipUnless(os.path.isfile(DATASET_PATH), f'the flight dataset is not in {DATASET_PATH}')
     def test_model_fit(self):
-        features, target = self.model.preprocess(data=self.data, target_column='delay')
+        # How well the model fits is only meaningful for the real flights, not for generated ones
+        data = pd.read_csv(filepath_or_buffer=DATASET_PATH)
+        features, target = self.model.preprocess(data=data, target_column='delay')
 
         _, features_validation, _, target_validation = train_test_split(features, target, test_size=0.33, random_state=42)
 
@@ -74,6 +83,54 @@ class TestModel(unittest.TestCase):
         self.assertEqual(len(predicted_targets), features.shape[0])
         self.assertTrue(all(isinstance(predicted_target, int) for predicted_target in predicted_targets))
 
+    def test_model_train_in_chunks(self) -> None:
+        model = DelayModel().train(flights_csv())
+        chunked_model = DelayModel().train(flights_csv(), chunksize=1000)
+
+        # Training on the counts of each distinct feature vector should give the same model as training on every row
+        np.testing.assert_allclose(chunked_model._model.coef_, model._model.coef_, atol=1e-4)  # pylint: disable=protected-access
+        np.testing.assert_allclose(chunked_model._model.intercept_, model._model.intercept_, atol=1e-4)  # pylint: disable=protected-access
+        features = self.model.preprocess(data=self.data)
+        self.assertEqual(chunked_model.predict(features), model.predict(features))
+
+    def test_model_train_in_chunks_fails_with_missing_columns(self) -> None:
+        with self.assertRaises(ValueError):
+            DelayModel().train('./data/bad_data.csv', chunksize=1000)
+
+    def test_model_count_features(self) -> None:
+        features, target = self.model.preprocess(data=self.data, target_column='delay')
+        counts = self.model.count_features(features, target)
+
+        self.assertEqual(counts.shape, (2, 2 ** len(self.FEATURES_COLS)))
+        self.assertEqual(counts.sum(), len(self.data))
+        self.assertEqual(counts[1].sum(), target['delay'].sum())
+
+    def test_model_update(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            first_half, second_half = os.path.join(directory, 'first.csv'), os.path.join(directory, 'second.csv')
+            middle = len(self.data) // 2
+            self.data.iloc[:middle].to_csv(first_half, index=False)
+            self.data.iloc[middle:].to_csv(second_half, index=False)
+
+            base_model = DelayModel().train(first_half)
+            base_coef = base_model._model.coef_.copy()  # pylint: disable=protected-access
+            updated_model = base_model.update(second_half, chunksize=1000)
+
+        # Updating with the rest of the data should give the same model as training on all of it at once
+        model = DelayModel().train(flights_csv())
+        self.assertIsNot(updated_model, base_model)
+        np.testing.assert_array_equal(updated_model._counts, model._counts)  # pylint: disable=protected-access
+        np.testing.assert_allclose(updated_model._model.coef_, model._model.coef_, atol=1e-4)  # pylint: disable=protected-access
+        # The model that was updated should not have changed
+        np.testing.assert_array_equal(base_model._model.coef_, base_coef)  # pylint: disable=protected-access
+
+    def test_model_update_fails_without_counts(self) -> None:
+        features, target = self.model.preprocess(data=self.data, target_column='delay')
+        self.model.fit(features, target)
+        self.assertFalse(self.model.updatable)
+        with self.assertRaises(ValueError):
+            self.model.update(flights_csv())
+
 
 if __name__ == '__main__':
     unittest.main()
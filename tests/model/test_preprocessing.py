@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.api.schemas.post_predictions_body import Flight
+from app.model import DelayModel
+from benchmarks.bench_preprocess import legacy_preprocess
+
+
+class TestPreprocessing(unittest.TestCase):
+    _OPERATORS = ['Grupo LATAM', 'Sky Airline', 'Aerolineas Argentinas', 'Copa Air', 'Latin American Wings', 'Avianca']
+
+    def setUp(self) -> None:
+        self.model = DelayModel()
+        rng = np.random.default_rng(42)
+        n_rows = 2000
+        scheduled = pd.Timestamp('2017-01-01') + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, n_rows), unit='min')
+        operated = scheduled + pd.to_timedelta(rng.integers(-10, 60, n_rows), unit='min')
+        self.data = pd.DataFrame({
+            'Fecha-I': scheduled.strftime('%Y-%m-%d %H:%M:%S'),
+            'Fecha-O': operated.strftime('%Y-%m-%d %H:%M:%S'),
+            'MES': scheduled.month,
+            'TIPOVUELO': rng.choice(['I', 'N'], n_rows),
+            'OPERA': rng.choice(self._OPERATORS, n_rows)
+        })
+
+    def test_training_features_match_row_wise_implementation(self) -> None:
+        expected_features, expected_target = legacy_preprocess(self.model, self.data.copy())
+        features, target = self.model.preprocess(self.data.copy(), target_column='delay')
+
+        pd.testing.assert_frame_equal(features, expected_features)
+        pd.testing.assert_frame_equal(target, expected_target)
+
+    def test_serving_features_match_row_wise_implementation(self) -> None:
+        expected_features, _ = legacy_preprocess(self.model, self.data.copy())
+        features = self.model.preprocess(self.data.copy())
+
+        pd.testing.assert_frame_equal(features, expected_features)
+
+    def test_missing_categories_match_row_wise_implementation(self) -> None:
+        # Only keep flights that do not match some of the model features
+        data = self.data[(self.data['OPERA'] != 'Copa Air') & (self.data['MES'] != 7)].reset_index(drop=True)
+        expected_features, expected_target = legacy_preprocess(self.model, data.copy())
+        features, target = self.model.preprocess(data.copy(), target_column='delay')
+
+        pd.testing.assert_frame_equal(features, expected_features)
+        pd.testing.assert_frame_equal(target, expected_target)
+
+    def test_preprocess_fails_with_missing_dates(self) -> None:
+        self.data.loc[3, 'Fecha-O'] = None
+        with self.assertRaises(ValueError):
+            self.model.preprocess(self.data, target_column='delay')
+
+    def test_preprocess_fails_with_malformed_dates(self) -> None:
+        self.data.loc[3, 'Fecha-I'] = '01/01/2017 10:00'
+        with self.assertRaises(ValueError):
+            self.model.preprocess(self.data, target_column='delay')
+
+    def test_inference_features_match_preprocess(self) -> None:
+        flights = [Flight.model_validate(flight) for flight in self.data.to_dict(orient='records')]
+        expected_features = self.model.preprocess(self.data.copy())
+        features = self.model.transform_for_inference(flights)
+
+        self.assertIsInstance(features, np.ndarray)
+        np.testing.assert_array_equal(features, expected_features.to_numpy(dtype=np.float64))
+
+    def test_inference_features_ignore_unknown_categories(self) -> None:
+        flight = Flight(opera='Unknown Airline', tipovuelo='N', mes=13, Fecha_O='', Fecha_I='')
+        features = self.model.transform_for_inference([flight])
+
+        self.assertEqual(features.shape, (1, len(self.model.features)))
+        self.assertFalse(features.any())
+
+    def test_column_features_match_preprocess(self) -> None:
+        # Values are compared as strings, so both numbers and strings match the month features
+        columns = {column: self.data[column].tolist() for column in self.model.feature_columns}
+        columns['MES'] = [str(month) if row % 2 else month for row, month in enumerate(columns['MES'])]
+        expected_features = self.model.preprocess(self.data.copy())
+        features = self.model.transform_columns(columns)
+
+        np.testing.assert_array_equal(features, expected_features.to_numpy(dtype=np.float64))
+
+
+if __name__ == '__main__':
+    unittest.main()
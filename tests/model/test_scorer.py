@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from app.model import DelayModel
+from app.model.scorer import LinearScorer, all_binary_vectors
+
+
+class TestLinearScorer(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.pkl'
+
+    def setUp(self) -> None:
+        self.model = DelayModel.load(self._MODEL_PATH)
+        self.vectors = all_binary_vectors(len(self.model.features))
+
+    def test_scorer_is_compiled_on_load(self) -> None:
+        self.assertIsInstance(self.model._scorer, LinearScorer)  # pylint: disable=protected-access
+
+    def test_scorer_matches_sklearn_for_every_input(self) -> None:
+        expected = self.model._model.predict(pd.DataFrame(self.vectors, columns=self.model.features))  # pylint: disable=protected-access
+        self.assertEqual(self.model.predict(self.vectors), expected.tolist())
+
+    def test_scorer_is_compiled_on_fit(self) -> None:
+        rng = np.random.default_rng(7)
+        features = pd.DataFrame(rng.integers(0, 2, (500, len(self.model.features))), columns=self.model.features)
+        target = pd.DataFrame({'delay': rng.integers(0, 2, 500)})
+        model = DelayModel().fit(features, target)
+
+        self.assertIsInstance(model._scorer, LinearScorer)  # pylint: disable=protected-access
+        expected = model._model.predict(features)  # pylint: disable=protected-access
+        self.assertEqual(model.predict(features), expected.tolist())
+
+    def test_predict_returns_python_ints(self) -> None:
+        predictions = self.model.predict(self.vectors[:10])
+        self.assertTrue(all(isinstance(prediction, int) for prediction in predictions))
+
+    def test_probabilities_match_sklearn(self) -> None:
+        expected = self.model._model.predict_proba(pd.DataFrame(self.vectors, columns=self.model.features))  # pylint: disable=protected-access
+        labels, probabilities = self.model.predict_with_proba(self.vectors)
+        np.testing.assert_allclose(probabilities, expected[:, 1], rtol=0, atol=1e-12)
+        self.assertEqual(labels, self.model.predict(self.vectors))
+        self.assertEqual(probabilities, self.model.predict_proba(self.vectors))
+
+    def test_predict_with_threshold(self) -> None:
+        probabilities = np.array(self.model.predict_proba(self.vectors))
+        threshold = float(np.median(probabilities))
+        expected = (probabilities >= threshold).astype(int).tolist()
+        self.assertEqual(self.model.predict(self.vectors, threshold), expected)
+        # A threshold set on the model is used when none is passed
+        self.model.threshold = threshold
+        self.assertEqual(self.model.predict(self.vectors), expected)
+        labels, _ = self.model.predict_with_proba(self.vectors)
+        self.assertEqual(labels, expected)
+
+    def test_non_binary_features_use_estimator(self) -> None:
+        features = self.vectors[:5] * 3
+        expected = self.model._model.predict(pd.DataFrame(features, columns=self.model.features))  # pylint: disable=protected-access
+        self.assertEqual(self.model.predict(features), expected.tolist())
+
+    def test_lookups_are_counted(self) -> None:
+        self.model.predict(self.vectors[:10])
+        self.model.predict_with_proba(self.vectors[:5])
+        self.model.predict(self.vectors[:3] * 3)
+
+        self.assertEqual(self.model.prediction_stats(), {'lookup_rows': 15, 'computed_rows': 3, 'lookup_rate': 15 / 18})
+
+    def test_warm_up_is_not_counted(self) -> None:
+        self.model.warm_up()
+        self.assertEqual(self.model.prediction_stats(), {'lookup_rows': 0, 'computed_rows': 0, 'lookup_rate': 0.0})
+
+    def test_scorer_is_not_built_for_mismatched_estimator(self) -> None:
+        estimator = LogisticRegression().fit(np.array([[0.0], [1.0]]), np.array([0, 1]))
+        self.assertIsNone(LinearScorer.from_estimator(estimator, self.model.features))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from typing import Any
+
+import numpy as np
+
+from app.model import DelayModel
+from app.model import serialization
+from app.model.scorer import all_binary_vectors
+from app.model.serialization import (MAGIC, ArtifactError, ModelArtifact, artifact_from_buffer, artifact_to_bytes,
+                                     is_artifact, read_artifact)
+from tests.flights import flights_csv
+
+
+class TestSerialization(unittest.TestCase):
+    _PICKLE_PATH = './models/modelv1.0.pkl'
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.file_name = os.path.join(self.directory.name, 'model.depart')
+        self.model = DelayModel.load(self._PICKLE_PATH)
+        self.vectors = all_binary_vectors(len(self.model.features))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_saved_model_is_native(self) -> None:
+        self.model.save(self.file_name)
+        self.assertTrue(is_artifact(self.file_name))
+        self.assertFalse(is_artifact(self._PICKLE_PATH))
+
+    def test_round_trip_preserves_predictions(self) -> None:
+        self.model.threshold = 0.3
+        self.model.save(self.file_name)
+        loaded = DelayModel.load(self.file_name)
+
+        # A native model is served without an estimator
+        self.assertIsNone(loaded._model)  # pylint: disable=protected-access
+        self.assertEqual(loaded.threshold, 0.3)
+        self.assertEqual(loaded.predict(self.vectors), self.model.predict(self.vectors))
+        self.assertEqual(loaded.predict_proba(self.vectors), self.model.predict_proba(self.vectors))
+
+    def test_round_trip_handles_non_binary_features(self) -> None:
+        self.model.save(self.file_name)
+        loaded = DelayModel.load(self.file_name)
+        features = self.vectors[:50] * 0.5
+
+        self.assertEqual(loaded.predict(features), self.model.predict(features))
+        np.testing.assert_allclose(loaded.predict_proba(features), self.model.predict_proba(features), atol=1e-12)
+
+    def test_round_trip_preserves_training_counts(self) -> None:
+        model = DelayModel().train(flights_csv(), chunksize=10000)
+        model.save(self.file_name)
+        loaded = DelayModel.load(self.file_name)
+
+        self.assertTrue(loaded.updatable)
+        np.testing.assert_array_equal(loaded._counts, model._counts)  # pylint: disable=protected-access
+        # A loaded model can be saved again
+        loaded.save(self.file_name)
+        self.assertEqual(DelayModel.load(self.file_name).predict(self.vectors), model.predict(self.vectors))
+
+    def test_artifact_is_read_from_bytes(self) -> None:
+        artifact = ModelArtifact(features=['a', 'b'], coef=np.array([0.5, -1.5]), intercept=0.25, classes=[0, 1],
+                                 metadata={'source': 'test'})
+        loaded = artifact_from_buffer(artifact_to_bytes(artifact))
+
+        self.assertEqual(loaded.features, ['a', 'b'])
+        np.testing.assert_array_equal(loaded.coef, artifact.coef)
+        self.assertEqual(loaded.intercept, 0.25)
+        self.assertIsNone(loaded.counts)
+        self.assertEqual(loaded.metadata, {'source': 'test'})
+
+    def test_corrupt_model_is_rejected(self) -> None:
+        self.model.save(self.file_name)
+        with open(self.file_name, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            last_byte = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last_byte[0] ^ 0xFF]))
+
+        with self.assertRaises(ArtifactError):
+            read_artifact(self.file_name)
+
+    def test_truncated_model_is_rejected(self) -> None:
+        with open(self.file_name, 'wb') as f:
+            f.write(MAGIC)
+
+        with self.assertRaises(ArtifactError):
+            DelayModel.load(self.file_name)
+
+    def test_compressed_model_round_trip(self) -> None:
+        self.model.save(self.file_name, compress=True)
+
+        self.assertTrue(is_artifact(self.file_name))
+        self.assertLess(os.path.getsize(self.file_name), len(self.model.to_bytes()))
+        loaded = DelayModel.load(self.file_name, allow_pickle=False)
+        self.assertEqual(loaded.predict_proba(self.vectors), self.model.predict_proba(self.vectors))
+        # Only the saved model is left in the directory
+        self.assertEqual(os.listdir(self.directory.name), ['model.depart'])
+
+    def test_corrupt_compressed_model_is_rejected(self) -> None:
+        with self.assertRaises(ArtifactError):
+            artifact_from_buffer(self.model.to_bytes(compress=True)[:-10])
+
+    def _with_header(self, **changes: Any) -> bytes:
+        # Rewrites the header of a saved model along with its checksum, as anyone writing a model file could
+        preamble = serialization._PREAMBLE  # pylint: disable=protected-access
+        data = self.model.to_bytes()
+        _, version, header_length = preamble.unpack_from(data)
+        header = json.loads(data[preamble.size:preamble.size + header_length])
+        payload = data[preamble.size + header_length:]
+        del header['checksum']
+        for key, value in changes.items():
+            if value is None and key not in ('threshold', 'counts_shape'):
+                del header[key]
+            else:
+                header[key] = value
+        header['checksum'] = serialization._checksum(header, payload)  # pylint: disable=protected-access
+        encoded_header = json.dumps(header).encode('utf-8')
+        encoded_header += b' ' * (-(preamble.size + len(encoded_header)) % 8)
+        return preamble.pack(MAGIC, version, len(encoded_header)) + encoded_header + payload
+
+    def test_inconsistent_header_is_rejected(self) -> None:
+        n_features = len(self.model.features)
+        for changes in ({'features': None}, {'intercept': None}, {'classes': None}, {'metadata': None},
+                        {'classes': [0]}, {'classes': [0, 1, 2]}, {'classes': ['a', 'b']}, {'intercept': 'x'},
+                        {'threshold': 2}, {'metadata': []}, {'features': self.model.features[:3]},
+                        {'n_coef': 3}, {'counts_shape': [2, 2 ** n_features + 1]}):
+            with self.subTest(changes=changes), self.assertRaises(ArtifactError):
+                artifact_from_buffer(self._with_header(**changes))
+        # The rewritten header is otherwise read as before
+        artifact = artifact_from_buffer(self._with_header(threshold=0.2))
+        self.assertEqual(artifact.threshold, 0.2)
+
+    def test_artifact_with_wrong_shapes_is_rejected(self) -> None:
+        artifact = self.model.to_artifact()
+        for changes in ({'coef': artifact.coef[:3]}, {'classes': [0]},
+                        {'counts': np.zeros((2, 4), dtype=np.int64)}):
+            with self.subTest(changes=list(changes)), self.assertRaises(ArtifactError):
+                DelayModel.from_artifact(ModelArtifact(**{**artifact.__dict__, **changes}))
+
+    def test_compressed_model_is_limited_in_size(self) -> None:
+        data = gzip.compress(b'\0' * (serialization.MAX_ARTIFACT_SIZE + 1))
+        with self.assertRaisesRegex(ArtifactError, 'larger than'):
+            artifact_from_buffer(data)
+
+    def test_pickle_can_be_disallowed(self) -> None:
+        with self.assertRaises(ValueError):
+            DelayModel.load(self._PICKLE_PATH, allow_pickle=False)
+
+    def test_model_with_other_features_is_rejected(self) -> None:
+        artifact = ModelArtifact(features=['a', 'b'], coef=np.array([0.5, -1.5]), intercept=0.25, classes=[0, 1])
+        with self.assertRaises(ValueError):
+            DelayModel.from_artifact(artifact)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from app.model import DelayModel
+from app.model.scorer import all_binary_vectors
+from app.serving import PredictionBatcher
+
+
+class TestPredictionBatcher(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.pkl'
+
+    def setUp(self) -> None:
+        self.model = DelayModel.load(self._MODEL_PATH)
+        self.vectors = all_binary_vectors(len(self.model.features))
+
+    def test_concurrent_requests_are_batched(self) -> None:
+        batcher = PredictionBatcher(window=0.05, max_batch_size=1024)
+        requests = [self.vectors[start:start + 3] for start in range(0, 30, 3)]
+
+        async def run() -> list[tuple[list[int], list[float] | None]]:
+            return await asyncio.gather(*(batcher.predict(self.model, features) for features in requests))
+
+        results = asyncio.run(run())
+        # Each request should get the predictions for its own flights
+        for features, (labels, probabilities) in zip(requests, results):
+            self.assertEqual(labels, self.model.predict(features))
+            self.assertIsNone(probabilities)
+        # And all the requests should have been served by a single batch
+        self.assertEqual(batcher.requests_per_batch.count, 1)
+        self.assertEqual(batcher.stats()['batch_sizes']['sum'], 30)
+
+    def test_batch_is_flushed_at_max_size(self) -> None:
+        batcher = PredictionBatcher(window=60, max_batch_size=4)
+
+        async def run() -> list[tuple[list[int], list[float] | None]]:
+            return await asyncio.gather(*(batcher.predict(self.model, self.vectors[i:i + 2]) for i in range(4)))
+
+        # With a window of 60s this only finishes because full batches are flushed straight away
+        results = asyncio.run(asyncio.wait_for(run(), timeout=5))
+        self.assertEqual(len(results), 4)
+        self.assertEqual(batcher.requests_per_batch.count, 2)
+
+    def test_probabilities_and_thresholds_are_batched_separately(self) -> None:
+        batcher = PredictionBatcher(window=0.01, max_batch_size=1024)
+        features = self.vectors[:5]
+
+        async def run() -> list[tuple[list[int], list[float] | None]]:
+            return await asyncio.gather(
+                batcher.predict(self.model, features),
+                batcher.predict(self.model, features, probabilities=True),
+                batcher.predict(self.model, features, threshold=0.0)
+            )
+
+        (labels, probabilities), (proba_labels, proba), (threshold_labels, _) = asyncio.run(run())
+        self.assertIsNone(probabilities)
+        self.assertEqual(labels, proba_labels)
+        np.testing.assert_allclose(proba, self.model.predict_proba(features))
+        self.assertEqual(threshold_labels, [1] * len(features))
+        self.assertEqual(batcher.requests_per_batch.count, 3)
+
+    def test_errors_are_raised_for_every_request(self) -> None:
+        batcher = PredictionBatcher(window=0.01, max_batch_size=1024)
+        untrained_model = DelayModel()
+
+        async def run() -> list[tuple[list[int], list[float] | None] | BaseException]:
+            return await asyncio.gather(*(batcher.predict(untrained_model, self.vectors[:1]) for _ in range(3)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(isinstance(result, Exception) for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from operator import methodcaller
+
+from app.model import DelayModel
+from app.serving import CandidateDeployment
+
+
+class TestCandidateDeployment(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+    columns = {'OPERA': ['Grupo LATAM', 'Copa Air', 'Avianca'], 'TIPOVUELO': ['I', 'N', 'I'], 'MES': [7, 3, 12]}
+
+    def setUp(self) -> None:
+        self.model = DelayModel.load(self._MODEL_PATH)
+        self.transform = methodcaller('transform_columns', self.columns)
+        self.labels = self.model.predict(self.transform(self.model))
+
+    def _shadow(self, candidate: CandidateDeployment, requests: int = 1) -> None:
+        async def run() -> None:
+            for _ in range(requests):
+                candidate.shadow(self.transform, self.labels, None)
+            await candidate.wait()
+
+        asyncio.run(run())
+
+    def test_shadow_records_agreement(self) -> None:
+        candidate = CandidateDeployment('candidate', self.model, 'shadow', percentage=100)
+        self._shadow(candidate, requests=2)
+        stats = candidate.stats()
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['rows'], 6)
+        # The same model always agrees with itself
+        self.assertEqual(stats['agreement'], 1.0)
+        self.assertEqual(candidate.latencies['candidate'].count, 2)
+
+    def test_shadow_counts_disagreement(self) -> None:
+        candidate = CandidateDeployment('candidate', self.model, 'shadow', percentage=100)
+        self.labels = [1 - label for label in self.labels]
+        self._shadow(candidate)
+        self.assertEqual(candidate.stats()['agreement'], 0.0)
+
+    def test_shadow_failure_is_counted(self) -> None:
+        candidate = CandidateDeployment('candidate', self.model, 'shadow', percentage=100)
+        self.transform = methodcaller('transform_columns', {'OPERA': ['Grupo LATAM']})
+        self._shadow(candidate)
+        # Predicting a different number of flights can not be compared with the deployed model
+        self.assertEqual(candidate.failures, 1)
+        self.transform = methodcaller('transform_columns', None)
+        self._shadow(candidate)
+        self.assertEqual(candidate.failures, 2)
+        self.assertEqual(candidate.rows, 0)
+
+    def test_shadow_is_dropped_when_too_many_are_pending(self) -> None:
+        candidate = CandidateDeployment('candidate', self.model, 'shadow', percentage=100, max_pending=0)
+        self._shadow(candidate)
+        self.assertEqual(candidate.dropped, 1)
+        self.assertEqual(candidate.requests, 0)
+
+    def test_percentage_of_requests_are_sampled(self) -> None:
+        self.assertTrue(CandidateDeployment('candidate', self.model, 'canary', percentage=100).routes())
+        self.assertFalse(CandidateDeployment('candidate', self.model, 'canary', percentage=0).routes())
+        # A shadow candidate never serves requests itself
+        self.assertFalse(CandidateDeployment('candidate', self.model, 'shadow', percentage=100).routes())
+
+        candidate = CandidateDeployment('candidate', self.model, 'canary', percentage=25)
+        routed = sum(candidate.routes() for _ in range(4000))
+        self.assertEqual(candidate.requests, routed)
+        self.assertAlmostEqual(routed / 4000, 0.25, delta=0.05)
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            CandidateDeployment('candidate', self.model, 'blue-green', percentage=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+from app.serving import encoding
+from app.serving.encoding import encode_predictions
+
+
+class TestEncodePredictions(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(3)
+        self.labels = rng.integers(0, 2, 1000).tolist() + [0, 1, 1]
+        self.probabilities = rng.random(1000).tolist() + [1e-05, 0.0, 1.0]
+
+    def _assert_encodes_like_json_response(self, labels: list[int], probabilities: list[float] | None) -> None:
+        content = {'predictions': labels} if probabilities is None else \
+            {'predictions': labels, 'probabilities': probabilities}
+        expected = JSONResponse(content=content).body
+        encoded = encode_predictions(labels, probabilities)
+        if encoding.ORJSON_AVAILABLE:
+            self.assertEqual(json.loads(encoded), json.loads(expected))
+        else:
+            self.assertEqual(encoded, expected)
+
+    def test_matches_json_response(self) -> None:
+        for available in sorted({False, encoding.ORJSON_AVAILABLE}):
+            with mock.patch.object(encoding, 'ORJSON_AVAILABLE', available), self.subTest(orjson=available):
+                self._assert_encodes_like_json_response(self.labels, None)
+                self._assert_encodes_like_json_response(self.labels, self.probabilities)
+                self._assert_encodes_like_json_response([], None)
+                self._assert_encodes_like_json_response([], [])
+
+    def test_labels_other_than_digits(self) -> None:
+        with mock.patch.object(encoding, 'ORJSON_AVAILABLE', False):
+            for labels in ([0, 10, 1], [-1, 1], [256, 0]):
+                self.assertEqual(encode_predictions(labels), JSONResponse(content={'predictions': labels}).body)
+
+
+if __name__ == '__main__':
+    unittest.main()
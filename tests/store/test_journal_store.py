@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+from app.api.errors import DataFormatError, TrainingInterruptedError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from app.store import JournalModelStore
+
+
+class TestJournalModelStore(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.store = self._open_store()
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.directory.cleanup()
+
+    def _open_store(self, compact_after: int = 1000) -> JournalModelStore[str, Model]:
+        return JournalModelStore(default_model=None, path=self.directory.name, compact_after=compact_after)
+
+    def _restart(self, compact_after: int = 1000) -> JournalModelStore[str, Model]:
+        self.store.close()
+        self.store = self._open_store(compact_after)
+        return self.store
+
+    def _completed_model(self) -> Model:
+        model = Model.new_model()
+        self.store.add_model(model)
+        self.store.update_model(str(model.id), DelayModel.load(self._MODEL_PATH))
+        self.store.update_status(str(model.id), Status.COMPLETED)
+        return model
+
+    def test_models_are_restored(self) -> None:
+        completed_model = self._completed_model()
+        failed_model = Model.new_model(parent_id=completed_model.id)
+        self.store.add_model(failed_model)
+        self.store[str(failed_model.id)].errors.append(DataFormatError())
+        self.store.update_status(str(failed_model.id), Status.FAILED)
+        self.store.deploy(str(completed_model.id))
+
+        store = self._restart()
+
+        self.assertEqual(list(store), [str(completed_model.id), str(failed_model.id)])
+        self.assertEqual(store[str(completed_model.id)].status, Status.COMPLETED)
+        self.assertIsInstance(store[str(completed_model.id)].model, DelayModel)
+        restored_failed_model = store[str(failed_model.id)]
+        self.assertEqual(restored_failed_model.status, Status.FAILED)
+        self.assertEqual([error.json() for error in restored_failed_model.errors], [DataFormatError().json()])
+        self.assertEqual(restored_failed_model.parent_id, completed_model.id)
+        self.assertEqual(store.deployed_id, str(completed_model.id))
+        self.assertEqual(store.deployment_version, 1)
+
+    def test_models_are_loaded_lazily(self) -> None:
+        model = self._completed_model()
+        store = self._restart()
+
+        # Only the metadata is read on startup
+        self.assertIsNone(store._data[str(model.id)].model)  # pylint: disable=protected-access
+        self.assertIsInstance(store[str(model.id)].model, DelayModel)
+
+    def test_interrupted_training_fails(self) -> None:
+        pending_model, running_model = Model.new_model(), Model.new_model()
+        self.store.add_model(pending_model)
+        self.store.add_model(running_model)
+        self.store.update_status(str(running_model.id), Status.RUNNING)
+
+        store = self._restart()
+
+        for model_id in (str(pending_model.id), str(running_model.id)):
+            self.assertEqual(store[model_id].status, Status.FAILED)
+            self.assertEqual(store[model_id].errors[0].code, TrainingInterruptedError.code)
+        # The failure is itself recorded, so it is not repeated on the next restart
+        self.assertEqual(len(self._restart()[str(pending_model.id)].errors), 1)
+
+    def test_deleted_models_are_not_restored(self) -> None:
+        model = self._completed_model()
+        del self.store[str(model.id)]
+
+        self.assertNotIn(str(model.id), self._restart())
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'artifacts', f'{model.id}.depart')))
+
+    def test_incomplete_last_entry_is_ignored(self) -> None:
+        model = self._completed_model()
+        self.store.close()
+        with open(os.path.join(self.directory.name, 'models.journal'), 'a', encoding='utf-8') as journal:
+            journal.write('{"op":"delete","id":')
+
+        store = self._restart()
+
+        self.assertIn(str(model.id), store)
+        # The incomplete entry is removed, so later entries can be read
+        store.deploy(str(model.id))
+        self.assertEqual(self._restart().deployed_id, str(model.id))
+
+    def test_journal_is_compacted(self) -> None:
+        store = self._restart(compact_after=10)
+        model = Model.new_model()
+        store.add_model(model)
+        for _ in range(30):
+            store.deploy(str(model.id))
+
+        with open(os.path.join(self.directory.name, 'models.journal'), encoding='utf-8') as journal:
+            self.assertLessEqual(len(journal.readlines()), 12)
+        store = self._restart(compact_after=10)
+        self.assertIn(str(model.id), store)
+        self.assertEqual(store.deployed_id, str(model.id))
+        self.assertEqual(store.deployment_version, 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
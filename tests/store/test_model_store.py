@@ -0,0 +1,201 @@
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+from starlette.datastructures import State
+
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from app.serving import CandidateDeployment
+from app.store import DeployedModel, JournalModelStore, ModelStore, deploy_model, serve_models, sync_deployed_model
+
+
+class TestModelStoreMemoryBudget(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+
+    def setUp(self) -> None:
+        self.model_size = DelayModel.load(self._MODEL_PATH).nbytes
+        # Room for two models but not three
+        self.store: ModelStore[str, Model] = ModelStore(default_model=None, memory_budget=2 * self.model_size + 1)
+
+    def _completed_model(self) -> str:
+        model = Model.new_model()
+        self.store.add_model(model)
+        self.store.update_model(str(model.id), DelayModel.load(self._MODEL_PATH))
+        self.store.update_status(str(model.id), Status.COMPLETED)
+        return str(model.id)
+
+    def _is_loaded(self, model_id: str) -> bool:
+        return self.store._data[model_id].model is not None  # pylint: disable=protected-access
+
+    def test_least_recently_used_model_is_evicted(self) -> None:
+        first_id, second_id = self._completed_model(), self._completed_model()
+        _ = self.store[first_id]
+        third_id = self._completed_model()
+
+        self.assertFalse(self._is_loaded(second_id))
+        self.assertTrue(self._is_loaded(first_id))
+        self.assertTrue(self._is_loaded(third_id))
+        stats = self.store.stats()
+        self.assertEqual(stats['loaded_models'], 2)
+        self.assertLessEqual(stats['loaded_bytes'], self.store.memory_budget)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_evicted_model_is_reloaded(self) -> None:
+        first_id = self._completed_model()
+        features = np.eye(10)
+        expected = self.store[first_id].model.predict_proba(features)
+        self._completed_model()
+        self._completed_model()
+        self.assertFalse(self._is_loaded(first_id))
+
+        model = self.store[first_id]
+
+        self.assertIsInstance(model.model, DelayModel)
+        self.assertEqual(model.model.predict_proba(features), expected)
+        self.assertEqual(model.status, Status.COMPLETED)
+        self.assertEqual(self.store.stats()['misses'], 1)
+
+    def test_deployed_model_is_not_evicted(self) -> None:
+        deployed_id = self._completed_model()
+        self.store.deploy(deployed_id)
+        self._completed_model()
+        self._completed_model()
+        self._completed_model()
+
+        self.assertTrue(self._is_loaded(deployed_id))
+
+    def test_served_models_are_not_evicted(self) -> None:
+        state = State()
+        state.model_store, state.model, state.candidate, state.deployment_version = self.store, None, None, 0
+        served_id, candidate_id = self._completed_model(), self._completed_model()
+        deploy_model(state, self.store[served_id])
+        state.candidate = CandidateDeployment(candidate_id, self.store[candidate_id].model, 'shadow', 10)
+        serve_models(state)
+        # Another process deploys a model that this one has not picked up yet
+        self.store.deploy(self._completed_model())
+        self._completed_model()
+        self._completed_model()
+
+        self.assertTrue(self._is_loaded(served_id))
+        self.assertTrue(self._is_loaded(candidate_id))
+        self.assertIsInstance(state.model.model, DelayModel)
+
+        state.candidate = None
+        serve_models(state)
+        self._completed_model()
+
+        self.assertFalse(self._is_loaded(candidate_id))
+
+    def test_deleted_model_is_forgotten(self) -> None:
+        first_id = self._completed_model()
+        del self.store[first_id]
+
+        self.assertEqual(self.store.stats()['loaded_models'], 0)
+
+    def test_no_budget_keeps_every_model(self) -> None:
+        self.store = ModelStore(default_model=None)
+        model_ids = [self._completed_model() for _ in range(5)]
+
+        self.assertTrue(all(self._is_loaded(model_id) for model_id in model_ids))
+        self.assertEqual(self.store.stats()['evictions'], 0)
+
+    def test_persistent_store_reloads_from_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            self.store = JournalModelStore(default_model=None, memory_budget=self.store.memory_budget,
+                                           path=directory)
+            first_id = self._completed_model()
+            self._completed_model()
+            self._completed_model()
+            self.assertFalse(self._is_loaded(first_id))
+
+            self.assertIsInstance(self.store[first_id].model, DelayModel)
+            self.assertEqual(self.store.stats()['misses'], 1)
+            self.store.close()
+
+
+class TestDeployModel(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+
+    def setUp(self) -> None:
+        default_model = Model.new_model()
+        default_model.model = DelayModel.load(self._MODEL_PATH)
+        self.state = State()
+        self.state.model_store = ModelStore(default_model=default_model)
+        self.state.model = DeployedModel.from_model(default_model)
+        self.state.deployment_version = 0
+
+    def test_model_is_warmed_up_before_it_is_deployed(self) -> None:
+        model = Model.new_model()
+        model.model = DelayModel.load(self._MODEL_PATH)
+        self.state.model_store.add_model(model)
+        deployed_while_warming_up = []
+
+        def warm_up() -> None:
+            deployed_while_warming_up.append(self.state.model)
+
+        with mock.patch.object(model.model, 'warm_up', side_effect=warm_up) as warm_up_mock:
+            deploy_model(self.state, model)
+        warm_up_mock.assert_called_once_with()
+        # Requests made while the model was warmed up were still served by the default model
+        self.assertEqual(deployed_while_warming_up, [DeployedModel.from_model(self.state.model_store.default_model)])
+        self.assertEqual(self.state.model, DeployedModel.from_model(model))
+
+    def test_deployed_model_is_not_affected_by_the_store(self) -> None:
+        model = Model.new_model()
+        delay_model = model.model = DelayModel.load(self._MODEL_PATH)
+        self.state.model_store.add_model(model)
+        deploy_model(self.state, model)
+        # The store unloading the model does not take it away from requests being served
+        model.model = None
+
+        self.assertIs(self.state.model.model, delay_model)
+        with self.assertRaises(AttributeError):
+            self.state.model.model = None
+
+    def test_model_without_delay_model_can_be_deployed(self) -> None:
+        model = Model.new_model()
+        self.state.model_store.add_model(model)
+        deploy_model(self.state, model)
+        self.assertEqual(self.state.model, DeployedModel.from_model(model))
+
+    def test_concurrent_deployments_agree_with_store(self) -> None:
+        models = [Model.new_model() for _ in range(8)]
+        for model in models:
+            self.state.model_store.add_model(model)
+        start = threading.Barrier(len(models))
+
+        def deploy(model: Model) -> None:
+            start.wait()
+            for _ in range(50):
+                deploy_model(self.state, model)
+
+        threads = [threading.Thread(target=deploy, args=(model,)) for model in models]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The deployed model is the one the store recorded last
+        self.assertEqual(str(self.state.model.id), self.state.model_store.deployed_id)
+        self.assertEqual(self.state.deployment_version, self.state.model_store.deployment_version)
+
+    def test_sync_does_not_replace_a_newer_deployment(self) -> None:
+        store = self.state.model_store
+        synced, deployed = Model.new_model(), Model.new_model()
+        synced.model = DelayModel.load(self._MODEL_PATH)
+        for model in (synced, deployed):
+            store.add_model(model)
+            store.update_status(str(model.id), Status.COMPLETED)
+        # Another process deploys `synced`, and this process deploys `deployed` while `synced` is being loaded
+        store.deploy(str(synced.id))
+        with mock.patch.object(synced.model, 'warm_up', side_effect=lambda: deploy_model(self.state, deployed)):
+            self.assertFalse(sync_deployed_model(self.state))
+        self.assertEqual(self.state.model, DeployedModel.from_model(deployed))
+        self.assertEqual(self.state.deployment_version, store.deployment_version)
+
+
+if __name__ == '__main__':
+    unittest.main()
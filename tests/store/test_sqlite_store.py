@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+
+from starlette.datastructures import State
+
+from app.api.errors import DataFormatError
+from app.api.resources import Model
+from app.api.schemas import Status
+from app.model import DelayModel
+from app.store import DeployedModel, SQLiteModelStore, deploy_model, sync_deployed_model
+
+
+class TestSQLiteModelStore(unittest.TestCase):
+    _MODEL_PATH = './models/modelv1.0.depart'
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.default_model = Model.new_model()
+        self.default_model.model = DelayModel.load(self._MODEL_PATH)
+        # Two stores on the same registry behave like two worker processes
+        self.store = self._open_store()
+        self.other_store = self._open_store()
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.other_store.close()
+        self.directory.cleanup()
+
+    def _open_store(self) -> SQLiteModelStore[str, Model]:
+        return SQLiteModelStore(default_model=self.default_model, path=self.directory.name)
+
+    def _completed_model(self) -> Model:
+        model = Model.new_model()
+        self.store.add_model(model)
+        self.store.update_model(str(model.id), DelayModel.load(self._MODEL_PATH))
+        self.store.update_status(str(model.id), Status.COMPLETED)
+        return model
+
+    def test_models_are_shared(self) -> None:
+        model = Model.new_model()
+        self.store.add_model(model)
+
+        self.assertIn(str(model.id), self.other_store)
+        self.assertEqual(list(self.other_store), [str(model.id)])
+        self.assertEqual(self.other_store[str(model.id)].status, Status.PENDING)
+        self.assertIsNone(self.other_store[str(model.id)].model)
+
+    def test_status_and_model_updates_are_shared(self) -> None:
+        model = Model.new_model()
+        self.store.add_model(model)
+        self.assertEqual(self.other_store[str(model.id)].status, Status.PENDING)
+
+        self.store.update_status(str(model.id), Status.RUNNING)
+        self.store.update_model(str(model.id), DelayModel.load(self._MODEL_PATH))
+        self.store.update_status(str(model.id), Status.COMPLETED)
+
+        shared_model = self.other_store[str(model.id)]
+        self.assertEqual(shared_model.status, Status.COMPLETED)
+        # The trained model is read from the artifact saved by the other store
+        self.assertIsInstance(shared_model.model, DelayModel)
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'artifacts', f'{model.id}.depart')))
+
+    def test_errors_are_shared(self) -> None:
+        model = Model.new_model(parent_id=self.default_model.id)
+        self.store.add_model(model)
+        # Errors are added to the model before its status is updated, as in `TrainingExecutor`
+        self.store[str(model.id)].errors.append(DataFormatError())
+        self.store.update_status(str(model.id), Status.FAILED)
+
+        shared_model = self.other_store[str(model.id)]
+        self.assertEqual(shared_model.status, Status.FAILED)
+        self.assertEqual([error.json() for error in shared_model.errors], [DataFormatError().json()])
+        self.assertEqual(shared_model.parent_id, self.default_model.id)
+
+    def test_completed_model_can_not_change(self) -> None:
+        model = self._completed_model()
+        with self.assertRaises(ValueError):
+            self.other_store.update_status(str(model.id), Status.RUNNING)
+
+    def test_deleted_models_are_removed(self) -> None:
+        model = self._completed_model()
+        self.assertIn(str(model.id), self.other_store)
+
+        del self.other_store[str(model.id)]
+
+        self.assertNotIn(str(model.id), self.store)
+        self.assertIsNone(self.store.get(str(model.id)))
+        self.assertEqual(len(self.store), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'artifacts', f'{model.id}.depart')))
+        with self.assertRaises(KeyError):
+            del self.store[str(model.id)]
+
+    def test_deployments_are_shared(self) -> None:
+        model = self._completed_model()
+        state, other_state = State(), State()
+        for worker_state, store in ((state, self.store), (other_state, self.other_store)):
+            worker_state.model_store = store
+            worker_state.model = DeployedModel.from_model(self.default_model)
+            worker_state.deployment_version = 0
+
+        deploy_model(state, model)
+        self.assertEqual(state.model, DeployedModel.from_model(model))
+        self.assertEqual(self.other_store.deployed_id, str(model.id))
+        # The other worker picks up the deployment the next time it checks the store
+        self.assertTrue(sync_deployed_model(other_state))
+        self.assertEqual(other_state.model.id, model.id)
+        self.assertFalse(sync_deployed_model(other_state))
+
+        deploy_model(other_state, None)
+        self.assertTrue(sync_deployed_model(state))
+        self.assertEqual(state.model, DeployedModel.from_model(self.default_model))
+
+    def test_deployment_of_missing_model_falls_back_to_default(self) -> None:
+        model = self._completed_model()
+        self.store.deploy(str(model.id))
+        del self.store[str(model.id)]
+        state = State()
+        state.model_store = self.other_store
+        state.model = None
+        state.deployment_version = 0
+
+        self.assertTrue(sync_deployed_model(state))
+        self.assertEqual(state.model, DeployedModel.from_model(self.default_model))
+
+
+if __name__ == '__main__':
+    unittest.main()